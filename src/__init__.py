@@ -1,9 +1,13 @@
 # Paquete intelx
 
-from interactive_report import generate_interactive_html_report
-from exports import export_to_interactive_html
+from interactive_report import (generate_interactive_html_report, generate_sharded_html_report,
+                                append_interactive_html_report)
+from exports import export_to_interactive_html, export_sharded_interactive_html
 
 __all__ = [
     'generate_interactive_html_report',
-    'export_to_interactive_html'
+    'generate_sharded_html_report',
+    'append_interactive_html_report',
+    'export_to_interactive_html',
+    'export_sharded_interactive_html'
 ]
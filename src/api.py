@@ -74,16 +74,49 @@ MEDIA_TYPE_MAP: Dict[int, str] = {
     32: "Source Code",  # Encontrado en mapeo actual
 }
 
+# --- Límite de peticiones ---
+class RateLimiter:
+    """Garantiza un intervalo mínimo entre peticiones, compartido entre hilos."""
+
+    def __init__(self, min_interval: float = INTELX_RATE_LIMIT_DELAY):
+        self.min_interval = min_interval
+        self._lock = threading.Lock()
+        self._next_slot = 0.0
+
+    def wait(self, cancel_event: Optional[threading.Event] = None) -> bool:
+        """Espera el siguiente turno. Devuelve False si se canceló durante la espera."""
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.min_interval
+        delay = slot - time.monotonic()
+        if delay <= 0:
+            return not (cancel_event and cancel_event.is_set())
+        if cancel_event is not None:
+            return not cancel_event.wait(timeout=delay)
+        time.sleep(delay)
+        return True
+
+
+# Limitador compartido por las peticiones que no reciben uno propio, de modo
+# que las llamadas sueltas (fuera del SearchScheduler) también respetan el límite
+DEFAULT_RATE_LIMITER = RateLimiter()
+
 # --- Funciones de Lógica API ---
 def check_intelx(
     search_term: str,
     api_key: str,
     selected_buckets: Optional[List[str]] = None,
-    cancel_event: Optional[threading.Event] = None
+    cancel_event: Optional[threading.Event] = None,
+    rate_limiter: Optional[RateLimiter] = None
 ) -> Tuple[bool, Union[str, Dict[str, Any]], Optional[str]]:
     """
     Inicia una búsqueda en IntelX y recupera los resultados.
 
+    Cada petición HTTP (búsqueda, consultas de estado y resultados) espera su
+    turno en ``rate_limiter`` (por defecto DEFAULT_RATE_LIMITER); compartirlo entre
+    hilos aplica un límite global.
+
     Returns:
         Tuple[bool, Union[str, Dict], Optional[str]]: (success, data_or_error_message, search_id)
     """
@@ -93,7 +126,8 @@ def check_intelx(
         return False, "La clave API de IntelX no ha sido proporcionada.", None
 
     cancel_event = cancel_event or threading.Event()
-    if cancel_event.is_set():
+    rate_limiter = rate_limiter or DEFAULT_RATE_LIMITER
+    if cancel_event.is_set() or not rate_limiter.wait(cancel_event):
         logging.info("Cancelado antes de enviar la solicitud de búsqueda.")
         return False, "Búsqueda cancelada antes de iniciar.", None
 
@@ -140,7 +174,7 @@ def check_intelx(
             return False, "Búsqueda cancelada.", search_id
 
         success_retrieve, data_retrieve = retrieve_intelx_results(
-            search_id, initial_status, headers, cancel_event
+            search_id, initial_status, headers, cancel_event, rate_limiter
         )
         return success_retrieve, data_retrieve, search_id
 
@@ -177,7 +211,8 @@ def retrieve_intelx_results(
     search_id: str,
     initial_status: int,
     headers: Dict[str, str],
-    cancel_event: threading.Event
+    cancel_event: threading.Event,
+    rate_limiter: Optional[RateLimiter] = None
 ) -> Tuple[bool, Union[str, Dict[str, Any]]]:
     """
     Espera y recupera los resultados de una búsqueda IntelX, manejando estados y cancelación.
@@ -189,6 +224,7 @@ def retrieve_intelx_results(
     status_url = f"{INTELX_API_URL_STATUS}?id={search_id}"
     start_time = time.time()
     current_status = initial_status
+    rate_limiter = rate_limiter or DEFAULT_RATE_LIMITER
 
     logging.info(f"Procesando ID: {search_id} (estado inicial: {current_status})")
 
@@ -201,7 +237,7 @@ def retrieve_intelx_results(
             logging.info(f"ID {search_id}: Estado 0 (Completado). Obteniendo resultados...")
             results_response: Optional[requests.Response] = None
             try:
-                if cancel_event.is_set(): continue
+                if not rate_limiter.wait(cancel_event): continue
 
                 results_response = requests.get(results_url, headers=headers, timeout=REQUEST_TIMEOUT_RESULTS)
                 results_response.raise_for_status()
@@ -251,7 +287,7 @@ def retrieve_intelx_results(
                 logging.info(f"ID {search_id}: Cancelado durante la espera.")
                 continue
 
-            if cancel_event.is_set(): continue
+            if not rate_limiter.wait(cancel_event): continue
 
             logging.debug(f"ID {search_id}: Consultando estado actual en {status_url}")
             status_response: Optional[requests.Response] = None
@@ -296,10 +332,12 @@ def retrieve_intelx_results(
             logging.error(f"ID {search_id}: Estado inesperado o fallido encontrado: {current_status}")
             return False, f"Error: Estado de búsqueda inesperado o fallido ({current_status})."
 
-def get_api_credits(api_key: str) -> Tuple[bool, Union[int, str]]:
+def get_api_credits(api_key: str, rate_limiter: Optional[RateLimiter] = None) -> Tuple[bool, Union[int, str]]:
     """
     Obtiene los créditos restantes de la API de IntelX usando el endpoint /authenticate/info.
     Basado en el SDK oficial de IntelX que usa GET_CAPABILITIES().
+
+    La petición espera su turno en ``rate_limiter`` (el mismo de las búsquedas).
     
     Returns:
         Tuple[bool, Union[int, str]]: (success, credits_or_error_message)
@@ -308,6 +346,7 @@ def get_api_credits(api_key: str) -> Tuple[bool, Union[int, str]]:
         return False, "Clave API no proporcionada"
     
     headers = {'x-key': api_key, 'User-Agent': USER_AGENT}
+    (rate_limiter or DEFAULT_RATE_LIMITER).wait()
     
     try:
         response = requests.get(
@@ -0,0 +1,267 @@
+"""
+Módulo: batch_reports.py
+Generación de reportes interactivos en lote
+
+Recibe globs o directorios de archivos de resultados (JSON, NDJSON, CSV,
+Parquet, Feather o manifiestos de exportaciones en partes) y genera un reporte por archivo en un
+pool de procesos, midiendo el tiempo de cada uno. El hash SHA-256 de cada
+entrada se guarda en un archivo de estado dentro del directorio de salida,
+de modo que las ejecuciones siguientes omiten los archivos que no cambiaron.
+
+Uso:
+    python batch_reports.py "reports/json/*.json" --output-dir exports/html
+"""
+import argparse
+import glob
+import hashlib
+import json
+import logging
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional
+
+from exports import MANIFEST_SUFFIX, NDJSON_EXTENSIONS, load_records, read_manifest
+from interactive_report import (REPORT_SIDECAR_SUFFIXES, SHARD_KEYS, SHARD_PAGE_RECORDS,
+                                TEMPORAL_GRANULARITIES, generate_interactive_html_report,
+                                generate_sharded_html_report)
+
+logger = logging.getLogger(__name__)
+
+# Directorio de salida por defecto (el mismo de las exportaciones HTML)
+DEFAULT_OUTPUT_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'exports', 'html')
+
+# Archivo de estado (hash de cada entrada ya procesada) dentro del directorio de salida
+BATCH_STATE_FILE = '.batch_reports.json'
+
+# Extensiones aceptadas al recorrer un directorio
+INPUT_EXTENSIONS = ('.json', '.csv', '.parquet', '.feather', MANIFEST_SUFFIX) + NDJSON_EXTENSIONS
+
+# Sufijo de fecha que agregan las exportaciones al nombre (_YYYYMMDD_HHMMSS)
+_TIMESTAMP_SUFFIX_RE = re.compile(r'_\d{8}_\d{6}$')
+
+# Estados de cada archivo en el resultado del lote
+BATCH_GENERATED = 'generated'
+BATCH_SKIPPED = 'skipped'
+BATCH_ERROR = 'error'
+
+
+def expand_inputs(patterns: Iterable[str], exclude_dir: Optional[str] = None) -> List[str]:
+    """Rutas absolutas (ordenadas y sin duplicados) de los globs o directorios dados.
+
+    Las partes de una exportación cuyo manifiesto también está en la lista se
+    descartan: el manifiesto ya las lee en orden. También se descartan los
+    archivos propios de la herramienta (estado de los reportes y del lote) y
+    todo lo que esté dentro de ``exclude_dir`` (el directorio de salida).
+    """
+    paths = set()
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            for root, _, files in os.walk(pattern):
+                paths.update(os.path.join(root, name) for name in files
+                             if _strip_gz(name).endswith(INPUT_EXTENSIONS))
+        else:
+            paths.update(path for path in glob.glob(pattern, recursive=True) if os.path.isfile(path))
+    paths = {os.path.abspath(path) for path in paths if not _is_bookkeeping(path)}
+    if exclude_dir:
+        exclude_dir = os.path.join(os.path.abspath(exclude_dir), '')
+        paths = {path for path in paths if not path.startswith(exclude_dir)}
+    for path in [path for path in paths if path.endswith(MANIFEST_SUFFIX)]:
+        try:
+            paths.difference_update(shard['path'] for shard in read_manifest(path)['shards'])
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(f"Manifiesto ilegible {path}: {e}")
+    return sorted(paths)
+
+
+def _is_bookkeeping(path: str) -> bool:
+    name = os.path.basename(path)
+    return name == BATCH_STATE_FILE or name.endswith(REPORT_SIDECAR_SUFFIXES)
+
+
+def _strip_gz(name: str) -> str:
+    return name[:-3] if name.endswith('.gz') else name
+
+
+def _input_stem(filepath: str) -> str:
+    """Nombre del archivo sin extensiones (``.json``, ``.ndjson.gz``, manifiesto...)."""
+    name = _strip_gz(os.path.basename(filepath))
+    for extension in sorted(INPUT_EXTENSIONS, key=len, reverse=True):
+        if name.endswith(extension):
+            return name[:-len(extension)]
+    return os.path.splitext(name)[0]
+
+
+def search_term_from_filename(filepath: str) -> str:
+    """Término de búsqueda deducido del nombre de una exportación (ver utils.sanitize_filename)."""
+    stem = _TIMESTAMP_SUFFIX_RE.sub('', _input_stem(filepath))
+    return stem.replace('_at_', '@').replace('_dot_', '.').replace('_', ' ').strip()
+
+
+def file_sha256(filepath: str) -> str:
+    digest = hashlib.sha256()
+    with open(filepath, 'rb') as fh:
+        for block in iter(lambda: fh.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def load_state(output_dir: str) -> Dict[str, Any]:
+    """Estado de la última ejecución: ruta de entrada -> hash, opciones y salida."""
+    try:
+        with open(os.path.join(output_dir, BATCH_STATE_FILE), 'r', encoding='utf-8') as fh:
+            return json.load(fh)
+    except FileNotFoundError:
+        return {}
+    except (OSError, ValueError) as e:
+        logger.warning(f"Estado de lote ilegible, se regeneran todos los reportes: {e}")
+        return {}
+
+
+def save_state(output_dir: str, state: Dict[str, Any]):
+    path = os.path.join(output_dir, BATCH_STATE_FILE)
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as fh:
+        json.dump(state, fh, indent=2, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+
+def _generate_one(input_path: str, output_path: str, search_term: str,
+                  options: Dict[str, Any]) -> Dict[str, Any]:
+    # A nivel de módulo para poder ejecutarse en un proceso del pool
+    started = time.perf_counter()
+    records = list(load_records(input_path))
+    options = dict(options)
+    if options.pop('sharded'):
+        # El lote ya reparte los archivos entre procesos: las páginas se escriben con hilos
+        output_path = generate_sharded_html_report(records, output_path, search_term,
+                                                   use_processes=False, **options)
+    else:
+        for key in ('shard_by', 'max_page_records'):
+            options.pop(key)
+        output_path = generate_interactive_html_report(records, output_path, search_term, **options)
+    return {'output': output_path, 'records': len(records), 'seconds': time.perf_counter() - started}
+
+
+def generate_batch(inputs: Iterable[str], output_dir: Optional[str] = None,
+                   force: bool = False, max_workers: Optional[int] = None,
+                   use_processes: bool = True, app_version: str = "2.0.0",
+                   minify: bool = False, compress: bool = False,
+                   granularity: str = 'quarter', sharded: bool = False,
+                   shard_by: str = 'bucket', max_page_records: int = SHARD_PAGE_RECORDS) -> List[Dict[str, Any]]:
+    """Genera un reporte por archivo de ``inputs`` (globs o directorios).
+
+    Se omiten las entradas cuyo hash y opciones coinciden con la ejecución
+    anterior y cuyo reporte sigue existiendo, salvo con ``force``. Devuelve,
+    por archivo, su estado (generated/skipped/error), salida, registros y
+    segundos empleados.
+    """
+    output_dir = output_dir or DEFAULT_OUTPUT_DIR
+    os.makedirs(output_dir, exist_ok=True)
+    options = dict(app_version=app_version, minify=minify, compress=compress, granularity=granularity,
+                   sharded=sharded, shard_by=shard_by, max_page_records=max_page_records)
+    state = load_state(output_dir)
+    results: List[Dict[str, Any]] = []
+    pending: Dict[str, Dict[str, Any]] = {}
+
+    outputs = set()
+    for input_path in expand_inputs(inputs, exclude_dir=output_dir):
+        entry = {'input': input_path, 'sha256': file_sha256(input_path)}
+        stem = _input_stem(input_path)
+        if stem in outputs:
+            # Mismo nombre en otro directorio: se distingue por la carpeta de origen
+            stem = f"{os.path.basename(os.path.dirname(input_path))}_{stem}"
+        outputs.add(stem)
+        entry['output'] = os.path.join(output_dir, stem if sharded else stem + '.html')
+        previous = state.get(input_path)
+        if (not force and previous and previous['sha256'] == entry['sha256']
+                and previous['options'] == options and previous['output'] == entry['output']
+                and os.path.exists(entry['output'])):
+            results.append(dict(entry, status=BATCH_SKIPPED, records=previous['records'], seconds=0.0))
+        else:
+            pending[input_path] = entry
+
+    started = time.perf_counter()
+    workers = max_workers or min(len(pending), os.cpu_count() or 1) or 1
+    executor_class = ProcessPoolExecutor if use_processes else ThreadPoolExecutor
+    try:
+        with executor_class(max_workers=workers) as executor:
+            futures = {executor.submit(_generate_one, entry['input'], entry['output'],
+                                       search_term_from_filename(entry['input']), options): entry
+                       for entry in pending.values()}
+            for future in as_completed(futures):
+                entry = futures[future]
+                try:
+                    entry.update(future.result(), status=BATCH_GENERATED)
+                except Exception as e:
+                    logger.error(f"Error generando el reporte de {entry['input']}: {e}")
+                    entry.update(status=BATCH_ERROR, error=str(e))
+                    continue
+                state[entry['input']] = {
+                    'sha256': entry['sha256'],
+                    'options': options,
+                    'output': entry['output'],
+                    'records': entry['records'],
+                    'seconds': round(entry['seconds'], 3),
+                    'generated': datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ'),
+                }
+                logger.info(f"Reporte generado: {entry['output']} "
+                            f"({entry['records']} registros en {entry['seconds']:.2f}s)")
+    finally:
+        # Se guarda también si el lote se interrumpe: los reportes ya hechos no se repiten
+        save_state(output_dir, state)
+
+    results.extend(pending.values())
+    results.sort(key=lambda entry: entry['input'])
+    logger.info(f"Lote terminado en {time.perf_counter() - started:.2f}s: "
+                f"{sum(r['status'] == BATCH_GENERATED for r in results)} generados, "
+                f"{sum(r['status'] == BATCH_SKIPPED for r in results)} sin cambios, "
+                f"{sum(r['status'] == BATCH_ERROR for r in results)} con error")
+    return results
+
+
+def main(argv: Optional[List[str]] = None):
+    """Generación de reportes en lote desde la línea de comandos."""
+    parser = argparse.ArgumentParser(description='Generar reportes interactivos IntelX en lote')
+    parser.add_argument('inputs', nargs='+', help='Globs o directorios de archivos de resultados')
+    parser.add_argument('--output-dir', default=None, help='Directorio de los reportes (y del estado)')
+    parser.add_argument('--force', action='store_true', help='Regenerar aunque la entrada no haya cambiado')
+    parser.add_argument('--workers', type=int, default=None, help='Procesos en paralelo')
+    parser.add_argument('--threads', action='store_true', help='Usar hilos en lugar de procesos')
+    parser.add_argument('--minify', action='store_true')
+    parser.add_argument('--compress', action='store_true', help='Datos de la tabla comprimidos')
+    parser.add_argument('--granularity', default='quarter', choices=TEMPORAL_GRANULARITIES)
+    parser.add_argument('--sharded', action='store_true', help='Reporte en varias páginas con índice')
+    parser.add_argument('--shard-by', default='bucket', choices=SHARD_KEYS)
+    parser.add_argument('--max-page-records', type=int, default=SHARD_PAGE_RECORDS)
+
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.WARNING, format='%(levelname)s - %(message)s')
+    started = time.perf_counter()
+    results = generate_batch(args.inputs, output_dir=args.output_dir, force=args.force,
+                             max_workers=args.workers, use_processes=not args.threads,
+                             minify=args.minify, compress=args.compress, granularity=args.granularity,
+                             sharded=args.sharded, shard_by=args.shard_by,
+                             max_page_records=args.max_page_records)
+    if not results:
+        print('No se encontraron archivos de resultados.')
+        return 1
+    for result in results:
+        if result['status'] == BATCH_ERROR:
+            print(f"❌ {result['input']}: {result['error']}")
+        elif result['status'] == BATCH_SKIPPED:
+            print(f"⏭️  {result['input']}: sin cambios ({result['output']})")
+        else:
+            print(f"✅ {result['input']}: {result['records']} registros en {result['seconds']:.2f}s "
+                  f"-> {result['output']}")
+    generated = [r for r in results if r['status'] == BATCH_GENERATED]
+    errors = sum(r['status'] == BATCH_ERROR for r in results)
+    print(f"\n{len(generated)} generados, {len(results) - len(generated) - errors} sin cambios, "
+          f"{errors} con error en {time.perf_counter() - started:.2f}s")
+    return 1 if errors else 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,177 @@
+"""
+Módulo: export_jobs.py
+Trabajos de exportación en segundo plano con progreso y cancelación
+
+Las exportaciones (CSV, JSON, NDJSON, Parquet/Feather, HTML interactivo) se
+ejecutan en un pool de hilos para no bloquear el hilo principal de Tk. Cada
+trabajo informa los registros escritos, puede cancelarse y varias
+exportaciones pueden quedar en cola. Los callbacks se invocan desde los hilos de trabajo: la GUI debe
+reenviarlos al hilo principal (por ejemplo mediante ``UIUpdateBus``).
+"""
+import itertools
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+import exports as exports_module
+
+logger = logging.getLogger(__name__)
+
+# Estados de un trabajo de exportación
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_DONE = "done"
+JOB_CANCELLED = "cancelled"
+JOB_ERROR = "error"
+
+# Formato -> función de exportación (todas aceptan progress_callback y cancel_event)
+EXPORTERS: Dict[str, Callable[..., Any]] = dict(
+    exports_module.FORMAT_WRITERS,
+    # Anexa a una exportación existente sin duplicados (devuelve un resumen)
+    append=exports_module.append_export,
+    # Varios formatos desde una sola proyección (devuelve rutas y tiempos)
+    bundle=exports_module.export_all,
+    # Exportación en partes con manifiesto (devuelve la ruta del manifiesto)
+    sharded=exports_module.export_sharded,
+    # Reporte HTML en varias páginas con índice (devuelve la ruta del índice)
+    html_sharded=exports_module.export_sharded_interactive_html,
+)
+
+
+class ExportJob:
+    """Estado de una exportación encolada o en curso."""
+
+    def __init__(self, job_id: int, kind: str, records: List[Dict[str, Any]], options: Dict[str, Any]):
+        self.id = job_id
+        self.kind = kind
+        self.records = records
+        self.options = options
+        self.total = len(records)
+        self.written = 0
+        self.status = JOB_QUEUED
+        self.filepath: Optional[str] = None
+        # Valor devuelto por el exportador (p. ej. conteos de nuevos/duplicados)
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+        self.cancel_event = threading.Event()
+        self.future = None
+
+    @property
+    def finished(self) -> bool:
+        return self.status in (JOB_DONE, JOB_CANCELLED, JOB_ERROR)
+
+    @property
+    def progress(self) -> float:
+        return (self.written / self.total) if self.total else (1.0 if self.finished else 0.0)
+
+    def cancel(self):
+        """Solicita la cancelación; un trabajo en cola no llega a ejecutarse."""
+        self.cancel_event.set()
+        if self.future is not None:
+            self.future.cancel()
+
+
+class ExportJobManager:
+    """Encola exportaciones en un pool de hilos y notifica su progreso.
+
+    Sólo se conservan los trabajos en cola o en curso: al terminar, un
+    trabajo se entrega a ``on_finished`` y se descarta del gestor.
+    """
+
+    def __init__(self, max_workers: int = 2,
+                 on_progress: Optional[Callable[[ExportJob], None]] = None,
+                 on_finished: Optional[Callable[[ExportJob], None]] = None):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="export")
+        self._ids = itertools.count(1)
+        # Trabajos en cola o en curso
+        self._jobs: Dict[int, ExportJob] = {}
+        self._lock = threading.Lock()
+        self.on_progress = on_progress
+        self.on_finished = on_finished
+
+    def submit(self, kind: str, records: List[Dict[str, Any]], **options) -> ExportJob:
+        """Encola una exportación ``kind`` (ver ``EXPORTERS``) de ``records``."""
+        if kind not in EXPORTERS:
+            raise ValueError(f"Formato de exportación no soportado: {kind}")
+        # Copia superficial: la búsqueda siguiente puede reemplazar la lista original
+        job = ExportJob(next(self._ids), kind, list(records), options)
+        with self._lock:
+            self._jobs[job.id] = job
+        job.future = self._executor.submit(self._run, job)
+        job.future.add_done_callback(lambda future: self._on_future_done(job, future))
+        logger.info(f"Exportación {kind.upper()} #{job.id} encolada ({job.total} registros)")
+        return job
+
+    def _run(self, job: ExportJob):
+        if job.cancel_event.is_set():
+            job.status = JOB_CANCELLED
+            self._notify_finished(job)
+            return
+
+        job.status = JOB_RUNNING
+
+        def progress(written: int, total: int):
+            job.written = written
+            if total:
+                # Un paquete multi-formato informa el total de todas sus salidas
+                job.total = total
+            if self.on_progress:
+                self.on_progress(job)
+
+        try:
+            job.result = EXPORTERS[job.kind](
+                job.records,
+                progress_callback=progress,
+                cancel_event=job.cancel_event,
+                **job.options
+            )
+            job.filepath = job.result['filepath'] if isinstance(job.result, dict) else job.result
+            job.status = JOB_DONE
+        except exports_module.ExportCancelled:
+            job.status = JOB_CANCELLED
+        except Exception as e:
+            logger.exception(f"Error en exportación {job.kind.upper()} #{job.id}")
+            job.error = e
+            job.status = JOB_ERROR
+        finally:
+            # Liberar los registros una vez escritos
+            job.records = []
+        self._notify_finished(job)
+
+    def _on_future_done(self, job: ExportJob, future):
+        # Un trabajo cancelado mientras estaba en cola nunca ejecuta _run
+        if future.cancelled():
+            job.status = JOB_CANCELLED
+            job.records = []
+            self._notify_finished(job)
+
+    def _notify_finished(self, job: ExportJob):
+        with self._lock:
+            self._jobs.pop(job.id, None)
+        if self.on_finished:
+            try:
+                self.on_finished(job)
+            except Exception:
+                logger.exception("Error notificando fin de exportación")
+
+    def get(self, job_id: int) -> Optional[ExportJob]:
+        """Trabajo en cola o en curso (los terminados ya no se conservan)."""
+        return self._jobs.get(job_id)
+
+    def active_jobs(self) -> List[ExportJob]:
+        with self._lock:
+            return [job for job in self._jobs.values() if not job.finished]
+
+    def cancel(self, job_id: int):
+        job = self._jobs.get(job_id)
+        if job:
+            job.cancel()
+
+    def cancel_all(self):
+        for job in self.active_jobs():
+            job.cancel()
+
+    def shutdown(self, wait: bool = False):
+        self.cancel_all()
+        self._executor.shutdown(wait=wait)
@@ -8,14 +8,65 @@ from __future__ import annotations
 import os
 import json
 import csv
-from datetime import datetime
-from typing import List, Dict, Any, Optional
+import gzip
+import hashlib
+import itertools
+import shutil
+import textwrap
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Callable, List, Dict, Any, Iterable, Iterator, Optional, Sequence, Sized, Tuple
 import logging
 
-from interactive_report import generate_interactive_html_report
+from interactive_report import (REPORT_SIDECAR_SUFFIXES, SHARD_PAGE_RECORDS, DataProcessor,
+                                append_interactive_html_report, generate_interactive_html_report,
+                                generate_sharded_html_report)
+from record_store import RecordRegistry, normalize_record, record_key
 
 logger = logging.getLogger(__name__)
 
+# Progress callbacks receive (records_written, total_records)
+ProgressCallback = Callable[[int, int], None]
+
+# Number of records written between two progress notifications / cancel checks
+PROGRESS_EVERY = 500
+
+
+class ExportCancelled(Exception):
+    """Raised when an export is aborted through its cancel event."""
+
+
+def _check_cancelled(cancel_event: Optional[threading.Event]):
+    if cancel_event is not None and cancel_event.is_set():
+        raise ExportCancelled()
+
+
+def _remove_partial(filepath: str):
+    try:
+        if os.path.exists(filepath):
+            os.remove(filepath)
+    except OSError:
+        logger.warning('Could not remove partial export: %s', filepath)
+
+
+def _rollback_partial(filepath: str, previous_size: int):
+    """Undo a cancelled or failed export: truncate an appended file or remove a new one."""
+    if not previous_size:
+        _remove_partial(filepath)
+        return
+    try:
+        with open(filepath, 'r+b') as fh:
+            fh.truncate(previous_size)
+    except OSError:
+        logger.warning('Could not roll back partial append: %s', filepath)
+
+
+def _existing_size(filepath: str, append: bool) -> int:
+    return os.path.getsize(filepath) if append and os.path.exists(filepath) else 0
+
 
 def _default_exports_dir(kind: str) -> str:
     base = os.path.dirname(os.path.dirname(__file__))
@@ -28,10 +79,100 @@ def _timestamped_name(base_name: str) -> str:
     return f"{base_name}_{datetime.utcnow().strftime('%Y%m%d_%H%M%S')}."  # caller appends ext
 
 
-def export_to_csv(records: List[Dict[str, Any]], filename: Optional[str] = None, exports_dir: Optional[str] = None) -> str:
+def _report_name(search_term: str) -> str:
+    """Timestamped report name (without extension) including the search term."""
+    safe_search_term = "".join(c for c in search_term if c.isalnum() or c in (' ', '-', '_')).rstrip()
+    if safe_search_term:
+        return _timestamped_name(f"IntelX_Report_{safe_search_term.replace(' ', '_')}").rstrip('.')
+    return _timestamped_name('IntelX_Report').rstrip('.')
+
+
+# Records sampled from a stream to discover the CSV header when no schema is given
+CSV_SCHEMA_SAMPLE = 1000
+
+# Rows buffered in memory before each writerows() call
+CSV_WRITE_BATCH = 1000
+
+# Output buffer for streaming writers
+WRITE_BUFFER_SIZE = 1 << 20
+
+
+def flatten_value(value: Any) -> str:
+    """Render a record value as a single CSV cell.
+
+    Nested values such as ``relations`` or ``tags`` are encoded as compact
+    JSON so every writer flattens them the same way; ``None`` becomes ''.
+    """
+    if value is None:
+        return ''
+    if isinstance(value, str):
+        return value
+    if isinstance(value, (dict, list, tuple)):
+        return json.dumps(value, ensure_ascii=False, separators=(',', ':'), default=str)
+    return str(value)
+
+
+def discover_fields(records: Iterable[Dict[str, Any]]) -> List[str]:
+    """Union of record keys in first-seen order, using a set for membership."""
+    fields: List[str] = []
+    seen = set()
+    for r in records:
+        for k in r:
+            if k not in seen:
+                seen.add(k)
+                fields.append(k)
+    return fields
+
+
+def _peek_schema(records: Iterable[Dict[str, Any]], sample_size: int) -> Tuple[List[str], Iterator[Dict[str, Any]]]:
+    """Discover the header of ``records`` and return it with an iterator over all records.
+
+    In-memory sequences are scanned completely (same header as before);
+    other iterables only have their first ``sample_size`` records sampled and
+    buffered, so generators are consumed exactly once.
+    """
+    if isinstance(records, Sequence):
+        return discover_fields(records), iter(records)
+    iterator = iter(records)
+    sample = list(itertools.islice(iterator, sample_size))
+    return discover_fields(sample), itertools.chain(sample, iterator)
+
+
+def _csv_cells(rows: Iterable[Dict[str, Any]], keys: Sequence[str], dropped: set) -> Iterator[List[str]]:
+    """Flatten each record into the cells of ``keys``, collecting keys outside the header in ``dropped``."""
+    key_set = frozenset(keys)
+    for r in rows:
+        if len(r) > len(key_set) or not key_set.issuperset(r):
+            dropped.update(k for k in r if k not in key_set)
+        yield [flatten_value(r.get(k)) for k in keys]
+
+
+def export_to_csv(records: Iterable[Dict[str, Any]], filename: Optional[str] = None, exports_dir: Optional[str] = None,
+                  progress_callback: Optional[ProgressCallback] = None,
+                  cancel_event: Optional[threading.Event] = None,
+                  fieldnames: Optional[Sequence[str]] = None,
+                  sample_size: int = CSV_SCHEMA_SAMPLE,
+                  append: bool = False) -> str:
     """Export records to CSV. Returns the file path.
 
     If filename is not provided a timestamped name will be generated.
+    ``records`` may be a list or any iterable/generator; it is consumed once
+    and written in batches of CSV_WRITE_BATCH rows, so memory use does not
+    grow with the number of records. The header is ``fieldnames`` when
+    given, otherwise it is discovered from the records (the first
+    ``sample_size`` ones for streams). Keys outside the header are dropped
+    and reported in the log.
+
+    With ``append`` rows are added to an existing file using its header; the
+    appended records are held in memory, and if they have fields missing
+    from that header the file is rewritten once through a temporary file
+    with those fields added as new columns, so no value is dropped.
+    An ExportProjection is written from its precomputed header and cells.
+
+    progress_callback is called with (written, total) while writing (total
+    is 0 when the size of a stream is unknown); setting cancel_event aborts
+    the export, removes the partial file and raises ExportCancelled. A
+    cancelled or failed append leaves the existing file as it was.
     """
     if exports_dir is None:
         exports_dir = _default_exports_dir('csv')
@@ -39,70 +180,734 @@ def export_to_csv(records: List[Dict[str, Any]], filename: Optional[str] = None,
     if not filename:
         filename = _timestamped_name('intelx_export') + 'csv'
     filepath = os.path.join(exports_dir, filename)
+    total = len(records) if isinstance(records, Sized) else 0
+    previous_size = _existing_size(filepath, append)
 
+    target = filepath
     try:
-        # Determine headers as union of all keys in records
-        keys = []
-        for r in records:
-            for k in r.keys():
-                if k not in keys:
-                    keys.append(k)
+        dropped = set()
+        if isinstance(records, ExportProjection) and records.rows is not None \
+                and not previous_size and fieldnames is None:
+            keys, cells = records.fields, iter(records.rows)
+        else:
+            if previous_size:
+                with open(filepath, 'r', encoding='utf-8', newline='') as fh:
+                    keys = next(csv.reader(fh), [])
+                records = list(records)
+                total = len(records)
+                key_set = frozenset(keys)
+                extra = [k for k in discover_fields(records) if k not in key_set]
+                if extra:
+                    # Widen the header: copy the export with the new columns, then append to the copy
+                    keys = keys + extra
+                    target = filepath + '.tmp'
+                    _copy_csv_widened(filepath, target, keys)
+                rows = iter(records)
+            elif fieldnames is not None:
+                keys, rows = list(fieldnames), iter(records)
+            else:
+                keys, rows = _peek_schema(records, sample_size)
+            cells = _csv_cells(rows, keys, dropped)
 
-        with open(filepath, 'w', encoding='utf-8', newline='') as fh:
-            writer = csv.DictWriter(fh, fieldnames=keys, extrasaction='ignore')
-            writer.writeheader()
-            for r in records:
-                # Ensure all values are primitives or strings
-                row = {k: ('' if r.get(k) is None else str(r.get(k))) for k in keys}
-                writer.writerow(row)
+        written = 0
+        with open(target, 'a' if previous_size else 'w', encoding='utf-8', newline='',
+                  buffering=WRITE_BUFFER_SIZE) as fh:
+            writer = csv.writer(fh)
+            if not previous_size:
+                writer.writerow(keys)
+            batch = []
+            for row in cells:
+                batch.append(row)
+                written += 1
+                if len(batch) >= CSV_WRITE_BATCH:
+                    writer.writerows(batch)
+                    batch.clear()
+                if written % PROGRESS_EVERY == 0:
+                    _check_cancelled(cancel_event)
+                    if progress_callback:
+                        progress_callback(written, total)
+            writer.writerows(batch)
+        if target != filepath:
+            os.replace(target, filepath)
+            logger.info('CSV export %s: header extended with new fields', filepath)
 
-        logger.info('CSV export written: %s', filepath)
+        if dropped:
+            logger.warning('CSV export %s: fields outside the header were skipped: %s',
+                           filepath, ', '.join(sorted(map(str, dropped))))
+        if progress_callback:
+            progress_callback(written, total or written)
+        logger.info('CSV export written: %s (%d records)', filepath, written)
         return filepath
 
+    except ExportCancelled:
+        if target != filepath:
+            _remove_partial(target)
+        else:
+            _rollback_partial(filepath, previous_size)
+        logger.info('CSV export cancelled: %s', filepath)
+        raise
     except Exception as e:
+        if target != filepath:
+            _remove_partial(target)
+        else:
+            _rollback_partial(filepath, previous_size)
         logger.exception('Error writing CSV export')
         raise
 
 
-def export_to_json(records: List[Dict[str, Any]], filename: Optional[str] = None, exports_dir: Optional[str] = None) -> str:
-    """Export records to JSON (pretty printed). Returns the file path."""
+def _copy_csv_widened(source: str, target: str, header: List[str]):
+    """Copy a CSV export under ``header``, padding its rows with empty cells for the new columns."""
+    with open(source, 'r', encoding='utf-8', newline='') as src, \
+            open(target, 'w', encoding='utf-8', newline='', buffering=WRITE_BUFFER_SIZE) as dst:
+        reader = csv.reader(src)
+        next(reader, None)
+        writer = csv.writer(dst)
+        writer.writerow(header)
+        padding = len(header)
+        for row in reader:
+            if row:
+                writer.writerow(row + [''] * (padding - len(row)))
+
+
+def _open_json_array_for_append(filepath: str) -> Tuple[int, bytes, bool]:
+    """Position an existing JSON array export for appending.
+
+    Truncates the file right after its last element (or after '[' for an
+    empty array) and returns ``(offset, removed_tail, has_items)`` so a
+    cancelled append can restore the original bytes.
+    """
+    with open(filepath, 'r+b') as fh:
+        size = fh.seek(0, os.SEEK_END)
+        fh.seek(max(0, size - 4096))
+        tail = fh.read()
+        stripped = tail.rstrip()
+        if not stripped.endswith(b']'):
+            raise ValueError(f'{filepath} is not a JSON array export')
+        before_bracket = stripped[:-1].rstrip()
+        has_items = not before_bracket.endswith(b'[')
+        offset = size - len(tail) + len(before_bracket)
+        fh.seek(offset)
+        removed = fh.read()
+        fh.truncate(offset)
+    return offset, removed, has_items
+
+
+def export_to_json(records: Iterable[Dict[str, Any]], filename: Optional[str] = None, exports_dir: Optional[str] = None,
+                   progress_callback: Optional[ProgressCallback] = None,
+                   cancel_event: Optional[threading.Event] = None,
+                   append: bool = False) -> str:
+    """Export records to JSON (pretty printed). Returns the file path.
+
+    Records are serialized one at a time so progress can be reported and the
+    export cancelled; the output is the same as json.dump(records, indent=2),
+    with values JSON cannot encode written as strings like the other writers.
+    With ``append`` the records are added to the array of an existing export;
+    if the append is cancelled or fails the file is restored byte for byte.
+    """
     if exports_dir is None:
         exports_dir = _default_exports_dir('json')
 
     if not filename:
         filename = _timestamped_name('intelx_export') + 'json'
     filepath = os.path.join(exports_dir, filename)
+    total = len(records) if isinstance(records, Sized) else 0
+    restore = None
 
     try:
-        with open(filepath, 'w', encoding='utf-8') as fh:
-            json.dump(records, fh, indent=2, ensure_ascii=False)
+        if _existing_size(filepath, append):
+            restore = _open_json_array_for_append(filepath)
+            has_items = restore[2]
+        else:
+            has_items = False
 
+        written = 0
+        with open(filepath, 'a' if restore else 'w', encoding='utf-8') as fh:
+            if not restore:
+                fh.write('[')
+            for r in records:
+                fh.write(',\n' if has_items else '\n')
+                has_items = True
+                fh.write(textwrap.indent(json.dumps(r, indent=2, ensure_ascii=False, default=str), '  '))
+                written += 1
+                if written % PROGRESS_EVERY == 0:
+                    _check_cancelled(cancel_event)
+                    if progress_callback:
+                        progress_callback(written, total)
+            fh.write('\n]' if has_items else ']')
+
+        if progress_callback:
+            progress_callback(written, total or written)
         logger.info('JSON export written: %s', filepath)
         return filepath
 
+    except BaseException as e:
+        # The existing array was truncated before writing: put its tail back
+        if restore:
+            offset, removed, _ = restore
+            with open(filepath, 'r+b') as fh:
+                fh.truncate(offset)
+                fh.seek(offset)
+                fh.write(removed)
+        else:
+            _remove_partial(filepath)
+        if isinstance(e, ExportCancelled):
+            logger.info('JSON export cancelled: %s', filepath)
+        else:
+            logger.exception('Error writing JSON export')
+        raise
+
+
+NDJSON_EXTENSIONS = ('.ndjson', '.jsonl')
+
+
+def _open_text(filepath: str, mode: str):
+    """Open a text file, transparently gzip-compressed when it ends in .gz."""
+    if filepath.endswith('.gz'):
+        return gzip.open(filepath, mode + 't', encoding='utf-8', newline='')
+    return open(filepath, mode, encoding='utf-8', newline='', buffering=WRITE_BUFFER_SIZE)
+
+
+def export_to_ndjson(records: Iterable[Dict[str, Any]], filename: Optional[str] = None, exports_dir: Optional[str] = None,
+                     compress: bool = False, append: bool = False,
+                     progress_callback: Optional[ProgressCallback] = None,
+                     cancel_event: Optional[threading.Event] = None) -> str:
+    """Export records as NDJSON (one compact JSON object per line). Returns the file path.
+
+    ``records`` may be any iterable and is written one record at a time, so
+    memory use is constant. With ``compress`` the file is gzip-compressed
+    (``.ndjson.gz``). With ``append`` records are added to an existing file;
+    for gzip files this adds a new member, which readers treat as one
+    stream. A cancelled or failed append restores the file to its previous
+    size; a new file is removed.
+    """
+    if exports_dir is None:
+        exports_dir = _default_exports_dir('ndjson')
+
+    extension = '.ndjson.gz' if compress else '.ndjson'
+    accepted = tuple(ext + '.gz' for ext in NDJSON_EXTENSIONS) if compress else NDJSON_EXTENSIONS
+    if not filename:
+        filename = _timestamped_name('intelx_export') + extension.lstrip('.')
+    elif not filename.endswith(accepted):
+        filename += extension
+    filepath = os.path.join(exports_dir, filename)
+    total = len(records) if isinstance(records, Sized) else 0
+    previous_size = _existing_size(filepath, append)
+
+    try:
+        written = 0
+        with _open_text(filepath, 'a' if append else 'w') as fh:
+            for r in records:
+                fh.write(json.dumps(r, ensure_ascii=False, separators=(',', ':'), default=str))
+                fh.write('\n')
+                written += 1
+                if written % PROGRESS_EVERY == 0:
+                    _check_cancelled(cancel_event)
+                    if progress_callback:
+                        progress_callback(written, total)
+
+        if progress_callback:
+            progress_callback(written, total or written)
+        logger.info('NDJSON export written: %s (%d records)', filepath, written)
+        return filepath
+
+    except ExportCancelled:
+        _rollback_partial(filepath, previous_size)
+        logger.info('NDJSON export cancelled: %s', filepath)
+        raise
+    except Exception:
+        _rollback_partial(filepath, previous_size)
+        logger.exception('Error writing NDJSON export')
+        raise
+
+
+def read_ndjson(filepath: str) -> Iterator[Dict[str, Any]]:
+    """Stream records from an NDJSON/JSON Lines file (optionally .gz), one at a time.
+
+    Blank lines are skipped; malformed lines are logged and skipped so a
+    truncated archive can still be processed.
+    """
+    with _open_text(filepath, 'r') as fh:
+        for line_number, line in enumerate(fh, start=1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                logger.warning('Skipping malformed NDJSON line %d in %s', line_number, filepath)
+
+
+def _read_csv(filepath: str) -> Iterator[Dict[str, Any]]:
+    """Stream CSV records, restoring the integer columns (INT_COLUMNS) the writer stored as text.
+
+    Empty or unparsable integer cells become None, like a missing value.
+    """
+    with open(filepath, 'r', encoding='utf-8', newline='') as fh:
+        for row in csv.DictReader(fh):
+            for name in INT_COLUMNS:
+                if name in row:
+                    row[name] = _optional_int(row[name])
+            yield row
+
+
+def load_records(filepath: str) -> Iterator[Dict[str, Any]]:
+    """Iterate the records stored in an export file.
+
+    NDJSON/JSON Lines files (``.ndjson``, ``.jsonl``, optionally ``.gz``) and
+    CSV files (with their integer columns restored) are streamed; Parquet and Feather exports are streamed one
+    record batch at a time (see _read_columnar_records) and a shard manifest
+    (see export_sharded) streams its parts in order. JSON files are loaded
+    whole and may hold a list of records or a dict with a ``records`` key.
+    """
+    if filepath.endswith(MANIFEST_SUFFIX):
+        return itertools.chain.from_iterable(
+            load_records(shard['path']) for shard in read_manifest(filepath)['shards'])
+    if filepath.endswith(('.parquet', '.feather')):
+        return _read_columnar_records(filepath)
+    base = filepath[:-3] if filepath.endswith('.gz') else filepath
+    if base.endswith(NDJSON_EXTENSIONS):
+        return read_ndjson(filepath)
+    if filepath.endswith('.csv'):
+        return _read_csv(filepath)
+    with _open_text(filepath, 'r') as fh:
+        data = json.load(fh)
+    if isinstance(data, dict):
+        data = data.get('records', [])
+    return iter(data)
+
+
+# Sidecar file next to an export listing the record keys it already contains
+ID_INDEX_SUFFIX = '.ids'
+
+
+def _export_stamp(filepath: str) -> str:
+    """Size and mtime of an export, recorded in its id index to detect changes."""
+    stat = os.stat(filepath)
+    return f'#{stat.st_size} {stat.st_mtime_ns}'
+
+
+def load_id_index(filepath: str) -> set:
+    """Keys (see record_key) of the records already in ``filepath``.
+
+    Read from the ``.ids`` sidecar, whose last ``#<size> <mtime>`` line must
+    match the export; when the sidecar is missing or the export was changed,
+    replaced or deleted since, it is rebuilt with one streaming pass over the
+    file. Records without a systemid or storageid are keyed by a hash of
+    their content, which does not survive the CSV round trip: a rebuilt CSV
+    index leaves them out, so they are not deduplicated against it.
+    """
+    index_path = filepath + ID_INDEX_SUFFIX
+    if not os.path.exists(filepath):
+        _remove_partial(index_path)
+        return set()
+    stamp = _export_stamp(filepath)
+    if os.path.exists(index_path):
+        keys = set()
+        index_stamp = None
+        with open(index_path, 'r', encoding='utf-8') as fh:
+            for line in fh:
+                line = line.rstrip('\n')
+                if line.startswith('#'):
+                    index_stamp = line
+                elif line:
+                    keys.add(line)
+        if index_stamp == stamp:
+            return keys
+        logger.info('Id index of %s does not match the export, rebuilding it', filepath)
+    keys = {record_key(r) for r in load_records(filepath)}
+    if filepath.endswith('.csv'):
+        keys = {k for k in keys if not k.startswith('sha1:')}
+    with open(index_path, 'w', encoding='utf-8') as fh:
+        fh.writelines(k + '\n' for k in keys)
+        fh.write(stamp + '\n')
+    logger.info('Rebuilt id index for %s (%d records)', filepath, len(keys))
+    return keys
+
+
+def append_export(records: Iterable[Dict[str, Any]], filepath: str,
+                  progress_callback: Optional[ProgressCallback] = None,
+                  cancel_event: Optional[threading.Event] = None) -> Dict[str, Any]:
+    """Append only the records not already present in an export.
+
+    The format follows the extension (.csv, .json, .ndjson/.jsonl[.gz]); the
+    file is created when missing. Records are keyed by systemid (see
+    record_key) against the export's ``.ids`` sidecar (see load_id_index),
+    which is updated after a successful append. Returns a dict with ``filepath``, ``new`` and
+    ``duplicates`` counts.
+
+    Interactive HTML reports (.html) are updated incrementally from their
+    state sidecar instead (see append_interactive_html_report), so they must
+    have been created by an append or with ``keep_state``.
+    """
+    if filepath.endswith('.html'):
+        _check_cancelled(cancel_event)
+        result = append_interactive_html_report(list(records), filepath)
+        if progress_callback:
+            progress_callback(result['new'], result['new'])
+        logger.info('Appended %d new records to %s (%d duplicates skipped)',
+                    result['new'], filepath, result['duplicates'])
+        return result
+
+    seen = load_id_index(filepath)
+    new_keys: List[str] = []
+    duplicates = 0
+
+    def fresh_records():
+        nonlocal duplicates
+        for r in records:
+            key = record_key(r)
+            if key in seen:
+                duplicates += 1
+                continue
+            seen.add(key)
+            new_keys.append(key)
+            yield r
+
+    exports_dir, filename = os.path.split(os.path.abspath(filepath))
+    base = filepath[:-3] if filepath.endswith('.gz') else filepath
+    options = dict(filename=filename, exports_dir=exports_dir, append=True,
+                   progress_callback=progress_callback, cancel_event=cancel_event)
+    if base.endswith(NDJSON_EXTENSIONS):
+        filepath = export_to_ndjson(fresh_records(), compress=filepath.endswith('.gz'), **options)
+    elif filepath.endswith('.csv'):
+        filepath = export_to_csv(fresh_records(), **options)
+    elif filepath.endswith('.json'):
+        filepath = export_to_json(fresh_records(), **options)
+    else:
+        raise ValueError(f'Unsupported export format for append: {filepath}')
+
+    with open(filepath + ID_INDEX_SUFFIX, 'a', encoding='utf-8') as fh:
+        fh.writelines(k + '\n' for k in new_keys)
+        fh.write(_export_stamp(filepath) + '\n')
+    logger.info('Appended %d new records to %s (%d duplicates skipped)', len(new_keys), filepath, duplicates)
+    return {'filepath': filepath, 'new': len(new_keys), 'duplicates': duplicates}
+
+
+# Rows per Parquet row group / Arrow record batch
+COLUMNAR_ROW_GROUP = 50_000
+
+# Typed columns for the columnar formats; any other field is stored as a string
+INT_COLUMNS = ('type', 'media', 'xscore', 'size', 'accesslevel')
+TIMESTAMP_COLUMNS = ('date', 'added')
+CATEGORY_COLUMNS = ('bucket', 'bucketh', 'typeh', 'mediah')
+LIST_COLUMNS = ('relations', 'tags')
+BOOL_COLUMNS = ('instore', 'perfectmatch', 'indexed')
+
+
+def _require_pyarrow():
+    """Import pyarrow lazily so the GUI does not pay for it at startup."""
+    try:
+        import pyarrow
+        import pyarrow.ipc
+        import pyarrow.parquet
+    except ImportError as e:
+        raise ImportError('Parquet/Feather export requires pyarrow (pip install pyarrow)') from e
+    return pyarrow
+
+
+def _optional_int(value: Any) -> Optional[int]:
+    if value is None or value == '':
+        return None
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _optional_bool(value: Any) -> Optional[bool]:
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, int) and value in (0, 1):
+        return bool(value)
+    if isinstance(value, str):
+        return {'true': True, 'false': False, '1': True, '0': False}.get(value.strip().lower())
+    return None
+
+
+def _parse_timestamp(value: Any) -> Optional[datetime]:
+    """Parse an IntelX date ('2020-01-31T12:00:00Z', '2020-01-31 12:00:00', ...) as UTC."""
+    if not value:
+        return None
+    if isinstance(value, datetime):
+        parsed = value
+    else:
+        try:
+            parsed = datetime.fromisoformat(str(value).strip().replace('Z', '+00:00'))
+        except ValueError:
+            return None
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+def _columnar_value(name: str, value: Any, coerced: Optional[Counter] = None) -> Any:
+    """Value of field ``name`` as stored in its typed column.
+
+    Non-empty values of a typed column that cannot be converted are stored
+    as null and counted by field in ``coerced``.
+    """
+    if name in INT_COLUMNS or name in TIMESTAMP_COLUMNS or name in BOOL_COLUMNS:
+        if name in INT_COLUMNS:
+            converted = _optional_int(value)
+        elif name in TIMESTAMP_COLUMNS:
+            converted = _parse_timestamp(value)
+        else:
+            converted = _optional_bool(value)
+        if converted is None and value is not None and value != '' and coerced is not None:
+            coerced[name] += 1
+        return converted
+    if value is None:
+        return None
+    if name in LIST_COLUMNS:
+        # One element per relation/tag, each flattened like a CSV cell
+        items = value if isinstance(value, (list, tuple)) else [value]
+        return [flatten_value(v) for v in items]
+    return flatten_value(value)
+
+
+def _arrow_schema(pa, fields: Sequence[str], dictionary_categories: bool):
+    columns = []
+    for name in fields:
+        if name in INT_COLUMNS:
+            arrow_type = pa.int64()
+        elif name in TIMESTAMP_COLUMNS:
+            arrow_type = pa.timestamp('us', tz='UTC')
+        elif name in BOOL_COLUMNS:
+            arrow_type = pa.bool_()
+        elif name in CATEGORY_COLUMNS and dictionary_categories:
+            arrow_type = pa.dictionary(pa.int32(), pa.string())
+        elif name in LIST_COLUMNS:
+            arrow_type = pa.list_(pa.string())
+        else:
+            arrow_type = pa.string()
+        columns.append(pa.field(name, arrow_type))
+    return pa.schema(columns)
+
+
+def _record_batch(pa, schema, rows: List[Dict[str, Any]], coerced: Optional[Counter] = None):
+    return _arrow_batch(pa, schema, ([_columnar_value(field.name, r.get(field.name), coerced) for r in rows]
+                                     for field in schema))
+
+
+def _arrow_batch(pa, schema, columns: Iterable[List[Any]]):
+    """Record batch from the converted values (see _columnar_value) of each schema field."""
+    arrays = []
+    for field, values in zip(schema, columns):
+        if pa.types.is_dictionary(field.type):
+            arrays.append(pa.array(values, type=pa.string()).dictionary_encode())
+        else:
+            arrays.append(pa.array(values, type=field.type))
+    return pa.RecordBatch.from_arrays(arrays, schema=schema)
+
+
+def _export_columnar(kind: str, records: Iterable[Dict[str, Any]], filename: Optional[str],
+                     exports_dir: Optional[str], row_group_size: int, compression: Optional[str],
+                     progress_callback: Optional[ProgressCallback],
+                     cancel_event: Optional[threading.Event],
+                     fieldnames: Optional[Sequence[str]]) -> str:
+    pa = _require_pyarrow()
+    if exports_dir is None:
+        exports_dir = _default_exports_dir(kind)
+
+    extension = '.' + kind
+    if not filename:
+        filename = _timestamped_name('intelx_export') + kind
+    elif not filename.endswith(extension):
+        filename += extension
+    filepath = os.path.join(exports_dir, filename)
+    total = len(records) if isinstance(records, Sized) else 0
+
+    columns = None
+    coerced: Counter = Counter()
+    if isinstance(records, ExportProjection) and records.columns is not None and fieldnames is None:
+        fields, columns = list(records.columns), records.columns
+        coerced = records.coerced
+        rows = None
+    elif fieldnames is not None:
+        fields, rows = list(fieldnames), iter(records)
+    else:
+        fields, rows = _peek_schema(records, max(row_group_size, CSV_SCHEMA_SAMPLE))
+    fields = [str(f) for f in fields]
+
+    # Arrow IPC files (Feather) cannot change dictionaries between batches, so
+    # categories are stored as strings there and restored by read_columnar().
+    schema = _arrow_schema(pa, fields, dictionary_categories=(kind == 'parquet'))
+    if kind == 'parquet':
+        writer = pa.parquet.ParquetWriter(filepath, schema, compression=compression or 'none')
+        write = lambda batch: writer.write_table(pa.Table.from_batches([batch]))
+    else:
+        options = pa.ipc.IpcWriteOptions(compression=compression)
+        writer = pa.ipc.new_file(filepath, schema, options=options)
+        write = writer.write_batch
+
+    try:
+        written = 0
+        try:
+            if columns is not None:
+                # Values already converted by ExportProjection: slice them into row groups
+                for start in range(0, total, row_group_size):
+                    _check_cancelled(cancel_event)
+                    stop = min(start + row_group_size, total)
+                    write(_arrow_batch(pa, schema, (columns[name][start:stop] for name in fields)))
+                    written = stop
+                    if progress_callback:
+                        progress_callback(written, total)
+            else:
+                while True:
+                    chunk = list(itertools.islice(rows, row_group_size))
+                    if not chunk:
+                        break
+                    _check_cancelled(cancel_event)
+                    write(_record_batch(pa, schema, chunk, coerced))
+                    written += len(chunk)
+                    if progress_callback:
+                        progress_callback(written, total)
+        finally:
+            writer.close()
+
+        if coerced:
+            logger.warning('%s export %s: values that could not be converted were stored as null: %s',
+                           kind.capitalize(), filepath,
+                           ', '.join(f'{name} ({count})' for name, count in sorted(coerced.items())))
+        if progress_callback:
+            progress_callback(written, total or written)
+        logger.info('%s export written: %s (%d records)', kind.capitalize(), filepath, written)
+        return filepath
+
+    except ExportCancelled:
+        _remove_partial(filepath)
+        logger.info('%s export cancelled: %s', kind.capitalize(), filepath)
+        raise
     except Exception:
-        logger.exception('Error writing JSON export')
+        logger.exception('Error writing %s export', kind.capitalize())
         raise
 
 
-def select_records_for_export(records: List[Dict[str, Any]], selected_ids: Optional[List[str]] = None, id_field: str = 'storageid') -> List[Dict[str, Any]]:
+def export_to_parquet(records: Iterable[Dict[str, Any]], filename: Optional[str] = None, exports_dir: Optional[str] = None,
+                      row_group_size: int = COLUMNAR_ROW_GROUP, compression: str = 'zstd',
+                      progress_callback: Optional[ProgressCallback] = None,
+                      cancel_event: Optional[threading.Event] = None,
+                      fieldnames: Optional[Sequence[str]] = None) -> str:
+    """Export records to Parquet with typed columns. Returns the file path.
+
+    media/type/xscore/size are int64, date/added UTC timestamps,
+    instore/perfectmatch/indexed booleans, bucket fields dictionary-encoded (categorical) and relations/tags lists of
+    strings. Records are consumed from any iterable and written one row
+    group of ``row_group_size`` rows at a time. Requires pyarrow.
+    """
+    return _export_columnar('parquet', records, filename, exports_dir, row_group_size, compression,
+                            progress_callback, cancel_event, fieldnames)
+
+
+def export_to_feather(records: Iterable[Dict[str, Any]], filename: Optional[str] = None, exports_dir: Optional[str] = None,
+                      row_group_size: int = COLUMNAR_ROW_GROUP, compression: Optional[str] = 'lz4',
+                      progress_callback: Optional[ProgressCallback] = None,
+                      cancel_event: Optional[threading.Event] = None,
+                      fieldnames: Optional[Sequence[str]] = None) -> str:
+    """Export records to Feather (Arrow IPC) in record batches. Returns the file path.
+
+    Uses the same column types as export_to_parquet, except that bucket
+    fields are stored as strings (see read_columnar). Requires pyarrow.
+    """
+    return _export_columnar('feather', records, filename, exports_dir, row_group_size, compression,
+                            progress_callback, cancel_event, fieldnames)
+
+
+def read_columnar(filepath: str, columns: Optional[List[str]] = None):
+    """Load a Parquet or Feather export into a pandas DataFrame.
+
+    Bucket columns come back as ``category`` dtype for both formats. A shard
+    manifest loads its parts in parallel and concatenates them.
+    """
+    import pandas as pd
+
+    if filepath.endswith(MANIFEST_SUFFIX):
+        shard_paths = [shard['path'] for shard in read_manifest(filepath)['shards']]
+        with ThreadPoolExecutor() as executor:
+            frames = list(executor.map(lambda path: read_columnar(path, columns), shard_paths))
+        df = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=columns)
+    elif filepath.endswith('.feather'):
+        df = pd.read_feather(filepath, columns=columns)
+    else:
+        df = pd.read_parquet(filepath, columns=columns)
+    for col in CATEGORY_COLUMNS:
+        if col in df.columns and not isinstance(df[col].dtype, pd.CategoricalDtype):
+            df[col] = df[col].astype('category')
+    return df
+
+
+def _format_timestamp(value: datetime) -> str:
+    """IntelX date string of a UTC timestamp ('2020-01-31T12:00:00.5Z')."""
+    value = value.astimezone(timezone.utc)
+    fraction = f'.{value.microsecond:06d}'.rstrip('0') if value.microsecond else ''
+    return value.strftime('%Y-%m-%dT%H:%M:%S') + fraction + 'Z'
+
+
+def _list_item(value: str) -> Any:
+    # Nested relations/tags were flattened to compact JSON (see _columnar_value)
+    if value[:1] in ('{', '['):
+        try:
+            return json.loads(value)
+        except ValueError:
+            pass
+    return value
+
+
+def _read_columnar_records(filepath: str) -> Iterator[Dict[str, Any]]:
+    """Stream a Parquet or Feather export back as record dicts.
+
+    Reverses _columnar_value: null fields are left out, timestamps become
+    IntelX date strings, bucket categories plain strings and relations/tags
+    lists of their original items. Requires pyarrow.
+    """
+    pa = _require_pyarrow()
+    if filepath.endswith('.feather'):
+        reader = pa.ipc.open_file(filepath)
+        batches = (reader.get_batch(i) for i in range(reader.num_record_batches))
+    else:
+        batches = pa.parquet.ParquetFile(filepath).iter_batches(batch_size=COLUMNAR_ROW_GROUP)
+    for batch in batches:
+        for row in batch.to_pylist():
+            record = {}
+            for name, value in row.items():
+                if value is None:
+                    continue
+                if name in TIMESTAMP_COLUMNS:
+                    value = _format_timestamp(value)
+                elif name in LIST_COLUMNS:
+                    value = [_list_item(item) for item in value]
+                record[name] = value
+            yield record
+
+
+def select_records_for_export(records: List[Dict[str, Any]], selected_ids: Optional[List[str]] = None, id_field: str = 'storageid',
+                              registry: Optional[RecordRegistry] = None) -> List[Dict[str, Any]]:
     """Return a subset of records filtered by a list of ids (id_field).
 
     If selected_ids is None or empty the full records list is returned.
+    When a RecordRegistry is given its hash indexes are used, so the cost is
+    proportional to the selection size instead of the total record count.
     """
     if not selected_ids:
         return records
 
+    if registry is not None:
+        return registry.select(selected_ids, id_field=id_field)
+
     id_set = set(str(i) for i in selected_ids)
     filtered = [r for r in records if str(r.get(id_field, '')) in id_set]
     return filtered
 
 
-def export_to_interactive_html(records: List[Dict[str, Any]], 
-                              filename: Optional[str] = None, 
+def export_to_interactive_html(records: List[Dict[str, Any]],
+                              filename: Optional[str] = None,
                               exports_dir: Optional[str] = None,
                               search_term: str = "",
-                              app_version: str = "2.0.0") -> str:
+                              app_version: str = "2.0.0",
+                              progress_callback: Optional[ProgressCallback] = None,
+                              cancel_event: Optional[threading.Event] = None,
+                              compress: bool = False,
+                              granularity: str = 'quarter',
+                              temporal_range: Optional[Tuple[Any, Any]] = None,
+                              keep_state: bool = False) -> str:
     """Export records to an interactive HTML report. Returns the file path.
 
     This generates a modern, interactive HTML report with:
@@ -110,14 +915,27 @@ def export_to_interactive_html(records: List[Dict[str, Any]],
     - Data visualization charts
     - Modern responsive design
     - Standalone HTML file (no external dependencies except CDN for Chart.js)
-    
+
     Args:
         records: List of record dictionaries to export
         filename: Optional filename. If not provided, a timestamped name will be generated
         exports_dir: Optional directory path. Defaults to exports/html/
         search_term: The search term used to generate these results
         app_version: Application version for the footer
-        
+        progress_callback: Optional callable receiving (written, total)
+        cancel_event: Optional event; if it is set the report is discarded
+            and ExportCancelled is raised
+        compress: Embed the table data as compressed chunks that the browser
+            decodes progressively (smaller file, still standalone)
+        granularity: Period of the temporal chart: 'day', 'week', 'month'
+            or 'quarter'
+        temporal_range: Optional inclusive (start, end) dates of the temporal
+            chart; defaults to the last 5 calendar years
+        keep_state: Also save the report's state sidecars so later results
+            can be appended incrementally (see append_export)
+
+    An ExportProjection reuses its classification and aggregates.
+
     Returns:
         The full path to the generated HTML file
     """
@@ -126,22 +944,403 @@ def export_to_interactive_html(records: List[Dict[str, Any]],
 
     if not filename:
         # Generate filename based on search term and timestamp
-        safe_search_term = "".join(c for c in search_term if c.isalnum() or c in (' ', '-', '_')).rstrip()
-        if safe_search_term:
-            filename = f"IntelX_Report_{safe_search_term.replace(' ', '_')}_{datetime.utcnow().strftime('%Y%m%d_%H%M%S')}.html"
-        else:
-            filename = _timestamped_name('IntelX_Report') + 'html'
-    
+        filename = _report_name(search_term) + '.html'
+
     filepath = os.path.join(exports_dir, filename)
 
     try:
+        _check_cancelled(cancel_event)
+        if progress_callback:
+            progress_callback(0, len(records))
+
         # Generate the interactive report
-        result_path = generate_interactive_html_report(records, filepath, search_term, app_version)
+        precomputed: Dict[str, Any] = {}
+        if isinstance(records, ExportProjection):
+            precomputed = {'data_types': records.data_types, 'aggregates': records.aggregates}
+            records = records.records
+        result_path = generate_interactive_html_report(records, filepath, search_term, app_version,
+                                                       compress=compress, granularity=granularity,
+                                                       temporal_range=temporal_range, keep_state=keep_state,
+                                                       **precomputed)
+
+        if cancel_event is not None and cancel_event.is_set():
+            _remove_partial(result_path)
+            for suffix in REPORT_SIDECAR_SUFFIXES:
+                _remove_partial(result_path + suffix)
+            raise ExportCancelled()
+        if progress_callback:
+            progress_callback(len(records), len(records))
         logger.info('Interactive HTML report written: %s', result_path)
         return result_path
 
+    except ExportCancelled:
+        logger.info('Interactive HTML export cancelled: %s', filepath)
+        raise
     except Exception as e:
         logger.exception('Error writing interactive HTML report')
         raise
 
 
+def export_sharded_interactive_html(records: List[Dict[str, Any]],
+                                    exports_dir: Optional[str] = None,
+                                    base_name: Optional[str] = None,
+                                    search_term: str = "",
+                                    app_version: str = "2.0.0",
+                                    shard_by: str = 'bucket',
+                                    max_page_records: int = SHARD_PAGE_RECORDS,
+                                    max_workers: Optional[int] = None,
+                                    use_processes: bool = True,
+                                    progress_callback: Optional[ProgressCallback] = None,
+                                    cancel_event: Optional[threading.Event] = None,
+                                    compress: bool = False,
+                                    granularity: str = 'quarter',
+                                    temporal_range: Optional[Tuple[Any, Any]] = None) -> str:
+    """Export records as a multi-page interactive HTML report. Returns the index path.
+
+    The report set is written to the ``base_name`` directory of ``exports_dir``
+    (see generate_sharded_html_report): an index page with the KPIs and
+    charts of all records plus data pages per bucket or period
+    (``shard_by``) of at most ``max_page_records`` records, written in
+    parallel and sharing one stylesheet and script. If ``cancel_event`` is
+    set the pages written so far are discarded and ExportCancelled is raised.
+    """
+    if exports_dir is None:
+        exports_dir = _default_exports_dir('html')
+    output_dir = os.path.join(exports_dir, base_name or _report_name(search_term))
+    created = not os.path.exists(output_dir)
+
+    def progress(written: int, total: int):
+        _check_cancelled(cancel_event)
+        if progress_callback:
+            progress_callback(written, total)
+
+    try:
+        progress(0, len(records))
+        index_path = generate_sharded_html_report(records, output_dir, search_term, app_version,
+                                                  shard_by=shard_by, max_page_records=max_page_records,
+                                                  max_workers=max_workers, use_processes=use_processes,
+                                                  compress=compress, granularity=granularity,
+                                                  temporal_range=temporal_range, progress_callback=progress)
+        _check_cancelled(cancel_event)
+        logger.info('Sharded interactive HTML report written: %s', index_path)
+        return index_path
+
+    except ExportCancelled:
+        if created:
+            shutil.rmtree(output_dir, ignore_errors=True)
+        logger.info('Sharded interactive HTML export cancelled: %s', output_dir)
+        raise
+    except Exception:
+        logger.exception('Error writing sharded interactive HTML report')
+        raise
+
+
+# Writers usable by export_all, by format name, and their file extensions
+FORMAT_WRITERS: Dict[str, Callable[..., str]] = {
+    'csv': export_to_csv,
+    'json': export_to_json,
+    'ndjson': export_to_ndjson,
+    'parquet': export_to_parquet,
+    'feather': export_to_feather,
+    'html': export_to_interactive_html,
+}
+FORMAT_EXTENSIONS = {fmt: fmt for fmt in FORMAT_WRITERS}
+
+
+class ExportProjection:
+    """One result set prepared once for every writer of an export bundle.
+
+    ``records`` are the normalized dicts (JSON/NDJSON) and ``fields`` their
+    discovered schema. Depending on ``formats`` it also holds ``rows``, the
+    flattened CSV cells in ``fields`` order, ``columns``, the typed values
+    of the columnar formats by field, and ``data_types``/``aggregates``, the
+    classification and running totals of the HTML report; the others are
+    None. Writers given a projection use these instead of recomputing them,
+    and it iterates over ``records`` for anything else.
+    """
+
+    def __init__(self, records: Iterable[Any], formats: Iterable[str] = tuple(FORMAT_WRITERS)):
+        formats = set(formats)
+        self.records = [normalize_record(r, i) for i, r in enumerate(records)]
+        self.fields = discover_fields(self.records)
+        self.rows: Optional[List[List[str]]] = None
+        self.columns: Optional[Dict[str, List[Any]]] = None
+        # Values of typed columns that could not be converted, by field
+        self.coerced: Counter = Counter()
+        self.data_types: Optional[List[str]] = None
+        self.aggregates: Optional[Dict[str, Any]] = None
+        if 'csv' in formats:
+            self.rows = [[flatten_value(r.get(k)) for k in self.fields] for r in self.records]
+        if formats & {'parquet', 'feather'}:
+            names = [str(f) for f in self.fields]
+            self.columns = {name: [_columnar_value(name, r.get(name), self.coerced) for r in self.records]
+                            for name in names}
+        if 'html' in formats:
+            self.data_types = DataProcessor.classify_records(self.records)
+            self.aggregates = DataProcessor.new_aggregates()
+            DataProcessor.accumulate_records(self.aggregates, self.records, self.data_types)
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        return iter(self.records)
+
+
+def project_records(records: Iterable[Any], formats: Iterable[str] = tuple(FORMAT_WRITERS)) -> ExportProjection:
+    """Project records once into what the writers of ``formats`` share."""
+    return ExportProjection(records, formats)
+
+
+def _timed_write(fmt: str, records: ExportProjection, options: Dict[str, Any]) -> Tuple[str, float]:
+    # Module level so it can also run in a worker process
+    started = time.perf_counter()
+    path = FORMAT_WRITERS[fmt](records, **options)
+    return path, time.perf_counter() - started
+
+
+def export_all(records: Iterable[Any], formats: Sequence[str] = ('csv', 'json', 'html'),
+               exports_dir: Optional[str] = None, base_name: Optional[str] = None,
+               search_term: str = "", app_version: str = "2.0.0",
+               max_workers: Optional[int] = None, use_processes: bool = False,
+               progress_callback: Optional[ProgressCallback] = None,
+               cancel_event: Optional[threading.Event] = None) -> Dict[str, Any]:
+    """Export one result set to several formats from a single projection pass.
+
+    Records are projected once (see ExportProjection: flattened rows, typed
+    columns, classification and analysis) and handed to every format writer; the writers run concurrently in threads (default) or,
+    with ``use_processes``, in worker processes (progress and cancellation
+    are then only checked between formats). All files go to one bundle
+    directory, by default ``exports/bundle/<base_name>_<timestamp>``.
+
+    Returns a dict with ``filepath`` (the bundle directory), ``paths``
+    (format -> file), ``timings`` (seconds per format plus ``projection``
+    and ``total``) and ``errors`` (format -> message) for writers that
+    failed. Raises ExportCancelled if cancel_event is set. A bundle
+    directory created by this call is removed again when the export is
+    cancelled or every format fails.
+    """
+    formats = list(dict.fromkeys(formats))
+    unknown = [fmt for fmt in formats if fmt not in FORMAT_WRITERS]
+    if unknown:
+        raise ValueError(f"Unsupported export formats: {', '.join(unknown)}")
+
+    started = time.perf_counter()
+    projection = project_records(records, formats)
+    timings: Dict[str, float] = {'projection': time.perf_counter() - started}
+    _check_cancelled(cancel_event)
+
+    base_name = base_name or 'intelx_export'
+    if exports_dir is None:
+        exports_dir = os.path.join(_default_exports_dir('bundle'), _timestamped_name(base_name).rstrip('.'))
+    created = not os.path.exists(exports_dir)
+    os.makedirs(exports_dir, exist_ok=True)
+
+    total = len(projection) * len(formats)
+    written_by_format: Dict[str, int] = {}
+    progress_lock = threading.Lock()
+
+    def format_progress(fmt: str):
+        def progress(written: int, _total: int):
+            with progress_lock:
+                written_by_format[fmt] = written
+                done = sum(written_by_format.values())
+            progress_callback(done, total)
+        return progress
+
+    def options_for(fmt: str) -> Dict[str, Any]:
+        options: Dict[str, Any] = {
+            'filename': f'{base_name}.{FORMAT_EXTENSIONS[fmt]}',
+            'exports_dir': exports_dir,
+        }
+        if fmt == 'html':
+            options.update(search_term=search_term, app_version=app_version)
+        if not use_processes:
+            options['cancel_event'] = cancel_event
+            if progress_callback:
+                options['progress_callback'] = format_progress(fmt)
+        return options
+
+    paths: Dict[str, str] = {}
+    errors: Dict[str, str] = {}
+    cancelled = False
+    executor_class = ProcessPoolExecutor if use_processes else ThreadPoolExecutor
+    with executor_class(max_workers=max_workers or len(formats)) as executor:
+        futures = {executor.submit(_timed_write, fmt, projection, options_for(fmt)): fmt for fmt in formats}
+        for future, fmt in futures.items():
+            try:
+                paths[fmt], timings[fmt] = future.result()
+            except ExportCancelled:
+                cancelled = True
+            except Exception as e:
+                logger.exception('Error writing %s in export bundle', fmt.upper())
+                errors[fmt] = str(e)
+            if use_processes and cancel_event is not None and cancel_event.is_set():
+                for pending in futures:
+                    pending.cancel()
+                cancelled = True
+
+    if cancelled or (cancel_event is not None and cancel_event.is_set()):
+        for path in paths.values():
+            _remove_partial(path)
+        if created:
+            shutil.rmtree(exports_dir, ignore_errors=True)
+        logger.info('Export bundle cancelled: %s', exports_dir)
+        raise ExportCancelled()
+
+    if not paths and created:
+        # Every writer failed: do not leave an empty bundle directory behind
+        shutil.rmtree(exports_dir, ignore_errors=True)
+
+    timings['total'] = time.perf_counter() - started
+    logger.info('Export bundle written: %s (%s) in %.2fs', exports_dir,
+                ', '.join(f'{fmt} {timings[fmt]:.2f}s' for fmt in paths), timings['total'])
+    return {'filepath': exports_dir, 'paths': paths, 'timings': timings, 'errors': errors}
+
+
+# Shard manifests: <base>.manifest.json next to <base>.partNNNN.<ext>
+MANIFEST_SUFFIX = '.manifest.json'
+
+
+def _file_checksum(filepath: str) -> str:
+    digest = hashlib.sha256()
+    with open(filepath, 'rb') as fh:
+        for block in iter(lambda: fh.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _iter_shards(records: Iterable[Any], max_records: Optional[int],
+                 max_bytes: Optional[int]) -> Iterator[List[Dict[str, Any]]]:
+    """Split records into consecutive shards by count and approximate serialized size."""
+    shard: List[Dict[str, Any]] = []
+    shard_bytes = 0
+    for i, r in enumerate(records):
+        r = normalize_record(r, i)
+        if max_bytes:
+            shard_bytes += len(json.dumps(r, ensure_ascii=False, separators=(',', ':'), default=str)) + 1
+        shard.append(r)
+        if (max_records and len(shard) >= max_records) or (max_bytes and shard_bytes >= max_bytes):
+            yield shard
+            shard, shard_bytes = [], 0
+    if shard:
+        yield shard
+
+
+def read_manifest(filepath: str, verify: bool = False) -> Dict[str, Any]:
+    """Load a shard manifest, resolving each shard to an absolute ``path``.
+
+    With ``verify`` every shard's size and SHA-256 are checked (ValueError on
+    mismatch).
+    """
+    with open(filepath, 'r', encoding='utf-8') as fh:
+        manifest = json.load(fh)
+    base_dir = os.path.dirname(os.path.abspath(filepath))
+    for shard in manifest['shards']:
+        shard['path'] = os.path.join(base_dir, shard['file'])
+        if verify and (os.path.getsize(shard['path']) != shard['bytes']
+                       or _file_checksum(shard['path']) != shard['sha256']):
+            raise ValueError(f"Shard {shard['file']} does not match its manifest entry")
+    return manifest
+
+
+def export_sharded(records: Iterable[Any], fmt: str = 'csv', base_name: Optional[str] = None,
+                   exports_dir: Optional[str] = None, max_records: Optional[int] = 100_000,
+                   max_bytes: Optional[int] = None, parallel: bool = False,
+                   max_workers: Optional[int] = None,
+                   progress_callback: Optional[ProgressCallback] = None,
+                   cancel_event: Optional[threading.Event] = None,
+                   **writer_options) -> str:
+    """Export records as a set of part files plus a manifest. Returns the manifest path.
+
+    A new part starts after ``max_records`` records or roughly ``max_bytes``
+    bytes of serialized records, whichever comes first. Only the shard being
+    filled is held in memory; with ``parallel`` up to ``max_workers`` shards
+    are written concurrently (a few more may be queued). The manifest lists
+    every part with its record count, size and SHA-256; load_records() and
+    read_columnar() accept it in place of a single file. ``writer_options``
+    are passed to the format writer (e.g. ``compress`` for NDJSON).
+    """
+    if fmt not in FORMAT_WRITERS:
+        raise ValueError(f'Unsupported export format: {fmt}')
+    if not max_records and not max_bytes:
+        raise ValueError('max_records or max_bytes is required for a sharded export')
+    if exports_dir is None:
+        exports_dir = _default_exports_dir(fmt)
+    base_name = base_name or _timestamped_name('intelx_export').rstrip('.')
+    manifest_path = os.path.join(exports_dir, base_name + MANIFEST_SUFFIX)
+    writer = FORMAT_WRITERS[fmt]
+    extension = FORMAT_EXTENSIONS[fmt] + ('.gz' if writer_options.get('compress') else '')
+    total = len(records) if isinstance(records, Sized) else 0
+
+    def write_shard(index: int, shard: List[Dict[str, Any]]) -> Dict[str, Any]:
+        filename = f'{base_name}.part{index:04d}.{extension}'
+        # Recorded before writing so a cancelled or failed export can remove every part
+        part_paths.append(os.path.join(exports_dir, filename))
+        path = writer(shard, filename=filename, exports_dir=exports_dir, cancel_event=cancel_event,
+                      **writer_options)
+        return {'file': os.path.basename(path), 'records': len(shard),
+                'bytes': os.path.getsize(path), 'sha256': _file_checksum(path)}
+
+    entries: List[Dict[str, Any]] = []
+    part_paths: List[str] = []
+    written = 0
+    workers = max_workers or min(4, os.cpu_count() or 1)
+
+    def shard_done(entry: Dict[str, Any]):
+        nonlocal written
+        entries.append(entry)
+        written += entry['records']
+        if progress_callback:
+            progress_callback(written, total)
+
+    try:
+        shards = enumerate(_iter_shards(records, max_records, max_bytes))
+        if parallel:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                pending = []
+                try:
+                    for index, shard in shards:
+                        _check_cancelled(cancel_event)
+                        pending.append(executor.submit(write_shard, index, shard))
+                        # Bound the number of shards held in memory
+                        while len(pending) >= workers * 2:
+                            shard_done(pending.pop(0).result())
+                    while pending:
+                        shard_done(pending.pop(0).result())
+                except BaseException:
+                    # Drop queued shards; leaving the block waits for the running ones
+                    for future in pending:
+                        future.cancel()
+                    raise
+        else:
+            for index, shard in shards:
+                _check_cancelled(cancel_event)
+                shard_done(write_shard(index, shard))
+
+        manifest = {
+            'format': fmt,
+            'created': datetime.utcnow().strftime('%Y-%m-%dT%H:%M:%SZ'),
+            'total_records': written,
+            'max_records': max_records,
+            'max_bytes': max_bytes,
+            'shards': entries,
+        }
+        with open(manifest_path, 'w', encoding='utf-8') as fh:
+            json.dump(manifest, fh, indent=2)
+        if progress_callback:
+            progress_callback(written, total or written)
+        logger.info('Sharded %s export written: %s (%d records in %d parts)',
+                    fmt.upper(), manifest_path, written, len(entries))
+        return manifest_path
+
+    except ExportCancelled:
+        for path in part_paths:
+            _remove_partial(path)
+        logger.info('Sharded %s export cancelled: %s', fmt.upper(), manifest_path)
+        raise
+    except Exception:
+        logger.exception('Error writing sharded %s export', fmt.upper())
+        for path in part_paths:
+            _remove_partial(path)
+        raise
@@ -1,4 +1,3 @@
-// Mover a src/generate_large_svg_report.py
 #!/usr/bin/env python3
 """
 Genera reporte con gráficos SVG ampliados para mejor visibilidad
@@ -6,20 +5,20 @@ Genera reporte con gráficos SVG ampliados para mejor visibilidad
 
 import os
 import sys
-import json
 import webbrowser
 
 # Agregar el directorio padre al path
 current_dir = os.path.dirname(os.path.abspath(__file__))
 sys.path.insert(0, current_dir)
 
-from intelx.interactive_report import InteractiveReportGenerator
+from interactive_report import InteractiveReportGenerator
+from exports import load_records
 
 def main():
     print("=== Generador de Reporte SVG AMPLIADO ===")
     
-    # Leer datos reales del archivo JSON existente
-    json_file = "reports/json/_at_supbienestar.gob.ar_20250910_213159.json"
+    # Leer datos reales de un export existente (JSON o NDJSON, opcionalmente .gz)
+    json_file = sys.argv[1] if len(sys.argv) > 1 else "reports/json/_at_supbienestar.gob.ar_20250910_213159.json"
     
     if not os.path.exists(json_file):
         print(f"❌ No se encontró el archivo: {json_file}")
@@ -29,16 +28,9 @@ def main():
     print(f"📂 Cargando datos desde: {json_file}")
     
     try:
-        with open(json_file, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-        
-        # El archivo puede ser una lista directa o un diccionario
-        if isinstance(data, list):
-            records = data
-            search_term = "@supbienestar.gob.ar"  # Usar un término por defecto
-        else:
-            records = data.get('records', [])
-            search_term = data.get('search_term', '@supbienestar.gob.ar')
+        # NDJSON se lee en streaming; JSON puede ser una lista o un dict con 'records'
+        records = list(load_records(json_file))
+        search_term = sys.argv[2] if len(sys.argv) > 2 else "@supbienestar.gob.ar"  # Usar un término por defecto
         
         print(f"📊 Registros cargados: {len(records)}")
         print(f"🔍 Término de búsqueda: {search_term}")
@@ -45,8 +45,12 @@ from api import check_intelx, retrieve_intelx_results, get_api_credits, MEDIA_TY
 from analysis import analyze_results_for_report, extract_iocs, clean_data_for_mandiant_report, prepare_mandiant_chart_data
 from reporting import generate_modern_html_content, generate_executive_summary_html, generate_iocs_html, generate_data_table_html
 from utils import sanitize_filename, open_in_browser
-import exports as exports_module
 import ui_components
+from record_store import extract_ip_address
+from search_session import SearchSession, SearchScheduler
+from warehouse import ResultWarehouse
+from ui_bus import UIUpdateBus
+from export_jobs import ExportJobManager, JOB_DONE, JOB_CANCELLED
 
 logging.basicConfig(
     level=logging.DEBUG,
@@ -93,8 +97,14 @@ class IntelXCheckerApp(ctk.CTk):
                 "Archivo": "Archivo",
                 "Exportar a CSV": "Exportar a CSV...",
                 "Exportar a JSON": "Exportar a JSON...",
+                "Exportar a NDJSON": "Exportar a NDJSON (gzip)...",
+                "Exportar a Parquet": "Exportar a Parquet...",
+                "Anexar a Exportación": "Anexar a exportación existente...",
+                "Exportar Paquete": "Exportar paquete (CSV, JSON, HTML)...",
                 # "Exportar a PDF": "Exportar a PDF...",
                 "Exportar a HTML": "Exportar a HTML...",
+                "Cancelar Exportaciones": "Cancelar Exportaciones",
+                "Cerrar Pestaña": "Cerrar Pestaña",
                 "Vista Previa": "Vista Previa",
                 "Seleccionar Todo": "Seleccionar Todo",
                 "Deseleccionar": "Deseleccionar",
@@ -121,8 +131,14 @@ class IntelXCheckerApp(ctk.CTk):
                 "Archivo": "File",
                 "Exportar a CSV": "Export to CSV...",
                 "Exportar a JSON": "Export to JSON...",
+                "Exportar a NDJSON": "Export to NDJSON (gzip)...",
+                "Exportar a Parquet": "Export to Parquet...",
+                "Anexar a Exportación": "Append to existing export...",
+                "Exportar Paquete": "Export bundle (CSV, JSON, HTML)...",
                 # "Exportar a PDF": "Export to PDF...",
                 "Exportar a HTML": "Export to HTML...",
+                "Cancelar Exportaciones": "Cancel Exports",
+                "Cerrar Pestaña": "Close Tab",
                 "Vista Previa": "Preview",
                 "Seleccionar Todo": "Select All",
                 "Deseleccionar": "Deselect",
@@ -142,14 +158,21 @@ class IntelXCheckerApp(ctk.CTk):
         }
         
         # Inicializar variables
-        self.current_records = []
         self.credits = 0
-        self.search_thread = None
-        self.stop_search = False
-        self.cancel_event = None
+        # Sesiones de búsqueda por pestaña (nombre de pestaña -> SearchSession)
+        self.sessions = {}
+        self.active_session = None
+        self.search_scheduler = SearchScheduler()
+        # Histórico local de resultados (SQLite); la app funciona sin él si falla
+        try:
+            self.warehouse = ResultWarehouse()
+        except Exception:
+            logger.exception("No se pudo abrir el almacén local de resultados")
+            self.warehouse = None
         self.config_file = os.path.join(os.path.dirname(__file__), '..', '.env')
         
         # Crear UI
+        self._setup_ui_bus()
         self._setup_ui()
         self._setup_menus()
         self._update_language()
@@ -233,17 +256,53 @@ class IntelXCheckerApp(ctk.CTk):
         self.credits_label = ctk.CTkLabel(filter_frame, text="Créditos: 0", font=self.fonts["secondary"])
         self.credits_label.pack(side="right", padx=(5, 10))
         
-        # Frame de resultados
-        results_frame = ctk.CTkFrame(main_frame)
-        results_frame.pack(fill="both", expand=True, padx=10, pady=5)
+        # Pestañas de resultados: una por búsqueda
+        self.results_tabs = ctk.CTkTabview(main_frame, command=self._on_tab_changed)
+        self.results_tabs.pack(fill="both", expand=True, padx=10, pady=5)
+        self._create_session_tab()
+        
+        # Status bar con barra de progreso
+        status_frame = ctk.CTkFrame(main_frame)
+        status_frame.pack(fill="x", padx=10, pady=(5, 10))
+        
+        self.status_label = ctk.CTkLabel(status_frame, text="Listo.", font=self.fonts["tertiary"])
+        self.status_label.pack(side="left", padx=(10, 5))
+        
+        # Frame para barra de progreso y texto
+        progress_container = ctk.CTkFrame(status_frame)
+        progress_container.pack(side="right", padx=(5, 10))
+        
+        # Etiqueta de progreso
+        self.progress_label = ctk.CTkLabel(progress_container, text="", font=self.fonts["tertiary"])
+        self.progress_label.pack(pady=(2, 0))
         
+        # Barra de progreso mejorada
+        self.progress_bar = ctk.CTkProgressBar(progress_container, width=200, height=8)
+        self.progress_bar.pack(pady=(0, 2))
+        if hasattr(self, "progress_bar"):
+            self.progress_bar.set(0)
+    
+    def _setup_ui_bus(self):
+        """Canal de actualizaciones de UI para los hilos de trabajo"""
+        self.ui_bus = UIUpdateBus(self)
+        for field in ("status", "progress", "progress_text"):
+            self.ui_bus.register(field, lambda value, f=field: self._apply_state_widget(f, value))
+        self.ui_bus.start()
+        # Exportaciones en segundo plano (notifican a través del bus)
+        self.export_jobs = ExportJobManager(
+            on_progress=self._on_export_progress,
+            on_finished=self._on_export_finished
+        )
+    
+    def _create_results_tree(self, parent):
+        """Crear un Treeview de resultados con sus scrollbars dentro de ``parent``"""
         # Treeview para resultados con columnas reordenadas por prioridad
         columns = ("date", "name", "ip", "type", "media", "bucket", "size", "score", "systemid")
-        self.results_tree = ttk.Treeview(results_frame, columns=columns, show="tree headings", height=15)
+        tree = ttk.Treeview(parent, columns=columns, show="tree headings", height=15)
         
         # Configurar columnas
-        self.results_tree.heading("#0", text="", anchor="w")
-        self.results_tree.column("#0", width=0, minwidth=0)
+        tree.heading("#0", text="", anchor="w")
+        tree.column("#0", width=0, minwidth=0)
         
         # Configurar columnas con anchos específicos (fecha como prioridad)
         column_widths = {
@@ -259,49 +318,138 @@ class IntelXCheckerApp(ctk.CTk):
         }
         
         for col in columns:
-            self.results_tree.heading(col, text=col.capitalize(), anchor="w")
+            tree.heading(col, text=col.capitalize(), anchor="w")
             width = column_widths.get(col, 120)
-            self.results_tree.column(col, width=width, minwidth=60)
+            tree.column(col, width=width, minwidth=60)
             # Agregar binding para ordenar al hacer clic en el header
-            self.results_tree.heading(col, command=lambda c=col: self._sort_treeview_by_column(c, False))
+            tree.heading(col, command=lambda c=col: self._sort_treeview_by_column(c))
         
         # Scrollbars para treeview
-        v_scrollbar = ttk.Scrollbar(results_frame, orient="vertical", command=self.results_tree.yview)
-        h_scrollbar = ttk.Scrollbar(results_frame, orient="horizontal", command=self.results_tree.xview)
-        self.results_tree.configure(yscrollcommand=v_scrollbar.set, xscrollcommand=h_scrollbar.set)
+        v_scrollbar = ttk.Scrollbar(parent, orient="vertical", command=tree.yview)
+        h_scrollbar = ttk.Scrollbar(parent, orient="horizontal", command=tree.xview)
+        tree.configure(yscrollcommand=v_scrollbar.set, xscrollcommand=h_scrollbar.set)
         
         # Grid para treeview y scrollbars
-        self.results_tree.grid(row=0, column=0, sticky="nsew")
+        tree.grid(row=0, column=0, sticky="nsew")
         v_scrollbar.grid(row=0, column=1, sticky="ns")
         h_scrollbar.grid(row=1, column=0, sticky="ew")
         
-        results_frame.grid_rowconfigure(0, weight=1)
-        results_frame.grid_columnconfigure(0, weight=1)
+        parent.grid_rowconfigure(0, weight=1)
+        parent.grid_columnconfigure(0, weight=1)
         
         # Bind eventos del treeview
-        self.results_tree.bind("<Double-1>", self.on_item_double_click)
-        self.results_tree.bind("<Button-3>", self.show_context_menu)
-        
-        # Status bar con barra de progreso
-        status_frame = ctk.CTkFrame(main_frame)
-        status_frame.pack(fill="x", padx=10, pady=(5, 10))
+        tree.bind("<Double-1>", self.on_item_double_click)
+        tree.bind("<Button-3>", self.show_context_menu)
+        # Shift+clic en un encabezado agrega la columna como criterio secundario
+        tree.bind("<Shift-Button-1>", self._on_heading_shift_click)
+        return tree
+    
+    # --- Sesiones de búsqueda (una por pestaña) ---
+    @property
+    def results_tree(self):
+        """Treeview de la pestaña activa"""
+        return self.active_session.tree
+    
+    @property
+    def record_registry(self):
+        """Registro indexado de la pestaña activa"""
+        return self.active_session.registry
+    
+    @property
+    def current_records(self):
+        """Resultados de la pestaña activa"""
+        return self.active_session.records
+    
+    @property
+    def _sort_spec(self):
+        return self.active_session.sort_spec
+    
+    @_sort_spec.setter
+    def _sort_spec(self, spec):
+        self.active_session.sort_spec = spec
+    
+    def _create_session_tab(self, term=""):
+        """Crear una pestaña con su propia sesión de búsqueda y activarla"""
+        session = SearchSession(term)
+        base_name = (term[:25] + "…") if len(term) > 25 else (term or "Resultados")
+        tab_name = base_name
+        suffix = 2
+        while tab_name in self.sessions:
+            tab_name = f"{base_name} ({suffix})"
+            suffix += 1
         
-        self.status_label = ctk.CTkLabel(status_frame, text="Listo.", font=self.fonts["tertiary"])
-        self.status_label.pack(side="left", padx=(10, 5))
+        tab = self.results_tabs.add(tab_name)
+        session.tab_name = tab_name
+        session.tree = self._create_results_tree(tab)
+        self.sessions[tab_name] = session
         
-        # Frame para barra de progreso y texto
-        progress_container = ctk.CTkFrame(status_frame)
-        progress_container.pack(side="right", padx=(5, 10))
+        # Claves del bus propias de la sesión: (id de sesión, widget)
+        for field in ("status", "progress", "progress_text"):
+            self.ui_bus.register(
+                (session.id, field),
+                lambda value, s=session, f=field: self._apply_session_state(s, f, value)
+            )
         
-        # Etiqueta de progreso
-        self.progress_label = ctk.CTkLabel(progress_container, text="", font=self.fonts["tertiary"])
-        self.progress_label.pack(pady=(2, 0))
+        self.results_tabs.set(tab_name)
+        self._on_tab_changed()
+        return session
+    
+    def close_active_session(self):
+        """Cerrar la pestaña activa cancelando su búsqueda"""
+        session = self.active_session
+        if session is None:
+            return
+        self._remove_session(session)
+        self.active_session = None
+        if not self.sessions:
+            self._create_session_tab()
+        else:
+            self._on_tab_changed()
+    
+    def _remove_session(self, session):
+        """Cancelar una sesión y eliminar su pestaña y sus claves del bus"""
+        session.cancel()
+        for field in ("status", "progress", "progress_text"):
+            self.ui_bus.unregister((session.id, field))
+        del self.sessions[session.tab_name]
+        self.results_tabs.delete(session.tab_name)
+    
+    def _on_tab_changed(self):
+        """Restaurar filtro, estado y botones de la sesión de la pestaña activa"""
+        session = self.sessions.get(self.results_tabs.get())
+        if session is None:
+            return
+        self.active_session = session
         
-        # Barra de progreso mejorada
-        self.progress_bar = ctk.CTkProgressBar(progress_container, width=200, height=8)
-        self.progress_bar.pack(pady=(0, 2))
-        if hasattr(self, "progress_bar"):
-            self.progress_bar.set(0)
+        if hasattr(self, "filter_entry"):
+            self.filter_entry.delete(0, "end")
+            if session.filter_text:
+                self.filter_entry.insert(0, session.filter_text)
+        if hasattr(self, "cancel_button"):
+            self.cancel_button.configure(state="normal" if session.running else "disabled")
+        if hasattr(self, "status_label"):
+            lang = self.languages.get(self.current_language, self.languages["es"])
+            self._apply_state_widget("status", session.ui_state.get("status", lang["Listo"]))
+            self._apply_state_widget("progress", session.ui_state.get("progress", 0))
+            self._apply_state_widget("progress_text", session.ui_state.get("progress_text", ""))
+    
+    def _post_session(self, session, field, value):
+        """Publicar el estado de un widget para una sesión (desde cualquier hilo)"""
+        self.ui_bus.post((session.id, field), value)
+    
+    def _apply_session_state(self, session, field, value):
+        """Guardar el estado de la sesión y reflejarlo si su pestaña está activa"""
+        session.ui_state[field] = value
+        if session is self.active_session:
+            self._apply_state_widget(field, value)
+    
+    def _apply_state_widget(self, field, value):
+        if field == "status":
+            self.status_label.configure(text=value)
+        elif field == "progress":
+            self.progress_bar.set(value)
+        elif field == "progress_text":
+            self.progress_label.configure(text=value)
     
     def _setup_menus(self):
         """Configurar menús"""
@@ -313,8 +461,15 @@ class IntelXCheckerApp(ctk.CTk):
         menubar.add_cascade(label="Archivo", menu=file_menu)
         file_menu.add_command(label="Exportar a CSV...", command=self.export_to_csv_safe)
         file_menu.add_command(label="Exportar a JSON...", command=self.export_to_json_safe)
+        file_menu.add_command(label="Exportar a NDJSON (gzip)...", command=self.export_to_ndjson_safe)
+        file_menu.add_command(label="Exportar a Parquet...", command=self.export_to_parquet_safe)
+        file_menu.add_command(label="Anexar a exportación existente...", command=self.append_to_export_safe)
+        file_menu.add_command(label="Exportar paquete (CSV, JSON, HTML)...", command=self.export_bundle_safe)
     # file_menu.add_command(label="Exportar a PDF...", command=self.export_to_pdf_safe)
         file_menu.add_command(label="Exportar a HTML...", command=self.export_to_html_safe)
+        file_menu.add_command(label="Cancelar Exportaciones", command=self.cancel_exports)
+        file_menu.add_separator()
+        file_menu.add_command(label="Cerrar Pestaña", command=self.close_active_session)
         file_menu.add_separator()
         file_menu.add_command(label="Salir", command=self.quit)
         
@@ -346,31 +501,59 @@ class IntelXCheckerApp(ctk.CTk):
         self.context_menu.add_separator()
         self.context_menu.add_command(label="Copiar", command=self.copy_selected)
         self.context_menu.add_command(label="Exportar Selección", command=self.export_selection)
+        self.context_menu.add_separator()
+        self.context_menu.add_command(label="Cerrar Pestaña", command=self.close_active_session)
 
-    def _sort_treeview_by_column(self, col, reverse):
-        """Ordena el Treeview por la columna seleccionada."""
-        # Obtener todos los items y sus valores
-        items = [(self.results_tree.set(k, col), k) for k in self.results_tree.get_children("")]
-        # Función de ordenamiento segura
-        def sort_key(item):
-            val = str(item[0])  # Convertir a string siempre
-            # Intentar convertir a número si es posible
-            if val.replace('.', '', 1).replace('-', '', 1).isdigit():
-                try:
-                    return float(val)
-                except ValueError:
-                    return val.lower()
-            return val.lower()
-        
-        # Ordenar items
-        items.sort(key=sort_key, reverse=reverse)
-        
-        # Reordenar los items en el treeview
-        for index, (val, k) in enumerate(items):
-            self.results_tree.move(k, '', index)
-        
-        # Alternar el orden para el próximo clic
-        self.results_tree.heading(col, command=lambda c=col: self._sort_treeview_by_column(c, not reverse))
+    def _sort_treeview_by_column(self, col, reverse=None, append=False):
+        """Ordena el Treeview por la columna seleccionada.
+
+        Usa claves tipadas de los registros (tamaño en bytes, xscore numérico)
+        cacheadas en el registro indexado. Con ``append`` la columna se agrega
+        como criterio secundario (orden estable multi-columna).
+        """
+        spec = list(self._sort_spec)
+        position = next((i for i, (c, _) in enumerate(spec) if c == col), None)
+        if reverse is None:
+            # Alternar dirección si la columna ya estaba activa
+            reverse = not spec[position][1] if position is not None else False
+
+        if append:
+            if position is not None:
+                spec[position] = (col, reverse)
+            else:
+                spec.append((col, reverse))
+        else:
+            spec = [(col, reverse)]
+
+        self._sort_spec = spec
+        self._apply_sort()
+
+    def _on_heading_shift_click(self, event):
+        """Shift+clic en encabezado: ordenar por varias columnas"""
+        tree = event.widget
+        if tree.identify_region(event.x, event.y) != "heading":
+            return None
+        column_ref = tree.identify_column(event.x)
+        try:
+            col = tree["columns"][int(column_ref.lstrip("#")) - 1]
+        except (ValueError, IndexError):
+            return None
+        self._sort_treeview_by_column(col, append=True)
+        return "break"
+
+    def _apply_sort(self, session=None):
+        """Reordena las filas visibles según el criterio activo en una sola operación"""
+        session = session or self.active_session
+        if not session.sort_spec:
+            return
+        order = session.registry.sorted_iids(session.sort_spec)
+        children = session.tree.get_children("")
+        if len(children) != len(order):
+            # Hay un filtro activo: conservar sólo las filas visibles
+            visible = set(children)
+            order = [iid for iid in order if iid in visible]
+        session.tree.set_children("", *order)
+        self._update_treeview_headers(session)
 
     def _set_language(self, lang):
         """Cambiar idioma"""
@@ -402,11 +585,13 @@ class IntelXCheckerApp(ctk.CTk):
         if hasattr(self, "status_label"):
             self.status_label.configure(text=lang["Listo"])
         
-        # Actualizar headers del treeview
-        self._update_treeview_headers()
+        # Actualizar headers de los treeviews de todas las pestañas
+        for session in self.sessions.values():
+            self._update_treeview_headers(session)
     
-    def _update_treeview_headers(self):
+    def _update_treeview_headers(self, session=None):
         """Actualizar headers del treeview según idioma"""
+        session = session or self.active_session
         lang = self.languages.get(self.current_language, self.languages["es"])
         
         headers = {
@@ -421,8 +606,16 @@ class IntelXCheckerApp(ctk.CTk):
             "systemid": "ID Sistema" if self.current_language == "es" else "System ID"
         }
         
+        # Indicadores de orden (▲/▼) y prioridad en ordenamientos multi-columna
+        sort_spec = session.sort_spec
+        for priority, (col, reverse) in enumerate(sort_spec, start=1):
+            if col in headers:
+                arrow = "▼" if reverse else "▲"
+                suffix = f" {arrow}{priority}" if len(sort_spec) > 1 else f" {arrow}"
+                headers[col] += suffix
+
         for col, header in headers.items():
-            self.results_tree.heading(col, text=header)
+            session.tree.heading(col, text=header)
     
     def _load_api_config(self):
         """Cargar configuración de API"""
@@ -430,7 +623,8 @@ class IntelXCheckerApp(ctk.CTk):
             load_dotenv(self.config_file)
             self.api_key = os.getenv('INTELX_API_KEY', '')
             if self.api_key:
-                self.refresh_credits()
+                # Cuando la ventana ya tiene su bus de actualizaciones
+                self.after(0, self.refresh_credits)
         except:
             self.api_key = ''
     
@@ -449,214 +643,172 @@ class IntelXCheckerApp(ctk.CTk):
         # Actualizar créditos antes de iniciar la búsqueda
         self.refresh_credits()
         
-        # Limpiar resultados anteriores
-        for item in self.results_tree.get_children():
-            self.results_tree.delete(item)
-        
-        self.current_records = []
-        self.stop_search = False
+        # Cada búsqueda abre su propia pestaña; se reutiliza la pestaña inicial vacía
+        placeholder = self.active_session
+        session = self._create_session_tab(term)
+        if placeholder and not placeholder.term and not len(placeholder.registry):
+            self._remove_session(placeholder)
         
         # Actualizar UI
-        self.search_button.configure(state="disabled")
         self.cancel_button.configure(state="normal")
-        if hasattr(self, "status_label"):
-            self.status_label.configure(text="Iniciando búsqueda...")
-        if hasattr(self, "progress_bar"):
-            self.progress_bar.set(0.1)
-        if hasattr(self, "progress_label"):
-            self.progress_label.configure(text="Preparando...")
+        self._post_session(session, "status", "Iniciando búsqueda...")
+        self._post_session(session, "progress", 0.1)
+        self._post_session(session, "progress_text", "En cola...")
         
-        # Iniciar búsqueda en hilo separado
-        self.search_thread = threading.Thread(target=self._search_worker, args=(term,))
-        self.search_thread.daemon = True
-        self.search_thread.start()
+        # Ejecutar en el pool compartido (respeta el límite de peticiones)
+        self.search_scheduler.submit(
+            session,
+            self._search_worker,
+            on_done=lambda s: self.ui_bus.call(self._search_finished, s)
+        )
     
-    def _search_worker(self, term):
-        """Worker para búsqueda en hilo separado"""
+    def _search_worker(self, session):
+        """Worker de una sesión de búsqueda (se ejecuta en el pool compartido).
+
+        El estado de la UI se publica en el bus de actualizaciones; el hilo
+        principal aplica sólo el último valor de cada widget por cuadro.
+        """
+        bus = self.ui_bus
+        post = lambda field, value: self._post_session(session, field, value)
         try:
             # Progreso inicial
-            if hasattr(self, "progress_bar"):
-                self.after(0, lambda: self.progress_bar.set(0.3))
-            if hasattr(self, "progress_label"):
-                self.after(0, lambda: self.progress_label.configure(text="Conectando..."))
-            if hasattr(self, "status_label"):
-                self.after(0, lambda: self.status_label.configure(text="Conectando con IntelX..."))
+            post("progress", 0.3)
+            post("progress_text", "Conectando...")
+            post("status", "Conectando con IntelX...")
             
             # Usar módulo API - la función check_intelx ahora retorna (success, data, search_id)
-            success, data_or_error, search_id = check_intelx(term, self.api_key)
+            success, data_or_error, search_id = check_intelx(
+                session.term, self.api_key, cancel_event=session.cancel_event,
+                rate_limiter=self.search_scheduler.rate_limiter
+            )
             
             # Progreso medio
-            if hasattr(self, "progress_bar"):
-                self.after(0, lambda: self.progress_bar.set(0.7))
-            if hasattr(self, "progress_label"):
-                self.after(0, lambda: self.progress_label.configure(text="Procesando..."))
+            post("progress", 0.7)
+            post("progress_text", "Procesando...")
             
             if success:
-                if hasattr(self, "status_label"):
-                    self.after(0, lambda: self.status_label.configure(text="Procesando resultados..."))
+                post("status", "Procesando resultados...")
                 
                 # Si data es un dict con 'records', usar esos registros
                 if isinstance(data_or_error, dict) and 'records' in data_or_error:
-                    self.current_records = data_or_error['records']
+                    session.records = data_or_error['records']
                 elif isinstance(data_or_error, list):
-                    self.current_records = data_or_error
+                    session.records = data_or_error
                 elif isinstance(data_or_error, dict):
                     # Asumir que es el resultado directo
-                    self.current_records = [data_or_error]
+                    session.records = [data_or_error]
                 else:
-                    self.current_records = []
+                    session.records = []
                 
                 # Progreso final
-                if hasattr(self, "progress_bar"):
-                    self.after(0, lambda: self.progress_bar.set(1.0))
-                if hasattr(self, "progress_label"):
-                    self.after(0, lambda: self.progress_label.configure(text="Completado"))
+                post("progress", 1.0)
+                post("progress_text", "Completado")
                 
-                if self.current_records and not self.stop_search:
-                    self.after(0, self._populate_results)
-                    if hasattr(self, "status_label"):
-                        self.after(0, lambda: self.status_label.configure(text=f"Encontrados {len(self.current_records)} resultados"))
+                if session.records and not session.cancel_event.is_set():
+                    bus.call(self._populate_results, session)
+                    new_count = self._store_session_results(session)
+                    if new_count is None:
+                        post("status", f"Encontrados {len(session.records)} resultados")
+                    else:
+                        post("status", f"Encontrados {len(session.records)} resultados ({new_count} nuevos)")
                 else:
-                    if hasattr(self, "status_label"):
-                        self.after(0, lambda: self.status_label.configure(text="No se encontraron resultados"))
+                    post("status", "No se encontraron resultados")
             else:
                 # Error en la búsqueda
                 error_msg = data_or_error if isinstance(data_or_error, str) else "Error en la búsqueda"
-                if hasattr(self, "status_label"):
-                    self.after(0, lambda: self.status_label.configure(text=error_msg))
-                if hasattr(self, "progress_bar"):
-                    self.after(0, lambda: self.progress_bar.set(0))
-                if hasattr(self, "progress_label"):
-                    self.after(0, lambda: self.progress_label.configure(text="Error"))
+                post("status", error_msg)
+                post("progress", 0)
+                post("progress_text", "Error")
                 
         except Exception as e:
             logger.exception("Error en búsqueda")
-            if hasattr(self, "status_label"):
-                self.after(0, lambda: self.status_label.configure(text=f"Error: {str(e)}"))
-            if hasattr(self, "progress_bar"):
-                self.after(0, lambda: self.progress_bar.set(0))
-            if hasattr(self, "progress_label"):
-                self.after(0, lambda: self.progress_label.configure(text="Error"))
-        finally:
-            self.after(0, self._search_finished)
+            post("status", f"Error: {str(e)}")
+            post("progress", 0)
+            post("progress_text", "Error")
     
-    def _populate_results(self):
+    def _store_session_results(self, session):
+        """Guardar los resultados en el almacén local; devuelve cuántos no se habían visto"""
+        if self.warehouse is None:
+            return None
+        try:
+            _, _, new_count = self.warehouse.ingest(session.term, session.records)
+            return new_count
+        except Exception:
+            logger.exception("Error guardando resultados en el almacén local")
+            return None
+    
+    def _populate_results(self, session=None):
         """Poblar treeview con resultados usando la estructura real de la API de IntelX"""
-        # Si no estamos en el hilo principal, reprogramar con self.after
+        session = session or self.active_session
+        # Si no estamos en el hilo principal, reprogramar en el bus de UI
         if threading.current_thread() != threading.main_thread():
-            self.after(0, self._populate_results)
+            self.ui_bus.call(self._populate_results, session)
+            return
+        if session.tab_name not in self.sessions:
+            # La pestaña se cerró mientras la búsqueda estaba en curso
             return
 
-        for i, record in enumerate(self.current_records):
-            if self.stop_search:
+        # Ingerir registros en el registro indexado (systemid, storageid, iid)
+        session.registry.clear()
+        for i, record in enumerate(session.records):
+            if session.cancel_event.is_set():
                 break
+            iid, record_dict = session.registry.add(record)
+            session.tree.insert("", "end", iid=iid, values=self._record_row_values(record_dict, i))
+        self._apply_sort(session)
 
-            # Manejar diferentes tipos de datos de entrada
-            if isinstance(record, str):
-                # Si es string, crear un registro básico
-                record_dict = {
-                    'name': f'Resultado {i+1}',
-                    'type': 1,  # Texto
-                    'media': 1,  # Paste
-                    'bucket': 'unknown',
-                    'size': len(record),
-                    'date': '',
-                    'xscore': 0,
-                    'systemid': f'record_{i}',
-                    'data': record
-                }
-            elif isinstance(record, dict):
-                record_dict = record
-            else:
-                # Fallback para otros tipos
-                record_dict = {
-                    'name': f'Resultado {i+1}',
-                    'type': 0,
-                    'media': 0,
-                    'bucket': 'unknown',
-                    'size': 0,
-                    'date': '',
-                    'xscore': 0,
-                    'systemid': f'record_{i}',
-                    'data': str(record)
-                }
+    def _record_row_values(self, record_dict, i):
+        """Valores de la fila del Treeview para un registro normalizado"""
+        # Fecha formateada (primera prioridad)
+        date_str = record_dict.get('date', '')
+        if date_str:
+            try:
+                # Formatear fecha si está disponible
+                date_text = date_str[:19] if len(date_str) > 19 else date_str
+            except:
+                date_text = date_str
+        else:
+            date_text = 'N/A'
 
-            # Fecha formateada (primera prioridad)
-            date_str = record_dict.get('date', '')
-            if date_str:
-                try:
-                    # Formatear fecha si está disponible
-                    date_text = date_str[:19] if len(date_str) > 19 else date_str
-                except:
-                    date_text = date_str
-            else:
-                date_text = 'N/A'
+        # Formatear datos basándose en la estructura del diccionario
+        name = record_dict.get('name', f'Documento {i+1}')
+        name = name[:60] + "..." if len(name) > 60 else name
 
-            # Formatear datos basándose en la estructura del diccionario
-            name = record_dict.get('name', f'Documento {i+1}')
-            name = name[:60] + "..." if len(name) > 60 else name
+        # Extraer IP del nombre o datos
+        ip_address = self._extract_ip_address(record_dict)
 
-            # Extraer IP del nombre o datos
-            ip_address = self._extract_ip_address(record_dict)
+        # Tipo de contenido (type)
+        type_val = record_dict.get('type', 0)
+        type_text = self._get_type_description(type_val)
 
-            # Tipo de contenido (type)
-            type_val = record_dict.get('type', 0)
-            type_text = self._get_type_description(type_val)
+        # Media type (más descriptivo)
+        media_val = record_dict.get('media', 0)
+        media_text = self._get_media_description(media_val)
 
-            # Media type (más descriptivo)
-            media_val = record_dict.get('media', 0)
-            media_text = self._get_media_description(media_val)
+        # Bucket con nombre legible
+        bucket = record_dict.get('bucket', 'unknown')
+        bucket_text = record_dict.get('bucketh', bucket)  # bucketh es el nombre legible
 
-            # Bucket con nombre legible
-            bucket = record_dict.get('bucket', 'unknown')
-            bucket_text = record_dict.get('bucketh', bucket)  # bucketh es el nombre legible
+        # Tamaño formateado
+        size = record_dict.get('size', 0)
+        size_text = self._format_file_size(size)
 
-            # Tamaño formateado
-            size = record_dict.get('size', 0)
-            size_text = self._format_file_size(size)
+        # Puntuación de relevancia (xscore)
+        score = record_dict.get('xscore', 0)
+        score_text = str(score) if score > 0 else 'N/A'
 
-            # Puntuación de relevancia (xscore)
-            score = record_dict.get('xscore', 0)
-            score_text = str(score) if score > 0 else 'N/A'
+        # System ID
+        system_id = record_dict.get('systemid', record_dict.get('storageid', str(i)))
 
-            # System ID
-            system_id = record_dict.get('systemid', record_dict.get('storageid', str(i)))
+        # Nuevo orden: fecha, nombre, IP, tipo, media, bucket, tamaño, score, systemid
+        return (
+            date_text, name, ip_address, type_text, media_text,
+            bucket_text, size_text, score_text, system_id
+        )
 
-            # Nuevo orden: fecha, nombre, IP, tipo, media, bucket, tamaño, score, systemid
-            self.results_tree.insert("", "end", values=(
-                date_text, name, ip_address, type_text, media_text, 
-                bucket_text, size_text, score_text, system_id
-            ))
-    
     def _extract_ip_address(self, record_dict):
         """Extraer dirección IP del registro"""
-        import re
-        
-        # Patrón para IPv4
-        ipv4_pattern = r'\b(?:[0-9]{1,3}\.){3}[0-9]{1,3}\b'
-        # Patrón para IPv6 simplificado
-        ipv6_pattern = r'\b(?:[0-9a-fA-F]{1,4}:){7}[0-9a-fA-F]{1,4}\b'
-        
-        # Buscar en diferentes campos
-        search_fields = [
-            record_dict.get('name', ''),
-            record_dict.get('data', ''),
-            str(record_dict)
-        ]
-        
-        for field in search_fields:
-            if field:
-                # Buscar IPv4
-                ipv4_match = re.search(ipv4_pattern, field)
-                if ipv4_match:
-                    return ipv4_match.group()
-                
-                # Buscar IPv6
-                ipv6_match = re.search(ipv6_pattern, field)
-                if ipv6_match:
-                    return ipv6_match.group()
-        
-        return 'N/A'
+        return extract_ip_address(record_dict)
 
     def _get_type_description(self, type_val):
         """
@@ -726,28 +878,8 @@ class IntelXCheckerApp(ctk.CTk):
             return "Tipo de Media Error"
     
     def _find_record_by_id(self, record_id):
-        """Buscar registro por ID de manera robusta"""
-        for i, record in enumerate(self.current_records):
-            if isinstance(record, dict):
-                # Buscar por systemid, storageid o índice
-                if (record.get('systemid') == record_id or 
-                    record.get('storageid') == record_id):
-                    return record
-            elif isinstance(record, str):
-                # Para strings, usar el índice
-                if f'record_{i}' == record_id:
-                    return {
-                        'name': f'Resultado {i+1}',
-                        'type': 1,
-                        'media': 1,
-                        'bucket': 'unknown',
-                        'size': len(record),
-                        'date': '',
-                        'xscore': 0,
-                        'systemid': f'record_{i}',
-                        'data': record
-                    }
-        return None
+        """Buscar registro por systemid, storageid o iid en O(1)"""
+        return self.record_registry.get(record_id)
 
     def _format_file_size(self, size):
         """Formatear tamaño de archivo en formato legible"""
@@ -764,69 +896,35 @@ class IntelXCheckerApp(ctk.CTk):
         except (ValueError, TypeError):
             return str(size)
 
-    def _search_finished(self):
-        """Finalizar búsqueda"""
-        self.search_button.configure(state="normal")
-        self.cancel_button.configure(state="disabled")
-        self.stop_search = False
+    def _search_finished(self, session):
+        """Finalizar búsqueda de una sesión"""
+        if session is self.active_session:
+            self.cancel_button.configure(state="disabled")
         # Resetear barra de progreso después de un momento
-        if hasattr(self, "progress_bar"):
-            self.after(2000, lambda: self.progress_bar.set(0))
-        if hasattr(self, "progress_label"):
-            self.after(2000, lambda: self.progress_label.configure(text=""))
+        self.after(2000, lambda: self._apply_session_state(session, "progress", 0))
+        self.after(2000, lambda: self._apply_session_state(session, "progress_text", ""))
         # Actualizar créditos después de la búsqueda
         self.after(1000, self.refresh_credits)
     
     def cancel_search(self):
-        """Cancelar búsqueda"""
-        self.stop_search = True
-        # Señalar al evento de cancelación si existe
-        if hasattr(self, 'cancel_event') and self.cancel_event:
-            self.cancel_event.set()
-        if hasattr(self, "status_label"):
-            self.status_label.configure(text="Búsqueda cancelada")
-        if hasattr(self, "progress_label"):
-            self.progress_label.configure(text="Cancelado")
-        self._search_finished()
+        """Cancelar la búsqueda de la pestaña activa"""
+        session = self.active_session
+        session.cancel()
+        self._apply_session_state(session, "status", "Búsqueda cancelada")
+        self._apply_session_state(session, "progress_text", "Cancelado")
+        self.cancel_button.configure(state="disabled")
     
     def filter_results(self, event=None):
         """Filtrar resultados usando la nueva estructura de columnas"""
         filter_text = self.filter_entry.get().lower()
+        self.active_session.filter_text = self.filter_entry.get()
         
         # Limpiar treeview
         for item in self.results_tree.get_children():
             self.results_tree.delete(item)
         
         # Volver a poblar con filtro
-        for i, record in enumerate(self.current_records):
-            # Manejar diferentes tipos de datos de entrada
-            if isinstance(record, str):
-                record_dict = {
-                    'name': f'Resultado {i+1}',
-                    'type': 1,
-                    'media': 1,
-                    'bucket': 'unknown',
-                    'size': len(record),
-                    'date': '',
-                    'xscore': 0,
-                    'systemid': f'record_{i}',
-                    'data': record
-                }
-            elif isinstance(record, dict):
-                record_dict = record
-            else:
-                record_dict = {
-                    'name': f'Resultado {i+1}',
-                    'type': 0,
-                    'media': 0,
-                    'bucket': 'unknown',
-                    'size': 0,
-                    'date': '',
-                    'xscore': 0,
-                    'systemid': f'record_{i}',
-                    'data': str(record)
-                }
-            
+        for i, (iid, record_dict) in enumerate(self.record_registry.items()):
             # Buscar en todos los campos del registro
             record_data = str(record_dict).lower()
             name = record_dict.get('name', f'Documento {i+1}').lower()
@@ -835,56 +933,34 @@ class IntelXCheckerApp(ctk.CTk):
             if (filter_text in record_data or 
                 filter_text in name or 
                 filter_text in bucket):
-                
-                # Fecha formateada (primera prioridad)
-                date_str = record_dict.get('date', '')
-                if date_str:
-                    try:
-                        date_text = date_str[:19] if len(date_str) > 19 else date_str
-                    except:
-                        date_text = date_str
-                else:
-                    date_text = 'N/A'
-                
-                # Recrear la entrada usando los nuevos campos
-                name_display = record_dict.get('name', f'Documento {i+1}')
-                name_display = name_display[:60] + "..." if len(name_display) > 60 else name_display
-                
-                # Extraer IP
-                ip_address = self._extract_ip_address(record_dict)
-                
-                type_val = record_dict.get('type', 0)
-                type_text = self._get_type_description(type_val)
-                
-                media_val = record_dict.get('media', 0)
-                media_text = self._get_media_description(media_val)
-                
-                bucket = record_dict.get('bucket', 'unknown')
-                bucket_text = record_dict.get('bucketh', bucket)
-                
-                size = record_dict.get('size', 0)
-                size_text = self._format_file_size(size)
-                
-                score = record_dict.get('xscore', 0)
-                score_text = str(score) if score > 0 else 'N/A'
-                
-                system_id = record_dict.get('systemid', record_dict.get('storageid', str(i)))
-                
-                # Nuevo orden: fecha, nombre, IP, tipo, media, bucket, tamaño, score, systemid
-                self.results_tree.insert("", "end", values=(
-                    date_text, name_display, ip_address, type_text, media_text, 
-                    bucket_text, size_text, score_text, system_id
-                ))
+                self.results_tree.insert("", "end", iid=iid, values=self._record_row_values(record_dict, i))
+        self._apply_sort()
     
     def refresh_credits(self):
-        """Actualizar créditos usando la API real"""
+        """Actualizar créditos usando la API real.
+
+        La consulta espera su turno en el limitador compartido con las
+        búsquedas, así que se hace en un hilo aparte y el resultado se aplica
+        en el hilo principal a través del bus de actualizaciones.
+        """
         if not self.api_key:
             return
-            
+        logger.info("Actualizando créditos desde la API...")
+        api_key = self.api_key
+
+        def worker():
+            try:
+                result = get_api_credits(api_key, rate_limiter=self.search_scheduler.rate_limiter)
+            except Exception as e:
+                logger.exception("Error obteniendo créditos")
+                result = (False, str(e))
+            self.ui_bus.call(self._apply_credits, *result)
+
+        threading.Thread(target=worker, name="credits", daemon=True).start()
+
+    def _apply_credits(self, success, credits_or_error):
+        """Mostrar el resultado de refresh_credits (hilo principal)"""
         try:
-            logger.info("Actualizando créditos desde la API...")
-            success, credits_or_error = get_api_credits(self.api_key)
-            
             if success:
                 old_credits = getattr(self, 'credits', 0)
                 self.credits = credits_or_error
@@ -945,18 +1021,11 @@ class IntelXCheckerApp(ctk.CTk):
         if not selection:
             return
             
-        # Obtener datos del item seleccionado
-        item = self.results_tree.item(selection[0])
-        values = item['values']
-        
-        if values:
-            record_id = values[-1]  # El systemid está en la última columna
-            # Buscar record completo usando la función auxiliar
-            record = self._find_record_by_id(record_id)
-            
-            if record:
-                # Crear ventana de preview (implementar según necesidades)
-                self._show_preview_window(record)
+        # El iid del item identifica el registro en el registro indexado
+        record = self.record_registry.by_iid(selection[0])
+        if record:
+            # Crear ventana de preview (implementar según necesidades)
+            self._show_preview_window(record)
     
     def _show_preview_window(self, record):
         """Mostrar ventana de preview"""
@@ -998,16 +1067,8 @@ class IntelXCheckerApp(ctk.CTk):
             ui_components.show_custom_messagebox(self, "Error", "No hay elementos seleccionados", "warning")
             return
         
-        # Obtener records seleccionados
-        selected_records = []
-        for item_id in selection:
-            item = self.results_tree.item(item_id)
-            values = item['values']
-            if values:
-                record_id = values[-1]  # El systemid está en la última columna
-                record = self._find_record_by_id(record_id)
-                if record:
-                    selected_records.append(record)
+        # Obtener records seleccionados (coste proporcional a la selección)
+        selected_records = self.record_registry.select(selection, id_field='iid')
         
         if selected_records:
             # Usar dialogo de exportación
@@ -1025,8 +1086,58 @@ class IntelXCheckerApp(ctk.CTk):
     #         logger.exception('Error exporting PDF')
     #         ui_components.show_custom_messagebox(self, 'Error', f'Error exportando PDF: {e}', 'error')
 
+    def start_export_job(self, kind, records, **options):
+        """Encolar una exportación en segundo plano; devuelve el ExportJob"""
+        job = self.export_jobs.submit(kind, records, **options)
+        self.ui_bus.post("status", f"Exportación {kind.upper()} en cola ({job.total} registros)")
+        return job
+
+    def _on_export_progress(self, job):
+        """Progreso de exportación (llamado desde el hilo de trabajo)"""
+        self.ui_bus.post("progress", job.progress)
+        self.ui_bus.post("progress_text", f"{job.kind.upper()} {job.written}/{job.total}")
+
+    def _on_export_finished(self, job):
+        """Fin de exportación (llamado desde el hilo de trabajo)"""
+        self.ui_bus.call(self._export_finished, job)
+
+    def _export_finished(self, job):
+        """Notificar el resultado de una exportación en el hilo principal"""
+        self.progress_bar.set(0)
+        self.progress_label.configure(text="")
+        if job.status == JOB_DONE and job.kind == "append":
+            self.status_label.configure(
+                text=f"Anexados {job.result['new']} registros nuevos ({job.result['duplicates']} duplicados omitidos)"
+            )
+        elif job.status == JOB_DONE and job.kind == "bundle":
+            timings = ", ".join(f"{fmt.upper()} {job.result['timings'][fmt]:.1f}s" for fmt in job.result['paths'])
+            self.status_label.configure(text=f"Paquete exportado ({timings})")
+            if job.result['errors']:
+                failed = ", ".join(fmt.upper() for fmt in job.result['errors'])
+                ui_components.show_custom_messagebox(self, 'Error', f'Fallaron los formatos: {failed}', 'error')
+            if job.result['paths']:
+                ui_components.show_export_success_dialog(self, next(iter(job.result['paths'].values())))
+        elif job.status == JOB_DONE:
+            self.status_label.configure(text=f"Exportación {job.kind.upper()} completada")
+            ui_components.show_export_success_dialog(self, job.filepath)
+            if job.kind == "html":
+                # Ask if user wants to open
+                if ui_components.show_custom_question_dialog(self, "Reporte HTML Interactivo",
+                                                           "¿Desea abrir el reporte interactivo en su navegador?"):
+                    open_in_browser(job.filepath)
+                logger.info(f"Reporte HTML interactivo generado: {job.filepath}")
+        elif job.status == JOB_CANCELLED:
+            self.status_label.configure(text=f"Exportación {job.kind.upper()} cancelada")
+        else:
+            self.status_label.configure(text=f"Error en exportación {job.kind.upper()}")
+            ui_components.show_custom_messagebox(self, 'Error', f'Error exportando {job.kind.upper()}: {job.error}', 'error')
+
+    def cancel_exports(self):
+        """Cancelar las exportaciones en curso o en cola"""
+        self.export_jobs.cancel_all()
+
     def export_to_csv_safe(self):
-        """Exportar a CSV usando módulo de exportación"""
+        """Exportar a CSV en segundo plano usando módulo de exportación"""
         try:
             # Get selection if any
             selected_ids = list(self.results_tree.selection()) if hasattr(self, 'results_tree') else []
@@ -1035,17 +1146,15 @@ class IntelXCheckerApp(ctk.CTk):
                 return
 
             # Get search term for filename
-            search_term = self.term_entry.get().strip() or 'IntelX_Export'
+            search_term = self.active_session.term or 'IntelX_Export'
 
-            filepath = exports_module.export_to_csv(records_to_export, search_term)
-            ui_components.show_export_success_dialog(self, filepath)
-            return filepath
+            return self.start_export_job("csv", records_to_export, filename=search_term)
         except Exception as e:
             logger.exception('Error exporting CSV')
             ui_components.show_custom_messagebox(self, 'Error', f'Error exportando CSV: {e}', 'error')
 
     def export_to_json_safe(self):
-        """Exportar a JSON usando módulo de exportación"""
+        """Exportar a JSON en segundo plano usando módulo de exportación"""
         try:
             if not self.current_records:
                 ui_components.show_custom_messagebox(self, "Sin Datos", "No hay resultados para exportar.", "warning")
@@ -1060,43 +1169,104 @@ class IntelXCheckerApp(ctk.CTk):
                 return
                 
             # Get search term for filename
-            search_term = self.term_entry.get().strip() or 'IntelX_Export'
+            search_term = self.active_session.term or 'IntelX_Export'
                 
-            filepath = exports_module.export_to_json(records_to_export, search_term)
-            ui_components.show_export_success_dialog(self, filepath)
-            return filepath
+            return self.start_export_job("json", records_to_export, filename=search_term)
         except Exception as e:
             logger.exception('Error exporting JSON')
             ui_components.show_custom_messagebox(self, 'Error', f'Error exportando JSON: {e}', 'error')
 
-    def export_to_html_safe(self):
-        """Generate an interactive HTML report with modern features"""
+    def export_to_ndjson_safe(self):
+        """Exportar a NDJSON comprimido (gzip) en segundo plano"""
+        try:
+            selected_ids = list(self.results_tree.selection()) if hasattr(self, 'results_tree') else []
+            records_to_export = ui_components.get_records_to_export_dialog(self, self.current_records, selected_ids)
+            if not records_to_export:
+                return
+
+            search_term = sanitize_filename(self.active_session.term or 'IntelX_Export')
+
+            return self.start_export_job("ndjson", records_to_export, filename=search_term, compress=True)
+        except Exception as e:
+            logger.exception('Error exporting NDJSON')
+            ui_components.show_custom_messagebox(self, 'Error', f'Error exportando NDJSON: {e}', 'error')
+
+    def export_to_parquet_safe(self):
+        """Exportar a Parquet (columnas tipadas) en segundo plano"""
+        try:
+            selected_ids = list(self.results_tree.selection()) if hasattr(self, 'results_tree') else []
+            records_to_export = ui_components.get_records_to_export_dialog(self, self.current_records, selected_ids)
+            if not records_to_export:
+                return
+
+            search_term = sanitize_filename(self.active_session.term or 'IntelX_Export')
+
+            return self.start_export_job("parquet", records_to_export, filename=search_term)
+        except Exception as e:
+            logger.exception('Error exporting Parquet')
+            ui_components.show_custom_messagebox(self, 'Error', f'Error exportando Parquet: {e}', 'error')
+
+    def append_to_export_safe(self):
+        """Anexar sólo los registros nuevos a una exportación existente (CSV/JSON/NDJSON/HTML interactivo)"""
         try:
             if not self.current_records:
                 ui_components.show_custom_messagebox(self, "Sin Datos", "No hay resultados para exportar.", "warning")
                 return
 
-            search_term = self.term_entry.get().strip() or "búsqueda_sin_nombre"
+            filepath = filedialog.asksaveasfilename(
+                title="Anexar a exportación",
+                initialdir=os.path.join(os.path.dirname(os.path.dirname(__file__)), 'exports'),
+                confirmoverwrite=False,
+                filetypes=[("Exportaciones", "*.csv *.json *.ndjson *.ndjson.gz *.jsonl *.jsonl.gz *.html"),
+                           ("Todos los archivos", "*.*")]
+            )
+            if not filepath:
+                return
 
-            # Use the new interactive HTML export
-            from exports import export_to_interactive_html
-            
-            filepath = export_to_interactive_html(
-                records=self.current_records,
+            return self.start_export_job("append", self.record_registry.records, filepath=filepath)
+        except Exception as e:
+            logger.exception('Error appending to export')
+            ui_components.show_custom_messagebox(self, 'Error', f'Error anexando a la exportación: {e}', 'error')
+
+    def export_bundle_safe(self):
+        """Exportar CSV, JSON y HTML a la vez desde una sola pasada sobre los resultados"""
+        try:
+            selected_ids = list(self.results_tree.selection()) if hasattr(self, 'results_tree') else []
+            records_to_export = ui_components.get_records_to_export_dialog(self, self.current_records, selected_ids)
+            if not records_to_export:
+                return
+
+            search_term = self.active_session.term
+            return self.start_export_job(
+                "bundle",
+                records_to_export,
+                formats=("csv", "json", "html"),
+                base_name=sanitize_filename(search_term or 'IntelX_Export'),
                 search_term=search_term,
                 app_version="2.0.0"
             )
+        except Exception as e:
+            logger.exception('Error exporting bundle')
+            ui_components.show_custom_messagebox(self, 'Error', f'Error exportando paquete: {e}', 'error')
 
-            # Show success dialog
-            ui_components.show_export_success_dialog(self, filepath)
-            
-            # Ask if user wants to open
-            if ui_components.show_custom_question_dialog(self, "Reporte HTML Interactivo", 
-                                                       "¿Desea abrir el reporte interactivo en su navegador?"):
-                open_in_browser(filepath)
+    def export_to_html_safe(self):
+        """Generate an interactive HTML report in the background"""
+        try:
+            if not self.current_records:
+                ui_components.show_custom_messagebox(self, "Sin Datos", "No hay resultados para exportar.", "warning")
+                return
+
+            search_term = self.active_session.term or "búsqueda_sin_nombre"
 
-            logger.info(f"Reporte HTML interactivo generado: {filepath}")
-            return filepath
+            # The success dialog and the "open in browser" prompt are shown when the job finishes
+            return self.start_export_job(
+                "html",
+                self.current_records,
+                search_term=search_term,
+                app_version="2.0.0",
+                # Permite anexar luego los resultados nuevos sin regenerar el reporte
+                keep_state=True
+            )
 
         except Exception as e:
             logger.exception("Error generando reporte HTML interactivo")
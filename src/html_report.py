@@ -8,10 +8,45 @@ from collections import Counter
 from typing import List, Dict, Any
 
 from api import MEDIA_TYPE_MAP
+from report_templates import ASSET_CSS, ASSET_JS, get_asset, register_asset
 
 logger = logging.getLogger(__name__)
 
 
+# Hoja de estilos y script de gráficos estáticos: se construyen una vez por proceso
+_REPORT_CSS = "\n".join((
+    "body{font-family:'Segoe UI',Arial,sans-serif;margin:0;background:#f4f6f9;color:#2d3748;line-height:1.4;padding:18px;}",
+    ".wrap{max-width:1150px;margin:0 auto;background:#fff;border-radius:14px;box-shadow:0 6px 18px -6px rgba(0,0,0,.08);overflow:hidden;}",
+    "header{background:linear-gradient(120deg,#4F46E5,#6D28D9);color:#fff;padding:26px 32px;}header h1{margin:0;font-weight:400;font-size:1.9rem;}",
+    "header .meta{margin-top:6px;font-size:.8rem;opacity:.9;}",
+    "section{padding:26px 32px;border-top:1px solid #edf2f7;}section:first-of-type{border-top:none;}",
+    "h2{margin:0 0 18px;font-size:1.25rem;color:#4F46E5;font-weight:600;}",
+    ".grid-cards{display:grid;grid-template-columns:repeat(auto-fit,minmax(170px,1fr));gap:14px;margin-bottom:4px;}",
+    ".card{background:#f8fafc;padding:14px 16px;border-radius:10px;position:relative;overflow:hidden;}",
+    ".card h3{margin:0 0 6px;font-size:.75rem;letter-spacing:.5px;text-transform:uppercase;color:#64748b;font-weight:600;}",
+    ".card .val{font-size:1.4rem;font-weight:600;color:#3b82f6;}",
+    ".charts{display:grid;grid-template-columns:repeat(auto-fit,minmax(300px,1fr));gap:26px;margin-top:8px;}",
+    ".chart-box{background:#fff;border:1px solid #e2e8f0;border-radius:12px;padding:16px;box-shadow:0 3px 6px -4px rgba(0,0,0,.08);}",
+    ".chart-box h3{margin:0 0 10px;font-size:.9rem;font-weight:600;color:#475569;}",
+    "table{width:100%;border-collapse:collapse;margin-top:6px;font-size:.8rem;}",
+    "th,td{padding:6px 8px;border-bottom:1px solid #e2e8f0;text-align:left;}",
+    "th{background:#4F46E5;color:#fff;font-weight:600;font-size:.7rem;letter-spacing:.5px;}",
+    "tbody tr:nth-child(even){background:#f8fafc;}",
+    "tbody tr:hover{background:#eef2ff;}",
+    ".badge{display:inline-block;padding:2px 6px;border-radius:6px;background:#e0e7ff;color:#3730a3;font-size:.65rem;font-weight:600;}",
+    ".note{margin-top:10px;font-size:.65rem;color:#64748b;}",
+    "footer{padding:18px 28px;background:#1e293b;color:#cbd5e1;font-size:.65rem;text-align:center;}",
+    "@media(max-width:760px){header,section{padding:22px 20px;}table{font-size:.72rem;}th{font-size:.63rem;}}",
+))
+_REPORT_JS = "\n".join((
+    "function makeChart(id,type,labels,data,extra){const ctx=document.getElementById(id).getContext('2d');return new Chart(ctx,{type:type,data:{labels:labels,datasets:[{label:'Registros',data:data,backgroundColor:['#6366F1','#8B5CF6','#EC4899','#F59E0B','#10B981','#6EE7B7','#F87171'],borderWidth:1,borderColor:'#ffffff40'}]},options:Object.assign({responsive:true,plugins:{legend:{display:true,position:'bottom',labels:{boxWidth:12,font:{size:10}}},tooltip:{callbacks:{label:(c)=>`${c.label}: ${c.formattedValue}`}}},scales:type==='bar'?{y:{beginAtZero:true,ticks:{precision:0,font:{size:10}},grid:{color:'#f1f5f9'}},x:{ticks:{font:{size:10}}}}:{}},extra||{})});}",
+    "document.addEventListener('DOMContentLoaded',()=>{makeChart('chartMedia','doughnut',DATA.mediaLabels,DATA.mediaValues,{cutout:'55%',plugins:{legend:{display:true}}});makeChart('chartTemporal','bar',DATA.yearLabels,DATA.yearValues);});",
+))
+
+register_asset('html_report.css', lambda: _REPORT_CSS, ASSET_CSS)
+register_asset('html_report.js', lambda: _REPORT_JS, ASSET_JS)
+
+
 def _analyze_records(records: List[Dict[str, Any]]) -> Dict[str, Any]:
     analysis = {
         "total_results": len(records),
@@ -216,28 +251,7 @@ def generate_html_report(records: List[Dict[str, Any]], output_filepath: str, se
     add(f"<title>Informe IntelX - {search_term}</title>")
     add("<script src='https://cdn.jsdelivr.net/npm/chart.js'></script>")
     add("<style>")
-    add("body{font-family:'Segoe UI',Arial,sans-serif;margin:0;background:#f4f6f9;color:#2d3748;line-height:1.4;padding:18px;}")
-    add(".wrap{max-width:1150px;margin:0 auto;background:#fff;border-radius:14px;box-shadow:0 6px 18px -6px rgba(0,0,0,.08);overflow:hidden;}")
-    add("header{background:linear-gradient(120deg,#4F46E5,#6D28D9);color:#fff;padding:26px 32px;}header h1{margin:0;font-weight:400;font-size:1.9rem;}")
-    add("header .meta{margin-top:6px;font-size:.8rem;opacity:.9;}")
-    add("section{padding:26px 32px;border-top:1px solid #edf2f7;}section:first-of-type{border-top:none;}")
-    add("h2{margin:0 0 18px;font-size:1.25rem;color:#4F46E5;font-weight:600;}")
-    add(".grid-cards{display:grid;grid-template-columns:repeat(auto-fit,minmax(170px,1fr));gap:14px;margin-bottom:4px;}")
-    add(".card{background:#f8fafc;padding:14px 16px;border-radius:10px;position:relative;overflow:hidden;}")
-    add(".card h3{margin:0 0 6px;font-size:.75rem;letter-spacing:.5px;text-transform:uppercase;color:#64748b;font-weight:600;}")
-    add(".card .val{font-size:1.4rem;font-weight:600;color:#3b82f6;}")
-    add(".charts{display:grid;grid-template-columns:repeat(auto-fit,minmax(300px,1fr));gap:26px;margin-top:8px;}")
-    add(".chart-box{background:#fff;border:1px solid #e2e8f0;border-radius:12px;padding:16px;box-shadow:0 3px 6px -4px rgba(0,0,0,.08);}")
-    add(".chart-box h3{margin:0 0 10px;font-size:.9rem;font-weight:600;color:#475569;}")
-    add("table{width:100%;border-collapse:collapse;margin-top:6px;font-size:.8rem;}")
-    add("th,td{padding:6px 8px;border-bottom:1px solid #e2e8f0;text-align:left;}")
-    add("th{background:#4F46E5;color:#fff;font-weight:600;font-size:.7rem;letter-spacing:.5px;}")
-    add("tbody tr:nth-child(even){background:#f8fafc;}")
-    add("tbody tr:hover{background:#eef2ff;}")
-    add(".badge{display:inline-block;padding:2px 6px;border-radius:6px;background:#e0e7ff;color:#3730a3;font-size:.65rem;font-weight:600;}")
-    add(".note{margin-top:10px;font-size:.65rem;color:#64748b;}")
-    add("footer{padding:18px 28px;background:#1e293b;color:#cbd5e1;font-size:.65rem;text-align:center;}")
-    add("@media(max-width:760px){header,section{padding:22px 20px;}table{font-size:.72rem;}th{font-size:.63rem;}}");
+    add(get_asset('html_report.css'))
     add("</style>")
     add("</head>")
     add("<body>")
@@ -306,8 +320,7 @@ def generate_html_report(records: List[Dict[str, Any]], output_filepath: str, se
     # Scripts (Chart.js)
     add("<script>")
     add(f"const DATA = {js_blob};")
-    add("function makeChart(id,type,labels,data,extra){const ctx=document.getElementById(id).getContext('2d');return new Chart(ctx,{type:type,data:{labels:labels,datasets:[{label:'Registros',data:data,backgroundColor:['#6366F1','#8B5CF6','#EC4899','#F59E0B','#10B981','#6EE7B7','#F87171'],borderWidth:1,borderColor:'#ffffff40'}]},options:Object.assign({responsive:true,plugins:{legend:{display:true,position:'bottom',labels:{boxWidth:12,font:{size:10}}},tooltip:{callbacks:{label:(c)=>`${c.label}: ${c.formattedValue}`}}},scales:type==='bar'?{y:{beginAtZero:true,ticks:{precision:0,font:{size:10}},grid:{color:'#f1f5f9'}},x:{ticks:{font:{size:10}}}}:{}},extra||{})});}")
-    add("document.addEventListener('DOMContentLoaded',()=>{makeChart('chartMedia','doughnut',DATA.mediaLabels,DATA.mediaValues,{cutout:'55%',plugins:{legend:{display:true}}});makeChart('chartTemporal','bar',DATA.yearLabels,DATA.yearValues);});")
+    add(get_asset('html_report.js'))
     add("</script>")
     add("</div>")  # wrap
     add("</body>")
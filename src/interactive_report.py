@@ -3,103 +3,284 @@ Interactive HTML Report Generator
 Generates modern, interactive HTML reports with filtering and visualization capabilities.
 """
 
+import io
 import os
+import contextlib
+import gzip
+import html
+import re
 import json
+import zlib
+import base64
 import logging
-from datetime import datetime, date
-from typing import List, Dict, Any, Optional, Tuple
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import datetime, date, timedelta
+from typing import IO, Callable, Iterable, Iterator, List, Dict, Any, Optional, Tuple
 from collections import Counter, OrderedDict
 
 from api import MEDIA_TYPE_MAP
-from svg_charts import SVGVisualizationGenerator
+from svg_charts import LINE_CHART_MAX_POINTS, SVGVisualizationGenerator
+from record_store import record_key
+from report_templates import ASSET_CSS, ASSET_JS, compile_template, get_asset, register_asset
 
 logger = logging.getLogger(__name__)
 
+# Patterns and lookup tables used by DataProcessor._classify_data_type
+_IP_IN_NAME_RE = re.compile(r'\b\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3}\b')
+_DOMAIN_PATTERNS = (".com", ".org", ".net", ".gov", ".edu", ".ar", ".co.uk")
+_FILE_SUFFIXES = ('.txt', '.csv', '.rar', '.zip')
+_DATABASE_EXTENSIONS = (".csv", ".sql", ".db", ".sqlite")
+_DOC_EXTENSIONS = (".pdf", ".doc", ".docx", ".xls", ".xlsx", ".ppt", ".pptx", ".txt")
+_CODE_EXTENSIONS = (".py", ".js", ".php", ".html", ".css", ".java", ".cpp", ".c", ".rb", ".go")
+_DOC_MEDIA_TYPES = frozenset({15, 16, 17, 18, 19, 22, 23, 24})  # PDF, DOC, XLS, etc.
+
+# Per-record KPI flags (bit i of DataProcessor.record_flags is KPI_FLAGS[i]);
+# the report script re-aggregates the KPI cards from them when filtering
+KPI_FLAGS = ('public', 'indexed', 'sensitive', 'leak', 'complete_metadata', 'downloadable')
+FLAG_PUBLIC, FLAG_INDEXED, FLAG_SENSITIVE, FLAG_LEAK, FLAG_COMPLETE_METADATA, FLAG_DOWNLOADABLE = (
+    1 << i for i in range(len(KPI_FLAGS)))
+_REQUIRED_FIELDS = ("date", "name", "size", "type", "media", "bucket", "xscore", "systemid")
+_DOWNLOADABLE_MEDIA_TYPES = frozenset({15, 16, 17, 18, 19, 22, 23, 24, 27, 32})
+_QUARTER_OF_MONTH = {f'{month:02d}': (month - 1) // 3 + 1 for month in range(1, 13)}
+
+# Granularities of the temporal chart and their names in the chart title
+TEMPORAL_GRANULARITIES = ('day', 'week', 'month', 'quarter')
+_GRANULARITY_NAMES = {'day': 'día', 'week': 'semana', 'month': 'mes', 'quarter': 'trimestre'}
+
 
 class DataProcessor:
     """Handles data processing and analysis for reports."""
     
     @staticmethod
-    def analyze_records(records: List[Dict[str, Any]]) -> Dict[str, Any]:
-        """Analyze records and extract statistics and distributions."""
-        analysis = {
-            "total_results": len(records),
+    def classify_records(records: List[Dict[str, Any]]) -> List[str]:
+        """Data type of every record, computed once and shared by the whole report."""
+        return [DataProcessor._classify_data_type(r) for r in records]
+
+    @staticmethod
+    def iter_projected(records: List[Dict[str, Any]], data_types: List[str],
+                       granularity: str = 'quarter') -> Iterator[Dict[str, Any]]:
+        """Yield the table view of each record, reusing precomputed data types.
+
+        Media labels are resolved once per distinct media value and temporal
+        periods (at ``granularity``) once per distinct day.
+        """
+        media_labels: Dict[Any, str] = {}
+        periods: Dict[str, Optional[str]] = {}
+        for record, data_type in zip(records, data_types):
+            media = record.get('media')
+            try:
+                media_label = media_labels[media]
+            except KeyError:
+                media_label = media_labels[media] = DataProcessor._media_label(media)
+            except TypeError:
+                media_label = DataProcessor._media_label(media)
+            date_str = record.get('date')
+            if isinstance(date_str, str):
+                try:
+                    period = periods[date_str[:10]]
+                except KeyError:
+                    period = periods[date_str[:10]] = DataProcessor.record_period(date_str, granularity)
+            else:
+                period = DataProcessor.record_period(date_str, granularity)
+            yield {
+                'date': record.get('date', ''),
+                'name': record.get('name', 'N/A'),
+                'bucket': record.get('bucket', 'N/A'),
+                'type': record.get('type', 'N/A'),
+                'media': record.get('media', ''),
+                'media_label': media_label,
+                'xscore': record.get('xscore', ''),
+                'systemid': record.get('systemid', ''),
+                'data_type': data_type,
+                # Group keys for re-aggregating charts and KPI cards in the report
+                'period': period,
+                'flags': DataProcessor.record_flags(record)
+            }
+
+    @staticmethod
+    def project_records(records: List[Dict[str, Any]],
+                        data_types: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        """Build the classified table view of the records as a list."""
+        if data_types is None:
+            data_types = DataProcessor.classify_records(records)
+        return list(DataProcessor.iter_projected(records, data_types))
+
+    @staticmethod
+    def analyze_records(records: List[Dict[str, Any]],
+                        data_types: Optional[List[str]] = None) -> Dict[str, Any]:
+        """Analyze records and extract statistics and distributions.
+
+        ``data_types`` is the output of classify_records(); when given,
+        records are not classified again.
+        """
+        aggregates = DataProcessor.new_aggregates()
+        DataProcessor.accumulate_records(aggregates, records, data_types)
+        return DataProcessor.analysis_from_aggregates(aggregates)
+
+    @staticmethod
+    def new_aggregates() -> Dict[str, Any]:
+        """Empty running totals of a report (see accumulate_records).
+
+        Besides the record count every value is a Counter, so the totals of
+        successive batches of records add up to those of all of them (see
+        InteractiveReportGenerator.append_report).
+        """
+        return {
+            "total_results": 0,
             "source_distribution": Counter(),
             "type_distribution": Counter(),
             "media_distribution": Counter(),
-            "exposure_levels": {"public": 0, "indexed": 0, "sensitive": 0},
-            "kpis": {
-                "leaks_percentage": 0.0,
-                "complete_metadata_percentage": 0.0,
-                "downloadable_documents_count": 0
-            },
-            "temporal_data": Counter(),
             "data_types": Counter(),
-            "unique_sources": set()
+            "temporal_data": Counter(),
+            "temporal_days": Counter(),
+            # Records per KPI flag combination (see record_flags)
+            "flags": Counter(),
         }
 
-        leaks_count = 0
-        complete_metadata_count = 0
-        downloadable_count = 0
-
-        for r in records:
-            # Source analysis
-            bucket = r.get("bucket", "N/A")
-            analysis["source_distribution"][bucket] += 1
-            analysis["unique_sources"].add(bucket)
-
-            # Type analysis
-            rtype = r.get("type", "N/A")
-            analysis["type_distribution"][rtype] += 1
-
-            # Media analysis
-            media = r.get("media", "N/A")
-            analysis["media_distribution"][media] += 1
-
-            # Data type classification
-            data_type = DataProcessor._classify_data_type(r)
-            analysis["data_types"][data_type] += 1
-
-            # Exposure levels
-            tags_lower = str(r.get("tags", "")).lower()
-            if "public" in tags_lower:
-                analysis["exposure_levels"]["public"] += 1
-            if r.get("indexed", False):
-                analysis["exposure_levels"]["indexed"] += 1
-            if "sensitive" in tags_lower or (r.get("xscore", 0) or 0) > 70:
-                analysis["exposure_levels"]["sensitive"] += 1
-
-            # Leak detection
-            if "leak" in bucket.lower() or "paste" in bucket.lower():
-                leaks_count += 1
-
-            # Metadata completeness
-            required_fields = ["date", "name", "size", "type", "media", "bucket", "xscore", "systemid"]
-            if all(r.get(f) is not None for f in required_fields):
-                complete_metadata_count += 1
-
-            # Downloadable content
-            if isinstance(media, int) and media in {15, 16, 17, 18, 19, 22, 23, 24, 27, 32}:
-                downloadable_count += 1
+    @staticmethod
+    def accumulate_records(aggregates: Dict[str, Any], records: List[Dict[str, Any]],
+                           data_types: Optional[List[str]] = None):
+        """Add ``records`` to the running totals ``aggregates`` in place."""
+        if data_types is None:
+            data_types = DataProcessor.classify_records(records)
+        aggregates["total_results"] += len(records)
+        sources = aggregates["source_distribution"]
+        types = aggregates["type_distribution"]
+        media = aggregates["media_distribution"]
+        classified = aggregates["data_types"]
+        months = aggregates["temporal_data"]
+        days = aggregates["temporal_days"]
+        flags = aggregates["flags"]
+
+        for r, data_type in zip(records, data_types):
+            sources[r.get("bucket", "N/A")] += 1
+            types[r.get("type", "N/A")] += 1
+            media[r.get("media", "N/A")] += 1
+            classified[data_type] += 1
+            flags[DataProcessor.record_flags(r)] += 1
 
             # Temporal analysis
             date_str = r.get("date")
             if date_str and len(date_str) >= 7:
-                analysis["temporal_data"][date_str[:7]] += 1
+                months[date_str[:7]] += 1
+                if len(date_str) >= 10:
+                    days[date_str[:10]] += 1
+
+    @staticmethod
+    def analysis_from_aggregates(aggregates: Dict[str, Any]) -> Dict[str, Any]:
+        """Statistics and distributions of a report from its running totals."""
+        flag_counts = {name: sum(count for combo, count in aggregates["flags"].items() if combo & (1 << bit))
+                       for bit, name in enumerate(KPI_FLAGS)}
+        total = aggregates["total_results"]
+        analysis = {
+            "total_results": total,
+            "source_distribution": Counter(aggregates["source_distribution"]),
+            "type_distribution": Counter(aggregates["type_distribution"]),
+            "media_distribution": Counter(aggregates["media_distribution"]),
+            "exposure_levels": {name: flag_counts[name] for name in ("public", "indexed", "sensitive")},
+            "kpis": {
+                "leaks_percentage": 0.0,
+                "complete_metadata_percentage": 0.0,
+                "downloadable_documents_count": flag_counts["downloadable"]
+            },
+            "temporal_data": dict(sorted(aggregates["temporal_data"].items())),
+            "temporal_days": Counter(aggregates["temporal_days"]),
+            "data_types": Counter(aggregates["data_types"]),
+            "unique_sources": len(aggregates["source_distribution"])
+        }
 
         # Calculate KPIs
-        total = analysis["total_results"] or 1
-        if analysis["total_results"]:
-            analysis["kpis"]["leaks_percentage"] = (leaks_count / total) * 100
-            analysis["kpis"]["complete_metadata_percentage"] = (complete_metadata_count / total) * 100
-        analysis["kpis"]["downloadable_documents_count"] = downloadable_count
-        
-        # Sort temporal data
-        analysis["temporal_data"] = dict(sorted(analysis["temporal_data"].items()))
-        analysis["unique_sources"] = len(analysis["unique_sources"])
-        
+        if total:
+            analysis["kpis"]["leaks_percentage"] = (flag_counts["leak"] / total) * 100
+            analysis["kpis"]["complete_metadata_percentage"] = (flag_counts["complete_metadata"] / total) * 100
         return analysis
 
+    @staticmethod
+    def record_flags(record: Dict[str, Any]) -> int:
+        """KPI flags of a record as a bitmask (see KPI_FLAGS)."""
+        flags = 0
+        tags_lower = str(record.get("tags", "")).lower()
+        if "public" in tags_lower:
+            flags |= FLAG_PUBLIC
+        if record.get("indexed", False):
+            flags |= FLAG_INDEXED
+        if "sensitive" in tags_lower or (record.get("xscore", 0) or 0) > 70:
+            flags |= FLAG_SENSITIVE
+        bucket = record.get("bucket", "N/A")
+        if "leak" in bucket.lower() or "paste" in bucket.lower():
+            flags |= FLAG_LEAK
+        if all(record.get(f) is not None for f in _REQUIRED_FIELDS):
+            flags |= FLAG_COMPLETE_METADATA
+        media = record.get("media", "N/A")
+        if isinstance(media, int) and media in _DOWNLOADABLE_MEDIA_TYPES:
+            flags |= FLAG_DOWNLOADABLE
+        return flags
+
+    @staticmethod
+    def record_period(date_str: Any, granularity: str = 'quarter') -> Optional[str]:
+        """Temporal chart period of a record date.
+
+        Labels are 'YYYY-MM-DD' (day), ISO 'YYYY-Www' (week), 'YYYY-MM'
+        (month) or 'YYYY Qn' (quarter); None when the date has no such period.
+        """
+        if granularity in ('month', 'quarter'):
+            if not date_str or len(date_str) < 7 or date_str[4] != '-':
+                return None
+            quarter = _QUARTER_OF_MONTH.get(date_str[5:7])
+            if not quarter:
+                return None
+            return date_str[:7] if granularity == 'month' else f'{date_str[:4]} Q{quarter}'
+        try:
+            day = date.fromisoformat(date_str[:10])
+        except (TypeError, ValueError):
+            return None
+        if granularity == 'day':
+            return day.isoformat()
+        year, week, _ = day.isocalendar()
+        return f'{year}-W{week:02d}'
+
+    @staticmethod
+    def temporal_periods(granularity: str = 'quarter',
+                         temporal_range: Optional[Tuple[Any, Any]] = None) -> List[Tuple[str, date, date]]:
+        """``(label, first_day, last_day)`` of every period of the temporal chart.
+
+        ``temporal_range`` is an inclusive ``(start, end)`` pair of dates or
+        ISO date strings; by default the last 5 calendar years.
+        """
+        if granularity not in TEMPORAL_GRANULARITIES:
+            raise ValueError(f"Unknown temporal granularity: {granularity}")
+        if temporal_range is None:
+            today = datetime.now().date()
+            start, end = date(today.year - 4, 1, 1), date(today.year, 12, 31)
+        else:
+            start, end = (date.fromisoformat(value) if isinstance(value, str) else value
+                          for value in temporal_range)
+        if start > end:
+            raise ValueError(f"Temporal range starts after it ends: {start} > {end}")
+
+        if granularity == 'day':
+            first = start
+        elif granularity == 'week':
+            first = start - timedelta(days=start.weekday())
+        elif granularity == 'month':
+            first = start.replace(day=1)
+        else:
+            first = date(start.year, start.month - (start.month - 1) % 3, 1)
+
+        periods = []
+        while first <= end:
+            if granularity == 'day':
+                following = first + timedelta(days=1)
+            elif granularity == 'week':
+                following = first + timedelta(days=7)
+            else:
+                months = first.month + (0 if granularity == 'month' else 2)
+                following = date(first.year + months // 12, months % 12 + 1, 1)
+            periods.append((DataProcessor.record_period(first.isoformat(), granularity),
+                            first, following - timedelta(days=1)))
+            first = following
+        return periods
+
     @staticmethod
     def _classify_data_type(record: Dict[str, Any]) -> str:
         """Classify record into data type categories."""
@@ -112,41 +293,39 @@ class DataProcessor:
             return "Email"
         
         # Domain detection
-        domain_patterns = [".com", ".org", ".net", ".gov", ".edu", ".ar", ".co.uk"]
-        if any(tld in name for tld in domain_patterns) and "@" not in name and not name.endswith(('.txt', '.csv', '.rar', '.zip')):
+        if any(tld in name for tld in _DOMAIN_PATTERNS) and "@" not in name and not name.endswith(_FILE_SUFFIXES):
             return "Dominio"
         
         # IP detection
-        import re
-        ip_pattern = r'\b\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3}\b'
-        if re.search(ip_pattern, name):
+        if _IP_IN_NAME_RE.search(name):
             return "IP"
         
         # Database/CSV files - más específico
-        if any(ext in name for ext in [".csv", ".sql", ".db", ".sqlite"]) or "database" in bucket or "db" in bucket:
+        if any(ext in name for ext in _DATABASE_EXTENSIONS) or "database" in bucket or "db" in bucket:
             return "Base de Datos"
         
         # Document types based on name extension
-        doc_extensions = [".pdf", ".doc", ".docx", ".xls", ".xlsx", ".ppt", ".pptx", ".txt"]
-        if any(ext in name for ext in doc_extensions):
+        if any(ext in name for ext in _DOC_EXTENSIONS):
             return "Documento"
         
         # Code/Source
-        code_extensions = [".py", ".js", ".php", ".html", ".css", ".java", ".cpp", ".c", ".rb", ".go"]
-        if any(ext in name for ext in code_extensions):
+        if any(ext in name for ext in _CODE_EXTENSIONS):
             return "Código"
         
         # Document types based on media
-        if isinstance(media, int):
-            doc_media_types = {15, 16, 17, 18, 19, 22, 23, 24}  # PDF, DOC, XLS, etc.
-            if media in doc_media_types:
-                return "Documento"
+        if isinstance(media, int) and media in _DOC_MEDIA_TYPES:
+            return "Documento"
         
         return "Otro"
 
     @staticmethod
-    def prepare_chart_data(analysis: Dict[str, Any]) -> Dict[str, Any]:
-        """Prepare data for chart visualization."""
+    def prepare_chart_data(analysis: Dict[str, Any], granularity: str = 'quarter',
+                           temporal_range: Optional[Tuple[Any, Any]] = None) -> Dict[str, Any]:
+        """Prepare data for chart visualization.
+
+        The temporal chart counts records per ``granularity`` period over
+        ``temporal_range`` (see temporal_periods).
+        """
         
         def top_n_with_others(counter: Counter, n: int = 5) -> Tuple[List[str], List[int]]:
             """Get top N items plus 'Others' category."""
@@ -182,8 +361,9 @@ class DataProcessor:
         # Source distribution
         source_labels, source_values = top_n_with_others(analysis["source_distribution"])
         
-        # Temporal evolution (last 5 years)
-        temporal_data = DataProcessor._prepare_temporal_data(analysis["temporal_data"])
+        # Temporal evolution (last 5 years by default)
+        temporal_data = DataProcessor._prepare_temporal_data(
+            analysis["temporal_data"], granularity, temporal_range, analysis.get("temporal_days"))
         
         return {
             "dataTypes": {"labels": data_type_labels, "values": data_type_values},
@@ -209,46 +389,39 @@ class DataProcessor:
         return str(value)
 
     @staticmethod
-    def _prepare_temporal_data(temporal_counter: Counter) -> Dict[str, Any]:
-        """Prepare temporal data for the last 5 years."""
-        from datetime import datetime, timedelta
-        
-        # Generate last 5 years by quarters (trimestres)
-        today = datetime.now()
-        periods = []
-        for year_offset in range(5):
-            year = today.year - year_offset
-            for quarter in [1, 2, 3, 4]:
-                # Q1: Jan-Mar, Q2: Apr-Jun, Q3: Jul-Sep, Q4: Oct-Dec
-                quarter_months = {
-                    1: ['01', '02', '03'],
-                    2: ['04', '05', '06'], 
-                    3: ['07', '08', '09'],
-                    4: ['10', '11', '12']
-                }
-                periods.append({
-                    'year': year,
-                    'quarter': quarter,
-                    'label': f'{year} Q{quarter}',
-                    'months': [f'{year}-{month}' for month in quarter_months[quarter]]
-                })
-        
-        periods.reverse()  # Chronological order
-        
-        # Aggregate counts by quarter
-        period_counts = []
-        period_labels = []
-        
-        for period in periods:
-            quarter_count = 0
-            for month in period['months']:
-                quarter_count += temporal_counter.get(month, 0)
-            period_counts.append(quarter_count)
-            period_labels.append(period['label'])
-        
+    def _prepare_temporal_data(temporal_counter: Counter, granularity: str = 'quarter',
+                               temporal_range: Optional[Tuple[Any, Any]] = None,
+                               daily_counter: Optional[Counter] = None) -> Dict[str, Any]:
+        """Prepare temporal data, by quarter over the last 5 years by default.
+
+        ``temporal_counter`` counts records per month ('YYYY-MM') and
+        ``daily_counter`` per day ('YYYY-MM-DD'), needed for day and week
+        granularities.
+        """
+        periods = DataProcessor.temporal_periods(granularity, temporal_range)
+
+        # Aggregate counts by period
+        source = temporal_counter if granularity in ('month', 'quarter') else (daily_counter or {})
+        period_counts = Counter()
+        for key, count in source.items():
+            period = DataProcessor.record_period(key, granularity)
+            if period is not None:
+                period_counts[period] += count
+
+        if temporal_range is None:
+            span = "Últimos 5 Años"
+        else:
+            span = f"{periods[0][1].isoformat()} a {periods[-1][2].isoformat()}"
+        if granularity != 'quarter':
+            span += f", por {_GRANULARITY_NAMES[granularity]}"
+
         return {
-            "labels": period_labels,
-            "values": period_counts
+            "labels": [label for label, _, _ in periods],
+            "values": [period_counts.get(label, 0) for label, _, _ in periods],
+            # Inclusive date range of each period, used to filter by period in the report
+            "ranges": [[first.isoformat(), last.isoformat()] for _, first, last in periods],
+            "granularity": granularity,
+            "title": f"Evolución Temporal ({span})",
         }
 
 
@@ -267,19 +440,836 @@ class VisualizationGenerator:
         return self.svg_generator.generate_charts_js(chart_data)
 
 
+# Table script around the JSON data source: _TABLE_JS_PREFIX + tableSource + _TABLE_JS_BODY
+_TABLE_JS_PREFIX = """
+        // Table data (see TableGenerator.write_table_js) and functionality
+        const tableSource = """
+_TABLE_JS_BODY = """;
+
+        function decodeDate(code, kind) {
+            if (kind === 'day') return new Date(code * 86400000).toISOString().slice(0, 10);
+            const seconds = Math.floor(code / 1000000);
+            const fraction = String(code - seconds * 1000000).padStart(6, '0').replace(/0+$/, '');
+            return new Date(seconds * 1000).toISOString().slice(0, 19) + (fraction ? '.' + fraction : '') + 'Z';
+        }
+
+        // Rebuild row objects: dictionary-coded columns index into payload.dicts
+        function decodeTablePayload(payload) {
+            const columns = payload.columns;
+            const exceptions = payload.dateExceptions;
+            const fields = Object.keys(columns)
+                .filter(name => name !== 'date')
+                .map(name => [name, columns[name], payload.dicts[name]]);
+            const rows = new Array(payload.n);
+            for (let i = 0; i < payload.n; i++) {
+                const code = columns.date[i];
+                const row = {
+                    date: code === null ? (i in exceptions ? exceptions[i] : '') : decodeDate(code, payload.dateKind)
+                };
+                for (const [name, values, dict] of fields) {
+                    row[name] = dict ? dict[values[i]] : values[i];
+                }
+                rows[i] = row;
+            }
+            return rows;
+        }
+
+        // Filtering and sorting engine. Search keys, numeric scores and date
+        // values are built once per row as data arrives and each column's sort
+        // permutation once on first use, so a query is a single pass over a
+        // permutation. The same pass re-aggregates the charts and KPI cards from
+        // the group keys of the matching rows. Self-contained: its source is
+        // also loaded into the worker.
+        function createTableEngine() {
+            const names = [];
+            const searchKeys = [];
+            const scores = [];
+            const dates = [];
+            const codes = { data_type: [], bucket: [], media_label: [] };
+            const periods = [];
+            const flags = [];
+            let dicts = null;
+            let ranks = null;
+            let groups = null;
+            let permutations = {};
+
+            function dateValue(code, kind, exception) {
+                if (code === null) return exception ? Date.parse(exception) : 0;
+                return kind === 'day' ? code * 86400000 : Math.floor(code / 1000);
+            }
+
+            function append(payload) {
+                const columns = payload.columns;
+                const lower = payload.index.dictLower;
+                dicts = payload.dicts;
+                ranks = payload.index.dictRank;
+                groups = payload.index.groups;
+                for (let i = 0; i < payload.n; i++) {
+                    const name = columns.name[i] || '';
+                    names.push(name);
+                    searchKeys.push([
+                        String(name).toLowerCase(),
+                        lower.data_type[columns.data_type[i]],
+                        lower.bucket[columns.bucket[i]],
+                        lower.media_label[columns.media_label[i]]
+                    ].join(' '));
+                    scores.push(parseInt(columns.xscore[i]) || 0);
+                    dates.push(dateValue(columns.date[i], payload.dateKind, payload.dateExceptions[i]));
+                    for (const column in codes) {
+                        codes[column].push(columns[column][i]);
+                    }
+                    periods.push(payload.groups.period[i]);
+                    flags.push(payload.groups.flags[i]);
+                }
+                permutations = {};
+            }
+
+            function sortKeys(column) {
+                if (column === 'xscore') return scores;
+                if (column === 'date') return dates.map(value => value === value ? value : -Infinity);
+                if (column in codes) return codes[column].map(code => ranks[column][code]);
+                return null;
+            }
+
+            function permutation(column) {
+                if (!permutations[column]) {
+                    const order = new Int32Array(names.length);
+                    for (let i = 0; i < order.length; i++) order[i] = i;
+                    const keys = sortKeys(column);
+                    if (keys) {
+                        order.sort((a, b) => (keys[a] - keys[b]) || (a - b));
+                    } else if (column === 'name') {
+                        order.sort((a, b) => names[a] < names[b] ? -1 : (names[a] > names[b] ? 1 : a - b));
+                    }
+                    permutations[column] = order;
+                }
+                return permutations[column];
+            }
+
+            // Matching rows in display order plus the aggregates of the charts
+            // and KPI cards. Each chart dimension (data type, source, period)
+            // ignores its own filter, so the chart still shows the alternatives
+            // to the current selection; KPIs cover the rows of the result.
+            function query(q) {
+                const order = permutation(q.column);
+                const typeCode = q.type && dicts ? dicts.data_type.indexOf(q.type) : -1;
+                const sourceCode = q.source && dicts ? dicts.bucket.indexOf(q.source) : -1;
+                const from = q.dateFrom ? Date.parse(q.dateFrom) : null;
+                // "Hasta" includes the whole day
+                const to = q.dateTo ? Date.parse(q.dateTo) + 86399999 : null;
+                const descending = q.direction === 'desc';
+                const last = order.length - 1;
+                const result = new Int32Array(order.length);
+                const typeCounts = new Int32Array(dicts ? dicts.data_type.length : 0);
+                const sourceCounts = new Int32Array(dicts ? dicts.bucket.length : 0);
+                const periodCounts = new Int32Array(groups ? groups.period.length : 0);
+                const sourceSeen = new Uint8Array(sourceCounts.length);
+                const flagCombos = new Int32Array(groups ? 1 << groups.flags.length : 1);
+                let count = 0;
+                for (let k = 0; k <= last; k++) {
+                    const i = descending ? order[last - k] : order[k];
+                    // Bit per failed filter: 1 type, 2 source, 4 date
+                    let miss = 0;
+                    if (q.type && codes.data_type[i] !== typeCode) miss |= 1;
+                    if (q.source && codes.bucket[i] !== sourceCode) miss |= 2;
+                    if ((from !== null && dates[i] < from) || (to !== null && dates[i] > to)) miss |= 4;
+                    if (miss & (miss - 1)) continue;
+                    if (q.search && !searchKeys[i].includes(q.search)) continue;
+                    const period = periods[i];
+                    if (miss === 0) {
+                        result[count++] = i;
+                        typeCounts[codes.data_type[i]]++;
+                        sourceCounts[codes.bucket[i]]++;
+                        sourceSeen[codes.bucket[i]] = 1;
+                        if (period !== null) periodCounts[period]++;
+                        flagCombos[flags[i]]++;
+                    } else if (miss === 1) {
+                        typeCounts[codes.data_type[i]]++;
+                    } else if (miss === 2) {
+                        sourceCounts[codes.bucket[i]]++;
+                    } else if (period !== null) {
+                        periodCounts[period]++;
+                    }
+                }
+                const flagCounts = {};
+                (groups ? groups.flags : []).forEach((name, bit) => {
+                    let total = 0;
+                    for (let combo = 0; combo < flagCombos.length; combo++) {
+                        if (combo & (1 << bit)) total += flagCombos[combo];
+                    }
+                    flagCounts[name] = total;
+                });
+                const aggregates = {
+                    total: count,
+                    uniqueSources: sourceSeen.reduce((sum, seen) => sum + seen, 0),
+                    flags: flagCounts,
+                    data_type: typeCounts,
+                    bucket: sourceCounts,
+                    period: periodCounts
+                };
+                return { result: result.slice(0, count), aggregates };
+            }
+
+            return { append, query };
+        }
+
+        function tableWorkerMain() {
+            const engine = createTableEngine();
+            self.onmessage = event => {
+                const message = event.data;
+                if (message.type === 'append') {
+                    engine.append(message.payload);
+                } else {
+                    const { result, aggregates } = engine.query(message.query);
+                    self.postMessage({ id: message.id, result, aggregates }, [result.buffer]);
+                }
+            };
+        }
+
+        // Runs the engine in an inline Web Worker, or on the main thread when
+        // workers are unavailable. Payloads are kept for replay into a local
+        // engine only until the worker answers its first query.
+        function createTableClient() {
+            let replay = [];
+            const pending = new Map();
+            let nextId = 0;
+            let local = null;
+            let worker = null;
+
+            function useLocalEngine(error) {
+                if (local) return;
+                if (!replay) {
+                    console.error('Error en el Web Worker de la tabla', error);
+                    return;
+                }
+                console.warn('Web Worker no disponible; filtrado en el hilo principal', error);
+                local = createTableEngine();
+                replay.forEach(payload => local.append(payload));
+                replay = null;
+                pending.forEach((entry, id) => entry.resolve(local.query(entry.query)));
+                pending.clear();
+                if (worker) worker.terminate();
+            }
+
+            try {
+                const source = createTableEngine.toString() + '\\n(' + tableWorkerMain.toString() + ')();';
+                worker = new Worker(URL.createObjectURL(new Blob([source], { type: 'text/javascript' })));
+                worker.onmessage = event => {
+                    // The worker is alive: the payloads no longer need a main-thread copy
+                    replay = null;
+                    const entry = pending.get(event.data.id);
+                    pending.delete(event.data.id);
+                    if (entry) entry.resolve(event.data);
+                };
+                worker.onerror = event => useLocalEngine(event.message);
+            } catch (error) {
+                useLocalEngine(error);
+            }
+
+            return {
+                append(payload) {
+                    if (replay) replay.push(payload);
+                    if (local) {
+                        local.append(payload);
+                    } else {
+                        worker.postMessage({ type: 'append', payload });
+                    }
+                },
+                query(q) {
+                    if (local) return Promise.resolve(local.query(q));
+                    return new Promise(resolve => {
+                        const id = nextId++;
+                        pending.set(id, { resolve, query: q });
+                        worker.postMessage({ type: 'query', id, query: q });
+                    });
+                }
+            };
+        }
+
+        // The payload is either inline (tableSource.payload) or split into
+        // deflate-compressed base64 chunks that are inflated one at a time.
+        const tableData = [];
+        const tableTotal = tableSource.payload ? tableSource.payload.n : tableSource.total;
+        // Dictionaries and group labels, shared by every chunk
+        const tableDicts = (tableSource.payload || tableSource).dicts;
+        const tableGroups = (tableSource.payload || tableSource).index.groups;
+        const tableClient = createTableClient();
+        let tableLoading = false;
+
+        function appendRows(payload) {
+            for (const row of decodeTablePayload(payload)) {
+                tableData.push(row);
+            }
+            tableClient.append(payload);
+        }
+
+        // Chunks are base64 deflate data, or plain objects in uncompressed table parts
+        async function inflateChunk(chunk) {
+            if (typeof chunk === 'string') {
+                const bytes = Uint8Array.from(atob(chunk), c => c.charCodeAt(0));
+                const stream = new Blob([bytes]).stream().pipeThrough(new DecompressionStream('deflate'));
+                chunk = JSON.parse(await new Response(stream).text());
+            }
+            return Object.assign({ dateKind: tableSource.dateKind, dicts: tableSource.dicts, index: tableSource.index }, chunk);
+        }
+
+        async function loadTableChunks(onChunk) {
+            for (let i = 0; i < tableSource.chunks.length; i++) {
+                appendRows(await inflateChunk(tableSource.chunks[i]));
+                tableSource.chunks[i] = null;
+                onChunk(i);
+            }
+        }
+
+        // Indexes into tableData of the rows to show, in display order
+        let filteredIndex = new Int32Array(0);
+        let currentSort = { column: 'date', direction: 'desc' };
+        let queryVersion = 0;
+        let searchTimer = null;
+        const SEARCH_DEBOUNCE_MS = 150;
+
+        // Virtual scrolling: only the rows inside the viewport (plus OVERSCAN
+        // above and below) exist in the DOM; spacer rows keep the scroll height.
+        const OVERSCAN = 10;
+        let rowHeight = 45;
+        let renderedRange = null;
+        let scrollScheduled = false;
+
+        function rowHtml(record, index) {
+            // Record values are leaked data: escape them in text and attributes
+            const name = String(record.name || 'N/A');
+            const bucket = String(record.bucket || 'N/A');
+            const dataType = escapeHtml(record.data_type);
+            return `<tr class="data-row${index % 2 ? ' row-alt' : ''}">
+                    <td>${escapeHtml(record.date || 'N/A')}</td>
+                    <td class="name-cell" title="${escapeHtml(name)}">${escapeHtml(truncateText(name, 40))}</td>
+                    <td><span class="badge badge-${dataType.toLowerCase().replace(/\\s+/g, '-')}">${dataType}</span></td>
+                    <td class="source-cell" title="${escapeHtml(bucket)}">${escapeHtml(truncateText(bucket, 30))}</td>
+                    <td>${escapeHtml(record.media_label || 'N/A')}</td>
+                    <td class="score-cell">
+                        <span class="score score-${getScoreClass(record.xscore)}">${escapeHtml(record.xscore || '–')}</span>
+                    </td>
+                    <td>
+                        ${record.systemid ?
+                            `<a href="https://intelx.io/?s=${escapeHtml(encodeURIComponent(record.systemid))}" target="_blank" class="btn-link">Ver</a>` :
+                            'N/A'
+                        }
+                    </td>
+                </tr>`;
+        }
+
+        function spacerHtml(height) {
+            return height > 0 ? `<tr class="spacer-row" style="height: ${height}px"><td colspan="7"></td></tr>` : '';
+        }
+
+        function renderVisibleRows(force) {
+            const viewport = document.getElementById('tableViewport');
+            const total = filteredIndex.length;
+            const first = Math.max(0, Math.floor(viewport.scrollTop / rowHeight) - OVERSCAN);
+            const visible = Math.ceil(viewport.clientHeight / rowHeight) + 2 * OVERSCAN;
+            const last = Math.min(total, first + visible);
+            if (!force && renderedRange && renderedRange[0] === first && renderedRange[1] === last) return;
+            renderedRange = [first, last];
+
+            const parts = [spacerHtml(first * rowHeight)];
+            for (let i = first; i < last; i++) {
+                parts.push(rowHtml(tableData[filteredIndex[i]], i));
+            }
+            parts.push(spacerHtml((total - last) * rowHeight));
+            const tbody = document.querySelector('#resultsTable tbody');
+            tbody.innerHTML = parts.join('');
+
+            // Calibrate the row height once real rows are laid out
+            const sample = tbody.querySelector('tr.data-row');
+            if (sample) {
+                const measured = sample.getBoundingClientRect().height;
+                if (measured > 0 && Math.abs(measured - rowHeight) > 0.5) {
+                    rowHeight = measured;
+                    renderVisibleRows(true);
+                }
+            }
+        }
+
+        function updateResultsCount() {
+            const loading = tableLoading ? ` (cargando ${tableData.length} de ${tableTotal}…)` : '';
+            document.getElementById('resultsCount').textContent = `Mostrando ${filteredIndex.length} de ${tableData.length} resultados${loading}`;
+        }
+
+        function onTableScroll() {
+            if (scrollScheduled) return;
+            scrollScheduled = true;
+            requestAnimationFrame(() => {
+                scrollScheduled = false;
+                renderVisibleRows(false);
+            });
+        }
+
+        function truncateText(text, maxLength) {
+            if (text.length <= maxLength) return text;
+            return text.substring(0, maxLength) + '...';
+        }
+
+        function getScoreClass(score) {
+            if (!score || score === '–') return 'low';
+            const numScore = parseInt(score);
+            if (numScore >= 80) return 'high';
+            if (numScore >= 50) return 'medium';
+            return 'low';
+        }
+
+        // Charts and KPI cards re-aggregated from the engine. The SVG mirrors
+        // SVGChartGenerator so redrawn charts look like the generated ones.
+        const CHART_COLORS = ['#6366f1', '#8b5cf6', '#ec4899', '#f59e0b', '#10b981',
+                              '#06b6d4', '#f97316', '#84cc16', '#ef4444', '#6b7280'];
+        const CHART_FONT = 'font-family: "Segoe UI", Arial, sans-serif;';
+
+        function escapeHtml(text) {
+            return String(text).replace(/[&<>"]/g, c => ({ '&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;' })[c]);
+        }
+
+        // Top n groups by count (ties in order of first appearance) plus "Otros"
+        function topGroups(counts, labels, n) {
+            const codes = [];
+            for (let code = 0; code < counts.length; code++) {
+                if (counts[code] > 0) codes.push(code);
+            }
+            codes.sort((a, b) => (counts[b] - counts[a]) || (a - b));
+            const items = codes.slice(0, n).map(code => ({ label: String(labels[code]), value: counts[code], filter: true }));
+            if (codes.length > n) {
+                items.push({ label: 'Otros', value: codes.slice(n).reduce((sum, code) => sum + counts[code], 0), filter: false });
+            }
+            return items;
+        }
+
+        function svgOpen(width, height, styles) {
+            return `<svg width="${width}" height="${height}" viewBox="0 0 ${width} ${height}" xmlns="http://www.w3.org/2000/svg"><style>${styles.join(' ')}</style>`;
+        }
+
+        function emptyChartSvg(title, message, width, height) {
+            return svgOpen(width, height, [
+                `.chart-title { ${CHART_FONT} font-size: 14px; font-weight: bold; fill: #1f2937; }`,
+                `.empty-message { ${CHART_FONT} font-size: 12px; fill: #6b7280; }`
+            ]) + `<rect width="${width}" height="${height}" fill="#f9fafb" stroke="#e5e7eb"/>` +
+                `<text x="${Math.floor(width / 2)}" y="30" text-anchor="middle" class="chart-title">${title}</text>` +
+                `<text x="${Math.floor(width / 2)}" y="${Math.floor(height / 2)}" text-anchor="middle" class="empty-message">${message}</text></svg>`;
+        }
+
+        // Items outside the selection are dimmed
+        function selectionOpacity(item, selected) {
+            return selected && item.label !== selected ? ' opacity="0.35"' : '';
+        }
+
+        function donutChartSvg(items, title, selected, width = 500, height = 400) {
+            const total = items.reduce((sum, item) => sum + item.value, 0);
+            if (!total) return emptyChartSvg(title, 'No hay datos disponibles', width, height);
+            const cx = Math.floor(width / 2), cy = Math.floor(height / 2);
+            const outer = Math.min(cx, cy) - 40, inner = outer * 0.6;
+            const point = (radius, angle) => `${cx + radius * Math.cos(angle * Math.PI / 180)} ${cy + radius * Math.sin(angle * Math.PI / 180)}`;
+            const parts = [svgOpen(width, height, [
+                `.chart-text { ${CHART_FONT} font-size: 11px; fill: #374151; }`,
+                `.chart-title { ${CHART_FONT} font-size: 16px; font-weight: bold; fill: #1f2937; }`,
+                `.legend-text { ${CHART_FONT} font-size: 11px; fill: #6b7280; }`,
+                '.slice:hover { opacity: 0.8; cursor: pointer; }'
+            ]), `<text x="${cx}" y="20" text-anchor="middle" class="chart-title">${title}</text>`];
+            const cols = items.length > 4 ? 1 : 2;
+            let start = -90;
+            items.forEach((item, i) => {
+                const angle = item.value / total * 360;
+                const end = start + angle;
+                const large = angle > 180 ? 1 : 0;
+                const label = escapeHtml(item.label);
+                const percentage = (item.value / total * 100).toFixed(1);
+                const color = CHART_COLORS[i % CHART_COLORS.length];
+                const filter = item.filter ? ` data-filter-value="${label}"` : '';
+                parts.push(`<path d="M ${point(outer, start)} A ${outer} ${outer} 0 ${large} 1 ${point(outer, end)} L ${point(inner, end)} A ${inner} ${inner} 0 ${large} 0 ${point(inner, start)} Z" fill="${color}" class="slice"${filter}${selectionOpacity(item, selected)}><title>${label}: ${item.value} (${percentage}%)</title></path>`);
+                const x = 20 + (i % cols) * Math.floor(width / cols);
+                const y = height - 120 + Math.floor(i / cols) * 22;
+                const shown = item.label.length > 30 ? escapeHtml(item.label.slice(0, 30)) + '...' : label;
+                parts.push(`<rect x="${x}" y="${y - 8}" width="12" height="12" fill="${color}"/>`,
+                           `<text x="${x + 18}" y="${y + 1}" class="legend-text">${shown}: ${item.value} (${percentage}%)</text>`);
+                start = end;
+            });
+            parts.push('</svg>');
+            return parts.join('');
+        }
+
+        function barChartSvg(items, title, selected, width = 500, height = 400) {
+            const max = Math.max(0, ...items.map(item => item.value));
+            if (!max) return emptyChartSvg(title, 'No hay datos disponibles', width, height);
+            const margin = 60, top = 40;
+            const chartWidth = width - 2 * margin, chartHeight = height - 2 * margin - 40;
+            const spacing = chartWidth / items.length, barWidth = spacing * 0.8;
+            const parts = [svgOpen(width, height, [
+                `.chart-text { ${CHART_FONT} font-size: 11px; fill: #374151; }`,
+                `.chart-title { ${CHART_FONT} font-size: 16px; font-weight: bold; fill: #1f2937; }`,
+                '.axis-line { stroke: #e5e7eb; stroke-width: 1; }',
+                '.bar:hover { opacity: 0.8; cursor: pointer; }'
+            ]), `<text x="${Math.floor(width / 2)}" y="25" text-anchor="middle" class="chart-title">${title}</text>`];
+            for (let i = 0; i < 6; i++) {
+                const y = top + margin + chartHeight * i / 5;
+                parts.push(`<line x1="${margin}" y1="${y}" x2="${width - margin}" y2="${y}" class="axis-line"/>`,
+                           `<text x="${margin - 10}" y="${y + 4}" text-anchor="end" class="chart-text">${Math.floor(max * (5 - i) / 5)}</text>`);
+            }
+            items.forEach((item, i) => {
+                const x = margin + i * spacing + (spacing - barWidth) / 2;
+                const barHeight = item.value / max * chartHeight;
+                const label = escapeHtml(item.label);
+                const filter = item.filter ? ` data-filter-value="${label}"` : '';
+                parts.push(`<rect x="${x}" y="${top + margin + chartHeight - barHeight}" width="${barWidth}" height="${barHeight}" fill="${CHART_COLORS[0]}" class="bar"${filter}${selectionOpacity(item, selected)}><title>${label}: ${item.value}</title></rect>`);
+                const labelX = x + barWidth / 2, labelY = top + margin + chartHeight + 20;
+                if (item.label.length > 8) {
+                    parts.push(`<text x="${labelX}" y="${labelY}" text-anchor="middle" class="chart-text" transform="rotate(-45, ${labelX}, ${labelY})">${escapeHtml(item.label.slice(0, 8))}...</text>`);
+                } else {
+                    parts.push(`<text x="${labelX}" y="${labelY}" text-anchor="middle" class="chart-text">${label}</text>`);
+                }
+            });
+            parts.push('</svg>');
+            return parts.join('');
+        }
+
+        // Indexes kept by Largest-Triangle-Three-Buckets (mirrors svg_charts.lttb_indices)
+        function lttbIndices(values, maxPoints) {
+            const count = values.length;
+            if (count <= maxPoints) return values.map((value, i) => i);
+            const every = (count - 2) / (maxPoints - 2);
+            const selected = [0];
+            let previous = 0;
+            for (let bucket = 0; bucket < maxPoints - 2; bucket++) {
+                const nextStart = Math.floor((bucket + 1) * every) + 1;
+                const nextEnd = Math.min(Math.floor((bucket + 2) * every) + 1, count);
+                const avgX = (nextStart + nextEnd - 1) / 2;
+                let avgY = 0;
+                for (let i = nextStart; i < nextEnd; i++) avgY += values[i];
+                avgY /= nextEnd - nextStart;
+                const prevY = values[previous];
+                let best = -1, bestArea = -1;
+                for (let i = Math.floor(bucket * every) + 1; i < nextStart; i++) {
+                    const area = Math.abs((previous - avgX) * (values[i] - prevY) - (previous - i) * (avgY - prevY));
+                    if (area > bestArea) {
+                        best = i;
+                        bestArea = area;
+                    }
+                }
+                selected.push(best);
+                previous = best;
+            }
+            selected.push(count - 1);
+            return selected;
+        }
+
+        function lineChartSvg(labels, values, title, selected, maxPoints, width = 1000, height = 450) {
+            if (values.length < 2) return emptyChartSvg(title, 'Datos insuficientes para gráfico de líneas', width, height);
+            const margin = 60, top = 40;
+            const chartWidth = width - 2 * margin, chartHeight = height - 2 * margin - 40;
+            const max = Math.max(...values), min = Math.min(...values);
+            const range = max !== min ? max - min : 1;
+            const step = chartWidth / (values.length - 1);
+            // The selected period stays visible even when LTTB drops it
+            const kept = lttbIndices(values, maxPoints);
+            const selectedIndex = labels.indexOf(selected);
+            if (selectedIndex >= 0 && !kept.includes(selectedIndex)) {
+                kept.push(selectedIndex);
+                kept.sort((a, b) => a - b);
+            }
+            const every = Math.max(1, Math.floor(kept.length / 8));
+            const parts = [svgOpen(width, height, [
+                `.chart-text { ${CHART_FONT} font-size: 11px; fill: #374151; }`,
+                `.chart-title { ${CHART_FONT} font-size: 16px; font-weight: bold; fill: #1f2937; }`,
+                '.axis-line { stroke: #e5e7eb; stroke-width: 1; }',
+                '.line-path { fill: none; stroke: #6366f1; stroke-width: 3; }',
+                '.point { fill: #6366f1; stroke: #ffffff; stroke-width: 2; }',
+                '.point:hover { r: 6; cursor: pointer; }',
+                '.point.selected { fill: #ec4899; }'
+            ]), `<text x="${Math.floor(width / 2)}" y="25" text-anchor="middle" class="chart-title">${title}</text>`];
+            for (let i = 0; i < 6; i++) {
+                const y = top + margin + chartHeight * i / 5;
+                parts.push(`<line x1="${margin}" y1="${y}" x2="${width - margin}" y2="${y}" class="axis-line"/>`,
+                           `<text x="${margin - 10}" y="${y + 4}" text-anchor="end" class="chart-text">${Math.trunc(max - range * i / 5)}</text>`);
+            }
+            const points = kept.map(index => [margin + index * step, top + margin + chartHeight - (values[index] - min) / range * chartHeight]);
+            points.forEach(([x, y], i) => {
+                const index = kept[i];
+                const label = escapeHtml(labels[index]);
+                const cls = labels[index] === selected ? 'point selected' : 'point';
+                parts.push(`<circle cx="${x}" cy="${y}" r="4" class="${cls}" data-filter-value="${label}"><title>${label}: ${values[index]}</title></circle>`);
+                if (i % every === 0 || i === kept.length - 1) {
+                    parts.push(`<text x="${x}" y="${top + margin + chartHeight + 20}" text-anchor="middle" class="chart-text">${escapeHtml(labels[index].slice(0, 10))}</text>`);
+                }
+            });
+            parts.push(`<path d="M ${points.map(point => point.join(' ')).join(' L ')}" class="line-path"/>`);
+            parts.push('</svg>');
+            return parts.join('');
+        }
+
+        // Inclusive date range ('YYYY-MM-DD') covered by a temporal chart period
+        function periodRange(label) {
+            return tableGroups.periodRanges[tableGroups.periods.indexOf(label)];
+        }
+
+        function selectedPeriod(q) {
+            const position = tableGroups.periodRanges.findIndex(([from, to]) => q.dateFrom === from && q.dateTo === to);
+            return position < 0 ? undefined : tableGroups.periods[position];
+        }
+
+        function updateKpis(aggregates) {
+            const total = aggregates.total;
+            const percentage = count => `${(total ? count / total * 100 : 0).toFixed(1)}%`;
+            const values = {
+                total: total.toLocaleString('en-US'),
+                unique_sources: String(aggregates.uniqueSources),
+                downloadable: String(aggregates.flags.downloadable),
+                complete_metadata: percentage(aggregates.flags.complete_metadata),
+                leak: percentage(aggregates.flags.leak),
+                public: String(aggregates.flags.public),
+                indexed: String(aggregates.flags.indexed),
+                sensitive: String(aggregates.flags.sensitive)
+            };
+            document.querySelectorAll('[data-kpi]').forEach(element => {
+                element.textContent = values[element.dataset.kpi];
+            });
+        }
+
+        // Redraw charts and KPI cards for the current filters. The generated
+        // ones stay in place while compressed chunks are still loading.
+        function updateSummary(aggregates, q) {
+            if (tableLoading) return;
+            const periodCodes = new Map(tableGroups.period.map((label, code) => [label, code]));
+            document.getElementById('chartDataTypes').innerHTML = donutChartSvg(
+                topGroups(aggregates.data_type, tableDicts.data_type, 5), 'Distribución por Tipo de Dato', q.type);
+            document.getElementById('chartSources').innerHTML = barChartSvg(
+                topGroups(aggregates.bucket, tableDicts.bucket, 5), 'Fuentes Principales', q.source);
+            document.getElementById('chartTemporal').innerHTML = lineChartSvg(
+                tableGroups.periods,
+                tableGroups.periods.map(label => periodCodes.has(label) ? aggregates.period[periodCodes.get(label)] : 0),
+                tableGroups.temporalTitle, selectedPeriod(q), tableGroups.maxPoints);
+            updateKpis(aggregates);
+        }
+
+        // Clicking a slice, bar or point toggles the matching filter
+        function onChartClick(event) {
+            const target = event.target.closest('[data-filter-value]');
+            if (!target) return;
+            const value = target.getAttribute('data-filter-value');
+            const chart = event.currentTarget.id;
+            if (chart === 'chartTemporal') {
+                const [from, to] = periodRange(value);
+                const q = currentQuery();
+                const active = q.dateFrom === from && q.dateTo === to;
+                document.getElementById('dateFromFilter').value = active ? '' : from;
+                document.getElementById('dateToFilter').value = active ? '' : to;
+            } else {
+                const select = document.getElementById(chart === 'chartDataTypes' ? 'typeFilter' : 'sourceFilter');
+                select.value = select.value === value ? '' : value;
+            }
+            applyFilters();
+        }
+
+        function currentQuery() {
+            return {
+                type: document.getElementById('typeFilter').value,
+                source: document.getElementById('sourceFilter').value,
+                dateFrom: document.getElementById('dateFromFilter').value,
+                dateTo: document.getElementById('dateToFilter').value,
+                search: document.getElementById('searchInput').value.toLowerCase(),
+                column: currentSort.column,
+                direction: currentSort.direction
+            };
+        }
+
+        // Ask the engine for the matching rows in display order; answers to
+        // superseded queries are dropped.
+        function refreshTable(keepScroll) {
+            const version = ++queryVersion;
+            const q = currentQuery();
+            return tableClient.query(q).then(response => {
+                if (version !== queryVersion) return;
+                filteredIndex = response.result;
+                if (!keepScroll) document.getElementById('tableViewport').scrollTop = 0;
+                renderVisibleRows(true);
+                updateResultsCount();
+                updateSummary(response.aggregates, q);
+            });
+        }
+
+        function applyFilters() {
+            clearTimeout(searchTimer);
+            refreshTable(false);
+        }
+
+        function scheduleSearch() {
+            clearTimeout(searchTimer);
+            searchTimer = setTimeout(applyFilters, SEARCH_DEBOUNCE_MS);
+        }
+
+        function initializeTable() {
+            document.getElementById('tableViewport').addEventListener('scroll', onTableScroll, { passive: true });
+            window.addEventListener('resize', () => renderVisibleRows(true));
+            updateResultsCount();
+
+            // Initial sort and render
+            if (tableSource.payload) {
+                appendRows(tableSource.payload);
+                tableSource.payload = null;
+                refreshTable(false);
+            } else if (typeof DecompressionStream === 'undefined' && tableSource.chunks.some(chunk => typeof chunk === 'string')) {
+                document.getElementById('resultsCount').textContent = 'Este navegador no puede descomprimir los datos del reporte';
+            } else {
+                // Chunks are ordered by date (newest first): the first one fills the first screen
+                tableLoading = true;
+                updateResultsCount();
+                loadTableChunks(index => {
+                    if (index === 0) {
+                        refreshTable(false);
+                    } else {
+                        updateResultsCount();
+                    }
+                }).then(() => {
+                    // Re-apply filters and sort over the complete data, keeping the scroll position
+                    tableLoading = false;
+                    refreshTable(true);
+                }).catch(error => {
+                    tableLoading = false;
+                    console.error('Error al descomprimir los datos del reporte', error);
+                    updateResultsCount();
+                });
+            }
+
+            // Add event listeners for filters (free-text search is debounced)
+            ['typeFilter', 'sourceFilter', 'dateFromFilter', 'dateToFilter'].forEach(id => {
+                document.getElementById(id).addEventListener('change', applyFilters);
+            });
+            document.getElementById('searchInput').addEventListener('input', scheduleSearch);
+            ['chartDataTypes', 'chartSources', 'chartTemporal'].forEach(id => {
+                document.getElementById(id).addEventListener('click', onChartClick);
+            });
+
+            // Clear filters button
+            document.getElementById('clearFilters').addEventListener('click', () => {
+                document.getElementById('typeFilter').value = '';
+                document.getElementById('sourceFilter').value = '';
+                document.getElementById('dateFromFilter').value = '';
+                document.getElementById('dateToFilter').value = '';
+                document.getElementById('searchInput').value = '';
+                applyFilters();
+            });
+
+            // Sortable headers
+            document.querySelectorAll('.sortable').forEach(header => {
+                header.addEventListener('click', () => {
+                    const column = header.dataset.column;
+                    const newDirection = (currentSort.column === column && currentSort.direction === 'asc') ? 'desc' : 'asc';
+
+                    // Update sort indicators
+                    document.querySelectorAll('.sort-icon').forEach(icon => {
+                        icon.textContent = '↕';
+                    });
+                    header.querySelector('.sort-icon').textContent = newDirection === 'asc' ? '↑' : '↓';
+
+                    currentSort = { column, direction: newDirection };
+                    applyFilters();
+                });
+            });
+        }
+
+        // Initialize table when DOM is ready
+        document.addEventListener('DOMContentLoaded', initializeTable);
+        """
+
+# Payload values serialized per chunk when streaming a report
+TABLE_CHUNK_SIZE = 5000
+
+# Array the table parts of a stateful report are pushed to (see TableGenerator.write_table_part)
+TABLE_PARTS_VAR = 'reportTableParts'
+
+# Columns of the table payload: plain values, and categorical values that are
+# dictionary-encoded (each row stores an index into payload.dicts[column])
+TABLE_PLAIN_COLUMNS = ('name', 'xscore', 'systemid')
+TABLE_DICT_COLUMNS = ('bucket', 'media_label', 'data_type')
+
+# Group keys that are not displayed: the temporal period of each row (an
+# index into index.groups.period, or null) and its KPI flags (see KPI_FLAGS)
+TABLE_GROUP_COLUMNS = ('period', 'flags')
+
+# IntelX dates: YYYY-MM-DD or YYYY-MM-DDTHH:MM:SS[.ffffff]Z without trailing zeros in the fraction
+_REPORT_DATE_RE = re.compile(r'(\d{4})-(\d\d)-(\d\d)(?:T(\d\d):(\d\d):(\d\d)(?:\.(\d{0,5}[1-9]))?Z)?\Z')
+_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+
+def _encode_table_dates(values: List[Any],
+                        kind: Optional[str] = None) -> Tuple[Optional[str], List[Optional[int]], Dict[str, Any]]:
+    """Integer-code the date column of the table payload.
+
+    Returns ``(kind, codes, exceptions)``. Unless given, the shape of the
+    first parseable value sets the kind: 'datetime' codes are microseconds
+    since the epoch, 'day' codes are days since the epoch. Empty dates are
+    coded as None and any value that would not round-trip exactly is kept
+    verbatim in ``exceptions``, keyed by row index.
+    """
+    codes: List[Optional[int]] = []
+    exceptions: Dict[str, Any] = {}
+    day_numbers: Dict[str, Optional[int]] = {}
+    for index, value in enumerate(values):
+        code = None
+        match = _REPORT_DATE_RE.match(value) if isinstance(value, str) else None
+        if match:
+            value_kind = 'datetime' if match.group(4) else 'day'
+            kind = kind or value_kind
+            day_key = value[:10]
+            if day_key not in day_numbers:
+                try:
+                    day_numbers[day_key] = date(int(match.group(1)), int(match.group(2)),
+                                                int(match.group(3))).toordinal() - _EPOCH_ORDINAL
+                except ValueError:
+                    day_numbers[day_key] = None
+            days = day_numbers[day_key]
+            if value_kind != kind or days is None:
+                pass
+            elif kind == 'day':
+                code = days
+            else:
+                hours, minutes, seconds = int(match.group(4)), int(match.group(5)), int(match.group(6))
+                if hours < 24 and minutes < 60 and seconds < 60:
+                    fraction = int((match.group(7) or '').ljust(6, '0'))
+                    code = (days * 86400 + hours * 3600 + minutes * 60 + seconds) * 1_000_000 + fraction
+        if code is None and value:
+            exceptions[str(index)] = value
+        codes.append(code)
+    return kind, codes, exceptions
+
+
+def _script_json(value: Any, **options: Any) -> str:
+    """JSON for an inline ``<script>``; "</" is escaped so no value can close the script element."""
+    return json.dumps(value, **options).replace('</', '<\\/')
+
+
+def _sort_ranks(values: List[Any]) -> List[int]:
+    """Rank of each value in ascending order, as the report script compares them."""
+    order = sorted(range(len(values)), key=lambda i: str(values[i]) if values[i] else '')
+    ranks = [0] * len(values)
+    for rank, i in enumerate(order):
+        ranks[i] = rank
+    return ranks
+
+
 class TableGenerator:
     """Generates interactive HTML tables with filtering capabilities."""
     
     @staticmethod
-    def generate_table_html(records: List[Dict[str, Any]]) -> str:
+    def generate_table_html(records: List[Dict[str, Any]],
+                            processed_records: Optional[List[Dict[str, Any]]] = None) -> str:
         """Generate interactive table HTML with filters."""
-        # Prepare records for display
-        processed_records = TableGenerator._process_records_for_table(records)
+        # Prepare records for display (reuse the report view when provided)
+        if processed_records is None:
+            processed_records = TableGenerator._process_records_for_table(records)
         
         # Get unique values for filters
-        unique_types = sorted(set(r.get('data_type', 'N/A') for r in processed_records))
-        unique_sources = sorted(set(r.get('bucket', 'N/A') for r in processed_records))
-        
+        unique_types = sorted({r.get('data_type', 'N/A') for r in processed_records})
+        unique_sources = sorted({r.get('bucket', 'N/A') for r in processed_records})
+        return TableGenerator._table_html(unique_types, unique_sources, len(processed_records))
+
+    @staticmethod
+    def _table_html(unique_types: List[str], unique_sources: List[str], total: int) -> str:
+        """Filters and table skeleton; rows are rendered client-side from tableData."""
         filters_html = f"""
         <div class="filters-container">
             <div class="filters-row">
@@ -315,14 +1305,14 @@ class TableGenerator:
                     <input type="text" id="searchInput" placeholder="Buscar en nombre, tipo o fuente...">
                 </div>
                 <div class="results-info">
-                    <span id="resultsCount">Mostrando {len(processed_records)} resultados</span>
+                    <span id="resultsCount">Mostrando {total} resultados</span>
                 </div>
             </div>
         </div>
         """
         
         table_html = """
-        <div class="table-container">
+        <div class="table-container" id="tableViewport">
             <table id="resultsTable">
                 <thead>
                     <tr>
@@ -356,186 +1346,257 @@ class TableGenerator:
         return filters_html + table_html
 
     @staticmethod
-    def generate_table_js(records: List[Dict[str, Any]]) -> str:
+    def generate_table_js(records: List[Dict[str, Any]],
+                          processed_records: Optional[List[Dict[str, Any]]] = None) -> str:
         """Generate JavaScript code for table functionality."""
-        processed_records = TableGenerator._process_records_for_table(records)
+        if processed_records is None:
+            processed_records = TableGenerator._process_records_for_table(records)
         
-        return f"""
-        // Table data and functionality
-        const tableData = {json.dumps(processed_records)};
-        let filteredData = [...tableData];
-        let currentSort = {{ column: 'date', direction: 'desc' }};
+        buffer = io.StringIO()
+        TableGenerator.write_table_js(buffer, iter(processed_records))
+        return buffer.getvalue()
 
-        function renderTable(data) {{
-            const tbody = document.querySelector('#resultsTable tbody');
-            tbody.innerHTML = '';
-            
-            data.forEach(record => {{
-                const row = document.createElement('tr');
-                row.innerHTML = `
-                    <td>${{record.date || 'N/A'}}</td>
-                    <td class="name-cell" title="${{record.name || 'N/A'}}">${{truncateText(record.name || 'N/A', 40)}}</td>
-                    <td><span class="badge badge-${{record.data_type.toLowerCase().replace(/\\s+/g, '-')}}">${{record.data_type}}</span></td>
-                    <td class="source-cell" title="${{record.bucket || 'N/A'}}">${{truncateText(record.bucket || 'N/A', 30)}}</td>
-                    <td>${{record.media_label || 'N/A'}}</td>
-                    <td class="score-cell">
-                        <span class="score score-${{getScoreClass(record.xscore)}}">${{record.xscore || '–'}}</span>
-                    </td>
-                    <td>
-                        ${{record.systemid ? 
-                            `<a href="https://intelx.io/?s=${{record.systemid}}" target="_blank" class="btn-link">Ver</a>` : 
-                            'N/A'
-                        }}
-                    </td>
-                `;
-                tbody.appendChild(row);
-            }});
-            
-            // Update results count
-            document.getElementById('resultsCount').textContent = `Mostrando ${{data.length}} de ${{tableData.length}} resultados`;
-        }}
+    @staticmethod
+    def encode_table_payload(rows: Iterable[Dict[str, Any]],
+                             temporal: Optional[Dict[str, Any]] = None,
+                             base: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Encode table rows as columns for the report script.
+
+        Categorical columns (TABLE_DICT_COLUMNS) store indexes into
+        ``dicts``, dates are integer-coded (see _encode_table_dates) and
+        only the columns the table reads are kept. ``index`` carries the
+        precomputed dictionary lookups used by the report's filter engine.
+
+        ``groups`` holds the group key of every row for the bucket, media,
+        data type (their dictionary codes) and temporal period dimensions plus
+        its KPI flags, so the report can re-aggregate charts and KPI cards
+        over any filtered set of rows. ``temporal`` is the temporal chart
+        data (see DataProcessor._prepare_temporal_data) whose periods the
+        rows were keyed by; quarters of the last 5 years by default.
+
+        With ``base`` (the table state of earlier parts, see
+        write_table_part) only ``rows`` are encoded, but with its
+        dictionaries, period codes and date kind, which are extended with the
+        new values.
+        """
+        if temporal is None:
+            temporal = DataProcessor._prepare_temporal_data(Counter())
+        if base is None:
+            base = {'dateKind': None, 'dicts': {name: [] for name in TABLE_DICT_COLUMNS}, 'periods': []}
+        columns: Dict[str, List[Any]] = {name: [] for name in ('date',) + TABLE_PLAIN_COLUMNS + TABLE_DICT_COLUMNS}
+        lookups: Dict[str, Dict[Any, int]] = {name: {value: code for code, value in enumerate(base['dicts'][name])}
+                                              for name in TABLE_DICT_COLUMNS}
+        periods: Dict[str, int] = {period: code for code, period in enumerate(base['periods'])}
+        period_codes: List[Optional[int]] = []
+        flags: List[int] = []
+        count = 0
+        for row in rows:
+            count += 1
+            columns['date'].append(row.get('date', ''))
+            for name in TABLE_PLAIN_COLUMNS:
+                columns[name].append(row.get(name))
+            for name in TABLE_DICT_COLUMNS:
+                lookup = lookups[name]
+                value = row.get(name)
+                code = lookup.get(value)
+                if code is None:
+                    code = lookup[value] = len(lookup)
+                columns[name].append(code)
+            period = row.get('period')
+            if period is None:
+                period_codes.append(None)
+            else:
+                code = periods.get(period)
+                if code is None:
+                    code = periods[period] = len(periods)
+                period_codes.append(code)
+            flags.append(row.get('flags', 0))
+        date_kind, columns['date'], date_exceptions = _encode_table_dates(columns['date'], base['dateKind'])
+        dicts = {name: list(lookup) for name, lookup in lookups.items()}
+        return {
+            'n': count,
+            'dateKind': date_kind,
+            'dateExceptions': date_exceptions,
+            'dicts': dicts,
+            'index': TableGenerator._payload_index(dicts, list(periods), temporal),
+            'columns': columns,
+            'groups': {'period': period_codes, 'flags': flags},
+        }
+
+    @staticmethod
+    def _payload_index(dicts: Dict[str, List[Any]], periods: List[str],
+                       temporal: Dict[str, Any]) -> Dict[str, Any]:
+        """Lookups of the filter engine over the dictionaries and period codes of a payload."""
+        return {
+            # Per-dictionary lookups: lowercase search text and sort rank of every entry
+            'dictLower': {name: [str(value).lower() if value else '' for value in values]
+                          for name, values in dicts.items()},
+            'dictRank': {name: _sort_ranks(values) for name, values in dicts.items()},
+            # Labels of the group keys and the periods of the temporal chart
+            'groups': {
+                'period': periods,
+                'flags': list(KPI_FLAGS),
+                'periods': temporal['labels'],
+                'periodRanges': temporal['ranges'],
+                'temporalTitle': temporal['title'],
+                'maxPoints': LINE_CHART_MAX_POINTS,
+            },
+        }
+
+    @staticmethod
+    def write_table_js(fh: IO[str], rows: Iterator[Dict[str, Any]], chunk_size: int = TABLE_CHUNK_SIZE,
+                       minify: bool = False, compress: bool = False,
+                       temporal: Optional[Dict[str, Any]] = None, include_body: bool = True):
+        """Stream the table script to ``fh``, serializing each payload column
+        ``chunk_size`` values at a time.
+
+        With ``compress`` the payload is embedded as deflate-compressed,
+        base64-encoded chunks of ``chunk_size`` rows that the browser inflates
+        progressively (see _write_compressed_chunks). ``temporal`` is passed
+        to encode_table_payload. Without ``include_body`` only the data source
+        is written; the table code is then loaded from the shared script
+        (see shared_report_assets).
+        """
+        payload = TableGenerator.encode_table_payload(rows, temporal)
+        fh.write(get_asset('interactive.table_js.prefix', minify))
+        if compress:
+            TableGenerator._write_compressed_chunks(fh, payload, TableGenerator._compress_chunks(payload, chunk_size))
+        else:
+            fh.write('{"payload": ')
+            TableGenerator._write_payload(fh, payload, chunk_size)
+            fh.write('}')
+        fh.write(get_asset('interactive.table_js.body', minify) if include_body else ';')
+
+    @staticmethod
+    def write_table_part(fh: IO[str], rows: Iterator[Dict[str, Any]], chunk_size: int = TABLE_CHUNK_SIZE,
+                         compress: bool = False, temporal: Optional[Dict[str, Any]] = None,
+                         base: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Write ``rows`` as a ``<script>`` adding one part to TABLE_PARTS_VAR.
+
+        The part holds the rows split into chunks of ``chunk_size`` rows
+        (see _split_chunks), deflate-compressed and base64-encoded with
+        ``compress``. Parts are written one after another ahead of the table
+        script (see write_table_source), so rows can be added to a report
+        by writing one more part. ``base`` is the table state of the parts
+        already written.
+
+        Returns the table state of all the parts: row count, date kind,
+        dictionaries and period codes.
+        """
+        payload = TableGenerator.encode_table_payload(rows, temporal, base)
+        fh.write(f'\n    <script>{TABLE_PARTS_VAR}.push([')
+        if compress:
+            chunks = (f'"{chunk}"' for chunk in TableGenerator._compress_chunks(payload, chunk_size))
+        else:
+            chunks = (_script_json(chunk, separators=(',', ':'))
+                      for chunk in TableGenerator._split_chunks(payload, chunk_size))
+        for position, chunk in enumerate(chunks):
+            if position:
+                fh.write(', ')
+            fh.write(chunk)
+        fh.write(']);</script>')
+        return {
+            'n': payload['n'] + (base['n'] if base else 0),
+            'dateKind': payload['dateKind'],
+            'dicts': payload['dicts'],
+            'periods': payload['index']['groups']['period'],
+        }
+
+    @staticmethod
+    def write_table_source(fh: IO[str], table: Dict[str, Any], minify: bool = False,
+                           temporal: Optional[Dict[str, Any]] = None, include_body: bool = True):
+        """Write the table script of a report whose rows are in table parts.
+
+        ``table`` is the state returned by write_table_part. The data source
+        has the shape of a compressed payload whose chunks are those of all
+        parts, the most recent part first.
+        """
+        if temporal is None:
+            temporal = DataProcessor._prepare_temporal_data(Counter())
+        header = {'total': table['n'], 'dateKind': table['dateKind'], 'dicts': table['dicts'],
+                  'index': TableGenerator._payload_index(table['dicts'], table['periods'], temporal)}
+        fh.write(get_asset('interactive.table_js.prefix', minify))
+        fh.write(_script_json(header)[:-1])
+        fh.write(f', "chunks": {TABLE_PARTS_VAR}.reduceRight((chunks, part) => chunks.concat(part), [])}}')
+        fh.write(get_asset('interactive.table_js.body', minify) if include_body else ';')
+
+    @staticmethod
+    def _write_payload(fh: IO[str], payload: Dict[str, Any], chunk_size: int):
+        """Write the payload object inline, streaming each column in chunks."""
+        streamed = {key: payload[key] for key in ('columns', 'groups')}
+        fh.write(_script_json({key: value for key, value in payload.items() if key not in streamed})[:-1])
+        for key, columns in streamed.items():
+            fh.write(f', "{key}": {{')
+            for position, (name, values) in enumerate(columns.items()):
+                if position:
+                    fh.write(', ')
+                fh.write(_script_json(name))
+                fh.write(': [')
+                for start in range(0, len(values), chunk_size):
+                    if start:
+                        fh.write(', ')
+                    fh.write(_script_json(values[start:start + chunk_size])[1:-1])
+                fh.write(']')
+            fh.write('}')
+        fh.write('}')
 
-        function truncateText(text, maxLength) {{
-            if (text.length <= maxLength) return text;
-            return text.substring(0, maxLength) + '...';
-        }}
+    @staticmethod
+    def _write_compressed_chunks(fh: IO[str], payload: Dict[str, Any], chunks: List[str]):
+        """Write the payload as ``{total, dateKind, dicts, index, chunks}``.
 
-        function getScoreClass(score) {{
-            if (!score || score === '–') return 'low';
-            const numScore = parseInt(score);
-            if (numScore >= 80) return 'high';
-            if (numScore >= 50) return 'medium';
-            return 'low';
-        }}
-
-        function sortData(column, direction) {{
-            filteredData.sort((a, b) => {{
-                let aVal = a[column] || '';
-                let bVal = b[column] || '';
-                
-                // Handle numeric values
-                if (column === 'xscore') {{
-                    aVal = parseInt(aVal) || 0;
-                    bVal = parseInt(bVal) || 0;
-                }}
-                
-                // Handle dates
-                if (column === 'date') {{
-                    aVal = new Date(aVal || '1970-01-01');
-                    bVal = new Date(bVal || '1970-01-01');
-                }}
-                
-                if (aVal < bVal) return direction === 'asc' ? -1 : 1;
-                if (aVal > bVal) return direction === 'asc' ? 1 : -1;
-                return 0;
-            }});
-        }}
-
-        function applyFilters() {{
-            const typeFilter = document.getElementById('typeFilter').value;
-            const sourceFilter = document.getElementById('sourceFilter').value;
-            const dateFromFilter = document.getElementById('dateFromFilter').value;
-            const dateToFilter = document.getElementById('dateToFilter').value;
-            const searchInput = document.getElementById('searchInput').value.toLowerCase();
-            
-            filteredData = tableData.filter(record => {{
-                // Type filter
-                if (typeFilter && record.data_type !== typeFilter) return false;
-                
-                // Source filter
-                if (sourceFilter && record.bucket !== sourceFilter) return false;
-                
-                // Date range filter
-                if (dateFromFilter || dateToFilter) {{
-                    const recordDate = new Date(record.date || '1970-01-01');
-                    if (dateFromFilter && recordDate < new Date(dateFromFilter)) return false;
-                    if (dateToFilter && recordDate > new Date(dateToFilter)) return false;
-                }}
-                
-                // Search filter
-                if (searchInput) {{
-                    const searchFields = [
-                        record.name || '',
-                        record.data_type || '',
-                        record.bucket || '',
-                        record.media_label || ''
-                    ].join(' ').toLowerCase();
-                    
-                    if (!searchFields.includes(searchInput)) return false;
-                }}
-                
-                return true;
-            }});
-            
-            // Apply current sort
-            sortData(currentSort.column, currentSort.direction);
-            renderTable(filteredData);
-        }}
+        ``chunks`` come from _compress_chunks; within one call rows are
+        ordered newest first so the first chunk alone fills the initial
+        (date-descending) view.
+        """
+        header = {'total': payload['n'], 'dateKind': payload['dateKind'],
+                  'dicts': payload['dicts'], 'index': payload['index']}
+        fh.write(_script_json(header)[:-1])
+        fh.write(', "chunks": [')
+        for position, chunk in enumerate(chunks):
+            if position:
+                fh.write(', ')
+            fh.write('"')
+            fh.write(chunk)
+            fh.write('"')
+        fh.write(']}')
 
-        function initializeTable() {{
-            // Initial sort and render
-            sortData('date', 'desc');
-            renderTable(filteredData);
-            
-            // Add event listeners for filters
-            ['typeFilter', 'sourceFilter', 'dateFromFilter', 'dateToFilter', 'searchInput'].forEach(id => {{
-                document.getElementById(id).addEventListener('change', applyFilters);
-                document.getElementById(id).addEventListener('input', applyFilters);
-            }});
-            
-            // Clear filters button
-            document.getElementById('clearFilters').addEventListener('click', () => {{
-                document.getElementById('typeFilter').value = '';
-                document.getElementById('sourceFilter').value = '';
-                document.getElementById('dateFromFilter').value = '';
-                document.getElementById('dateToFilter').value = '';
-                document.getElementById('searchInput').value = '';
-                applyFilters();
-            }});
-            
-            // Sortable headers
-            document.querySelectorAll('.sortable').forEach(header => {{
-                header.addEventListener('click', () => {{
-                    const column = header.dataset.column;
-                    const newDirection = (currentSort.column === column && currentSort.direction === 'asc') ? 'desc' : 'asc';
-                    
-                    // Update sort indicators
-                    document.querySelectorAll('.sort-icon').forEach(icon => {{
-                        icon.textContent = '↕';
-                    }});
-                    header.querySelector('.sort-icon').textContent = newDirection === 'asc' ? '↑' : '↓';
-                    
-                    currentSort = {{ column, direction: newDirection }};
-                    sortData(column, newDirection);
-                    renderTable(filteredData);
-                }});
-            }});
-        }}
+    @staticmethod
+    def _compress_chunks(payload: Dict[str, Any], chunk_size: int) -> List[str]:
+        """Chunks of _split_chunks as JSON deflated (zlib format, as read by
+        DecompressionStream('deflate')) and base64-encoded."""
+        chunks = []
+        for chunk in TableGenerator._split_chunks(payload, chunk_size):
+            data = zlib.compress(json.dumps(chunk, separators=(',', ':')).encode('utf-8'))
+            chunks.append(base64.b64encode(data).decode('ascii'))
+        return chunks
 
-        // Initialize table when DOM is ready
-        document.addEventListener('DOMContentLoaded', initializeTable);
+    @staticmethod
+    def _split_chunks(payload: Dict[str, Any], chunk_size: int) -> Iterator[Dict[str, Any]]:
+        """Split the payload rows, newest first, into chunks of ``chunk_size`` rows.
+
+        Each chunk is ``{n, dateExceptions, columns, groups}`` for its rows.
         """
+        columns = payload['columns']
+        groups = payload['groups']
+        exceptions = payload['dateExceptions']
+        dates = columns['date']
+        order = sorted(range(payload['n']),
+                       key=lambda i: dates[i] if dates[i] is not None else float('-inf'),
+                       reverse=True)
+        for start in range(0, len(order), chunk_size):
+            rows = order[start:start + chunk_size]
+            yield {
+                'n': len(rows),
+                'dateExceptions': {str(position): exceptions[str(i)]
+                                   for position, i in enumerate(rows) if str(i) in exceptions},
+                'columns': {name: [values[i] for i in rows] for name, values in columns.items()},
+                'groups': {name: [values[i] for i in rows] for name, values in groups.items()},
+            }
 
     @staticmethod
     def _process_records_for_table(records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """Process records for table display."""
-        processed = []
-        
-        for record in records:
-            processed_record = {
-                'date': record.get('date', ''),
-                'name': record.get('name', 'N/A'),
-                'bucket': record.get('bucket', 'N/A'),
-                'type': record.get('type', 'N/A'),
-                'media': record.get('media', ''),
-                'media_label': DataProcessor._media_label(record.get('media')),
-                'xscore': record.get('xscore', ''),
-                'systemid': record.get('systemid', ''),
-                'data_type': DataProcessor._classify_data_type(record)
-            }
-            processed.append(processed_record)
-        
-        return processed
+        return DataProcessor.project_records(records)
 
 
 class StyleGenerator:
@@ -792,18 +1853,34 @@ class StyleGenerator:
 
         /* Table styles */
         .table-container {
-            overflow-x: auto;
+            overflow: auto;
+            height: 70vh;
+            min-height: 320px;
             border-radius: 0.75rem;
             border: 1px solid #e5e7eb;
         }
 
         #resultsTable {
             width: 100%;
+            min-width: 900px;
             border-collapse: collapse;
+            table-layout: fixed;
             background: white;
         }
 
+        /* Fixed column widths keep the layout stable while rows are recycled */
+        #resultsTable th:nth-child(1) { width: 11%; }
+        #resultsTable th:nth-child(2) { width: 27%; }
+        #resultsTable th:nth-child(3) { width: 14%; }
+        #resultsTable th:nth-child(4) { width: 18%; }
+        #resultsTable th:nth-child(5) { width: 12%; }
+        #resultsTable th:nth-child(6) { width: 9%; }
+        #resultsTable th:nth-child(7) { width: 9%; }
+
         #resultsTable th {
+            position: sticky;
+            top: 0;
+            z-index: 1;
             background: linear-gradient(135deg, #6366f1 0%, #8b5cf6 100%);
             color: white;
             padding: 1rem 0.75rem;
@@ -833,20 +1910,28 @@ class StyleGenerator:
             padding: 0.75rem;
             border-bottom: 1px solid #f3f4f6;
             font-size: 0.875rem;
+            white-space: nowrap;
+            overflow: hidden;
+            text-overflow: ellipsis;
         }
 
-        #resultsTable tbody tr:hover {
+        #resultsTable tbody tr.data-row:hover {
             background: #f9fafb;
         }
 
-        #resultsTable tbody tr:nth-child(even) {
+        #resultsTable tbody tr.row-alt {
             background: #fafafa;
         }
 
-        #resultsTable tbody tr:nth-child(even):hover {
+        #resultsTable tbody tr.row-alt:hover {
             background: #f3f4f6;
         }
 
+        #resultsTable tbody tr.spacer-row td {
+            padding: 0;
+            border: 0;
+        }
+
         /* Table cell specific styles */
         .name-cell, .source-cell {
             max-width: 200px;
@@ -1003,95 +2088,44 @@ class StyleGenerator:
         """
 
 
-class InteractiveReportGenerator:
-    """Main class for generating interactive HTML reports."""
-    
-    def __init__(self, app_version: str = "2.0.0"):
-        self.app_version = app_version
-        self.data_processor = DataProcessor()
-        self.visualization_generator = VisualizationGenerator()
-        self.table_generator = TableGenerator()
-        self.style_generator = StyleGenerator()
-
-    def generate_report(self, 
-                       records: List[Dict[str, Any]], 
-                       output_filepath: str, 
-                       search_term: str) -> str:
-        """
-        Generate a complete interactive HTML report.
-        
-        Args:
-            records: List of search result records
-            output_filepath: Path where to save the HTML file
-            search_term: The search term used
-            
-        Returns:
-            Path to the generated HTML file
-        """
-        try:
-            # Process data
-            analysis = self.data_processor.analyze_records(records)
-            chart_data = self.data_processor.prepare_chart_data(analysis)
-            
-            # Generate HTML components
-            html_content = self._build_html_document(records, analysis, chart_data, search_term)
-            
-            # Ensure output directory exists
-            os.makedirs(os.path.dirname(output_filepath), exist_ok=True)
-            
-            # Write to file
-            with open(output_filepath, 'w', encoding='utf-8') as f:
-                f.write(html_content)
-            
-            logger.info(f"Interactive HTML report generated: {output_filepath}")
-            return output_filepath
-            
-        except Exception as e:
-            logger.error(f"Error generating interactive report: {e}")
-            raise
-
-    def _build_html_document(self, 
-                           records: List[Dict[str, Any]], 
-                           analysis: Dict[str, Any], 
-                           chart_data: Dict[str, Any], 
-                           search_term: str) -> str:
-        """Build the complete HTML document."""
-        timestamp = datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S UTC")
-        
-        # Build KPI cards
-        kpi_cards = self._build_kpi_cards(analysis)
-        
-        # Build charts section
-        charts_html = self.visualization_generator.generate_charts_html(chart_data)
-        charts_js = self.visualization_generator.generate_charts_js(chart_data)
-        
-        # Build table section
-        table_html = self.table_generator.generate_table_html(records)
-        table_js = self.table_generator.generate_table_js(records)
-        
-        # Build complete HTML
-        html = f"""<!DOCTYPE html>
+# Document shell, compiled once; the stylesheet, table and scripts are written between sections
+_DOCUMENT_HEAD = compile_template("""<!DOCTYPE html>
 <html lang="es">
 <head>
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
     <title>IntelX Report - {search_term}</title>
     <style>
-    {self.style_generator.generate_css()}
+    """)
+_DOCUMENT_STYLE_END = """
     </style>
 </head>
-<body>
+<body>"""
+# Head of the pages of a sharded report, which link the shared stylesheet
+_DOCUMENT_HEAD_SHARED = compile_template("""<!DOCTYPE html>
+<html lang="es">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>IntelX Report - {search_term}</title>
+    <link rel="stylesheet" href="{css_href}">
+</head>
+<body>""")
+# Table parts of a stateful report go between the head and the summary
+_DOCUMENT_TABLE_PARTS = f"""
+    <script>const {TABLE_PARTS_VAR} = [];</script>"""
+_DOCUMENT_SUMMARY = compile_template("""
     <div class="container">
         <!-- Header -->
         <header class="header">
             <h1>📊 IntelX Intelligence Report</h1>
             <div class="header-meta">
-                <strong>Término de búsqueda:</strong> {search_term or 'N/A'} • 
-                <strong>Resultados:</strong> {analysis['total_results']} • 
+                <strong>Término de búsqueda:</strong> {header_term} • 
+                <strong>Resultados:</strong> {total_results} • 
                 <strong>Generado:</strong> {timestamp} • 
-                <strong>Versión:</strong> {self.app_version}
+                <strong>Versión:</strong> {app_version}
             </div>
-        </header>
+        </header>{navigation}
 
         <!-- KPI Section -->
         <section class="kpi-section">
@@ -1105,7 +2139,8 @@ class InteractiveReportGenerator:
             <h2 class="section-title">📈 Análisis Visual</h2>
             {charts_html}
         </section>
-
+""")
+_DOCUMENT_TABLE = compile_template("""
         <!-- Table Section -->
         <section class="table-section">
             <h2 class="section-title">🔍 Datos Detallados</h2>
@@ -1115,7 +2150,7 @@ class InteractiveReportGenerator:
         <!-- Footer -->
         <footer class="footer">
             <p>
-                🛡️ IntelX Checker V2 • Versión {self.app_version} • 
+                🛡️ IntelX Checker V2 • Versión {app_version} • 
                 Generado el {timestamp} • 
                 Reporte interactivo standalone
             </p>
@@ -1124,36 +2159,599 @@ class InteractiveReportGenerator:
 
     <script>
     {charts_js}
-    {table_js}
+    """)
+_DOCUMENT_END = """
     </script>
 </body>
 </html>"""
+_DOCUMENT_END_SHARED = compile_template("""
+    </script>
+    <script src="{js_href}"></script>
+</body>
+</html>""")
+
+# Sharded reports (see ShardedReportGenerator): file names inside the output directory
+SHARDED_INDEX_FILE = 'index.html'
+SHARED_CSS_FILE = 'report.css'
+SHARED_JS_FILE = 'report.js'
+SHARD_PAGE_RECORDS = 50_000
+SHARD_KEYS = ('bucket', 'period')
+_SHARD_KEY_NAMES = {'bucket': 'Fuente', 'period': 'Periodo'}
+_NO_PERIOD_LABEL = 'Sin fecha'
+
+_SHARDED_CSS = """
+        /* Sharded report navigation */
+        .report-nav {
+            display: flex;
+            flex-wrap: wrap;
+            align-items: center;
+            gap: 0.75rem;
+            background: white;
+            border-radius: 1rem;
+            padding: 1rem 2rem;
+            margin-bottom: 2rem;
+            box-shadow: 0 4px 6px -1px rgba(0, 0, 0, 0.1);
+            border: 1px solid #e5e7eb;
+        }
+
+        .report-nav-title {
+            flex: 1;
+            font-weight: 600;
+            color: #374151;
+        }
+
+        .pages-table {
+            width: 100%;
+            border-collapse: collapse;
+            font-size: 0.875rem;
+        }
+
+        .pages-table th, .pages-table td {
+            padding: 0.75rem 1rem;
+            border-bottom: 1px solid #e5e7eb;
+            text-align: left;
+        }
+
+        .pages-table th {
+            background: #f8fafc;
+            font-weight: 600;
+            color: #374151;
+        }
+
+        .pages-table td:last-child {
+            display: flex;
+            flex-wrap: wrap;
+            gap: 0.25rem;
+        }
+        """
+
+_SHARDED_NAV = compile_template("""
+        <nav class="report-nav">
+            <a class="btn-link" href="{index_href}">📚 Índice</a>
+            {previous_link}
+            <span class="report-nav-title">{key_name}: {group} • Página {page} de {pages}</span>
+            {next_link}
+        </nav>""")
+_SHARDED_INDEX = compile_template("""
+        <!-- Pages Section -->
+        <section class="table-section">
+            <h2 class="section-title">📚 Páginas del Reporte</h2>
+            <table class="pages-table">
+                <thead>
+                    <tr><th>{key_name}</th><th>Registros</th><th>Páginas</th></tr>
+                </thead>
+                <tbody>
+                    {page_rows}
+                </tbody>
+            </table>
+        </section>
+
+        <!-- Footer -->
+        <footer class="footer">
+            <p>
+                🛡️ IntelX Checker V2 • Versión {app_version} • 
+                Generado el {timestamp} • 
+                Reporte interactivo en {pages} páginas
+            </p>
+        </footer>
+    </div>
+</body>
+</html>""")
+
+register_asset('interactive.css', StyleGenerator.generate_css, ASSET_CSS)
+register_asset('interactive.charts.js', lambda: SVGVisualizationGenerator().generate_charts_js({}), ASSET_JS)
+register_asset('interactive.table_js.prefix', lambda: _TABLE_JS_PREFIX, ASSET_JS)
+register_asset('interactive.table_js.body', lambda: _TABLE_JS_BODY, ASSET_JS)
+register_asset('interactive.sharded.css', lambda: _SHARDED_CSS, ASSET_CSS)
+
+
+def shared_report_assets(minify: bool = False) -> Dict[str, str]:
+    """Contents of the stylesheet and script shared by the pages of a sharded
+    report, by file name; each page then only embeds its own data."""
+    return {
+        SHARED_CSS_FILE: get_asset('interactive.css', minify) + get_asset('interactive.sharded.css', minify),
+        SHARED_JS_FILE: get_asset('interactive.charts.js', minify) + get_asset('interactive.table_js.body', minify),
+    }
+
+
+# Sidecars of a report generated with keep_state: the running totals, table
+# dictionaries and document layout (small, rewritten on every update) and the
+# record keys (appended to). The rows are in the report's table parts.
+REPORT_STATE_SUFFIX = '.state.json.gz'
+REPORT_KEYS_SUFFIX = '.keys.gz'
+REPORT_SIDECAR_SUFFIXES = (REPORT_STATE_SUFFIX, REPORT_KEYS_SUFFIX)
+REPORT_STATE_VERSION = 2
+
+
+def load_report_state(output_filepath: str) -> Optional[Dict[str, Any]]:
+    """State sidecar of a report, or None when missing or from another version."""
+    try:
+        with gzip.open(output_filepath + REPORT_STATE_SUFFIX, 'rt', encoding='utf-8') as fh:
+            state = json.load(fh)
+    except FileNotFoundError:
+        return None
+    if state.get('version') != REPORT_STATE_VERSION:
+        logger.warning(f"Ignoring report state of version {state.get('version')}: {output_filepath}")
+        return None
+    if not os.path.exists(output_filepath + REPORT_KEYS_SUFFIX):
+        logger.warning(f"Ignoring report state without its keys sidecar: {output_filepath}")
+        return None
+    return state
+
+
+def save_report_state(output_filepath: str, state: Dict[str, Any]):
+    path = output_filepath + REPORT_STATE_SUFFIX
+    tmp_path = path + '.tmp'
+    try:
+        # Fast compression and the C encoder (json.dump streams through the
+        # pure-Python one): the state is rewritten on every update
+        with gzip.open(tmp_path, 'wt', encoding='utf-8', compresslevel=1) as fh:
+            fh.write(json.dumps(state, separators=(',', ':')))
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def load_report_keys(output_filepath: str, size: int) -> set:
+    """Record keys of a report from the first ``size`` bytes of its keys sidecar.
+
+    Keys appended after the state was last saved (by an update that did
+    not complete) are dropped from the file.
+    """
+    path = output_filepath + REPORT_KEYS_SUFFIX
+    with open(path, 'r+b') as fh:
+        fh.truncate(size)
+    keys = set()
+    with gzip.open(path, 'rt', encoding='utf-8') as fh:
+        for line in fh:
+            keys.update(json.loads(line))
+    return keys
+
+
+def append_report_keys(output_filepath: str, keys: Iterable[str], new: bool = False) -> int:
+    """Add ``keys`` to the keys sidecar of a report as one more gzip member
+    holding a JSON array line.
+
+    With ``new`` the sidecar is replaced. Returns its size, which the state
+    records (see load_report_keys).
+    """
+    path = output_filepath + REPORT_KEYS_SUFFIX
+    with gzip.open(path, 'wt' if new else 'at', encoding='utf-8', compresslevel=1) as fh:
+        fh.write(json.dumps(list(keys), separators=(',', ':')))
+        fh.write('\n')
+    return os.path.getsize(path)
+
+
+@contextlib.contextmanager
+def _replacing_end(filepath: str, offset: int) -> Iterator[IO[str]]:
+    """Text stream replacing the content of ``filepath`` from byte ``offset`` on.
+
+    If the block raises, the previous content is restored.
+    """
+    with open(filepath, 'r+b') as raw:
+        raw.seek(offset)
+        previous = raw.read()
+        raw.seek(offset)
+        raw.truncate()
+        fh = io.TextIOWrapper(raw, encoding='utf-8')
+        try:
+            yield fh
+            fh.flush()
+        except BaseException:
+            try:
+                fh.flush()
+            except OSError:
+                pass
+            raw.seek(offset)
+            raw.write(previous)
+            raw.truncate()
+            raise
+        finally:
+            fh.detach()
+
+
+def _copy_range(source: str, fh: IO[str], start: int, end: int):
+    """Copy bytes ``start:end`` of the file ``source`` to the text stream ``fh``."""
+    fh.flush()
+    with open(source, 'rb') as src:
+        src.seek(start)
+        remaining = end - start
+        while remaining > 0:
+            block = src.read(min(remaining, 1 << 20))
+            if not block:
+                raise ValueError(f"Report is shorter than its recorded layout: {source}")
+            fh.buffer.write(block)
+            remaining -= len(block)
+
+
+def _iso_date_range(temporal_range: Optional[Tuple[Any, Any]]) -> Optional[List[str]]:
+    """``temporal_range`` as ISO date strings, as stored in the report state."""
+    if temporal_range is None:
+        return None
+    return [(value.date() if isinstance(value, datetime) else
+             date.fromisoformat(value) if isinstance(value, str) else value).isoformat()
+            for value in temporal_range]
+
+
+def _aggregates_to_state(aggregates: Dict[str, Any]) -> Dict[str, Any]:
+    # Counters as [key, count] pairs: keys keep their type (media and type are ints) and order
+    return {name: value if name == 'total_results' else [[key, count] for key, count in value.items()]
+            for name, value in aggregates.items()}
+
+
+def _aggregates_from_state(state: Dict[str, Any]) -> Dict[str, Any]:
+    return {name: value if name == 'total_results' else Counter(dict((key, count) for key, count in value))
+            for name, value in state.items()}
+
+
+class InteractiveReportGenerator:
+    """Main class for generating interactive HTML reports."""
+    
+    def __init__(self, app_version: str = "2.0.0", minify: bool = False, compress: bool = False,
+                 granularity: str = 'quarter', temporal_range: Optional[Tuple[Any, Any]] = None,
+                 shared_assets: bool = False, keep_state: bool = False):
+        if granularity not in TEMPORAL_GRANULARITIES:
+            raise ValueError(f"Unknown temporal granularity: {granularity}")
+        self.app_version = app_version
+        # Serve minified stylesheet and scripts (cached once per process)
+        self.minify = minify
+        # Embed the table data as compressed chunks decoded lazily by the browser
+        self.compress = compress
+        # Link SHARED_CSS_FILE / SHARED_JS_FILE instead of inlining them (sharded reports)
+        self.shared_assets = shared_assets
+        # Save the REPORT_STATE_SUFFIX sidecar that append_report() updates
+        self.keep_state = keep_state
+        # Periods of the temporal chart (see DataProcessor.temporal_periods)
+        self.granularity = granularity
+        self.temporal_range = temporal_range
+        self.data_processor = DataProcessor()
+        self.visualization_generator = VisualizationGenerator()
+        self.table_generator = TableGenerator()
+        self.style_generator = StyleGenerator()
+
+    def generate_report(self, 
+                       records: List[Dict[str, Any]], 
+                       output_filepath: str, 
+                       search_term: str,
+                       navigation: str = '',
+                       data_types: Optional[List[str]] = None,
+                       aggregates: Optional[Dict[str, Any]] = None) -> str:
+        """
+        Generate a complete interactive HTML report.
         
-        return html
+        Args:
+            records: List of search result records
+            output_filepath: Path where to save the HTML file
+            search_term: The search term used
+            navigation: Optional markup inserted below the header (links
+                between the pages of a sharded report)
+            data_types: Precomputed DataProcessor.classify_records() output
+            aggregates: Precomputed running totals of ``records`` (see
+                DataProcessor.accumulate_records); not modified
+            
+        Returns:
+            Path to the generated HTML file
+        """
+        try:
+            # Classify the records once; analysis, filters and table reuse the result
+            if data_types is None:
+                data_types = self.data_processor.classify_records(records)
+            if aggregates is None:
+                aggregates = self.data_processor.new_aggregates()
+                self.data_processor.accumulate_records(aggregates, records, data_types)
+            
+            # Ensure output directory exists
+            os.makedirs(os.path.dirname(output_filepath), exist_ok=True)
+            
+            written = self._write_report_file(output_filepath, records, data_types, aggregates, search_term,
+                                              navigation)
+            if self.keep_state:
+                table, layout = written
+                keys_size = append_report_keys(output_filepath, dict.fromkeys(record_key(r) for r in records),
+                                               new=True)
+                save_report_state(output_filepath, self._report_state(aggregates, table, layout, keys_size,
+                                                                      search_term))
+            
+            logger.info(f"Interactive HTML report generated: {output_filepath}")
+            return output_filepath
+            
+        except Exception as e:
+            logger.error(f"Error generating interactive report: {e}")
+            raise
+
+    def append_report(self,
+                      records: List[Dict[str, Any]],
+                      output_filepath: str,
+                      search_term: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Add the records not already in a report generated with ``keep_state``.
+
+        The rows of such a report are embedded as table parts ahead of the
+        summary, charts and table script (see TableGenerator.write_table_part).
+        Only the new records are classified, counted and encoded: they are
+        written as one more part, the sections after it are rewritten from
+        the running totals in the state sidecar and their keys are appended
+        to the keys sidecar (see REPORT_SIDECAR_SUFFIXES), so the cost is
+        proportional to the new data. Changing the search term, which is in
+        the document head, also copies the existing parts into a new file.
+        The options of the existing report (granularity, temporal range,
+        compression, minification) are kept; a ``temporal_range`` given to
+        this generator replaces the stored one.
+        A missing report is generated with state from ``records``.
+        
+        Args:
+            records: Search result records, possibly already in the report
+            output_filepath: Path of the HTML report
+            search_term: Search term shown in the report (defaults to the
+                one it was generated with)
+            
+        Returns:
+            Dict with ``filepath``, ``new``, ``duplicates`` and ``total`` counts
+        """
+        state = load_report_state(output_filepath)
+        if state is None:
+            if os.path.exists(output_filepath):
+                raise ValueError(f"Report has no incremental state, regenerate it with keep_state: {output_filepath}")
+            by_key: Dict[str, Dict[str, Any]] = {}
+            for r in records:
+                by_key.setdefault(record_key(r), r)
+            unique = list(by_key.values())
+            generator = self if self.keep_state else InteractiveReportGenerator(
+                self.app_version, self.minify, self.compress, self.granularity, self.temporal_range,
+                self.shared_assets, keep_state=True)
+            generator.generate_report(unique, output_filepath, search_term or '')
+            return {'filepath': output_filepath, 'new': len(unique), 'duplicates': len(records) - len(unique),
+                    'total': len(unique)}
+
+        options = state['options']
+        temporal_range = self.temporal_range
+        if temporal_range is None:
+            temporal_range = options.get('temporal_range')
+        if dict(options, temporal_range=_iso_date_range(temporal_range)) != self._state_options():
+            generator = InteractiveReportGenerator(self.app_version, options['minify'], options['compress'],
+                                                   options['granularity'], temporal_range,
+                                                   self.shared_assets, keep_state=True)
+            return generator._append_to_state(state, records, output_filepath, search_term)
+        return self._append_to_state(state, records, output_filepath, search_term)
+
+    def _append_to_state(self, state: Dict[str, Any], records: List[Dict[str, Any]],
+                         output_filepath: str, search_term: Optional[str]) -> Dict[str, Any]:
+        layout = state['layout']
+        if os.path.getsize(output_filepath) != layout['size']:
+            raise ValueError(f"Report changed since its state was saved, regenerate it with keep_state: "
+                             f"{output_filepath}")
+        seen = load_report_keys(output_filepath, state['keys_size'])
+        new_records = []
+        new_keys = []
+        for r in records:
+            key = record_key(r)
+            if key not in seen:
+                seen.add(key)
+                new_keys.append(key)
+                new_records.append(r)
+        search_term = state['search_term'] if search_term is None else search_term
+        aggregates = _aggregates_from_state(state['aggregates'])
+        result = {'filepath': output_filepath, 'new': len(new_records),
+                  'duplicates': len(records) - len(new_records),
+                  'total': aggregates['total_results'] + len(new_records)}
+        if not new_records and search_term == state['search_term']:
+            logger.info(f"No new records for interactive report: {output_filepath}")
+            return result
+
+        data_types = self.data_processor.classify_records(new_records)
+        self.data_processor.accumulate_records(aggregates, new_records, data_types)
+        analysis = self.data_processor.analysis_from_aggregates(aggregates)
+        chart_data = self.data_processor.prepare_chart_data(analysis, self.granularity, self.temporal_range)
+        rows = self.data_processor.iter_projected(new_records, data_types, self.granularity)
+        # Keys beyond the size recorded in the state are dropped unless the state is saved
+        keys_size = append_report_keys(output_filepath, new_keys)
+        if search_term == state['search_term']:
+            with _replacing_end(output_filepath, layout['tail']) as fh:
+                table, layout = self._write_table_update(fh, rows, state['table'], layout['data'],
+                                                         analysis, chart_data, search_term)
+                save_report_state(output_filepath, self._report_state(aggregates, table, layout, keys_size,
+                                                                      search_term))
+        else:
+            tmp_filepath = output_filepath + '.tmp'
+            try:
+                with open(tmp_filepath, 'w', encoding='utf-8', buffering=1 << 20) as fh:
+                    self._write_document_head(fh, search_term)
+                    fh.write(_DOCUMENT_TABLE_PARTS)
+                    data = fh.tell()
+                    _copy_range(output_filepath, fh, layout['data'], layout['tail'])
+                    table, layout = self._write_table_update(fh, rows, state['table'], data,
+                                                             analysis, chart_data, search_term)
+                os.replace(tmp_filepath, output_filepath)
+            finally:
+                if os.path.exists(tmp_filepath):
+                    os.remove(tmp_filepath)
+            save_report_state(output_filepath, self._report_state(aggregates, table, layout, keys_size,
+                                                                  search_term))
+        logger.info(f"Interactive HTML report updated: {output_filepath} "
+                    f"({len(new_records)} new records, {result['total']} total)")
+        return result
+
+    def _write_report_file(self, output_filepath: str, records: List[Dict[str, Any]], data_types: List[str],
+                           aggregates: Dict[str, Any], search_term: str,
+                           navigation: str = '') -> Optional[Tuple[Dict[str, Any], Dict[str, Any]]]:
+        """Stream the document to a temporary file, then move it into place.
+
+        Returns what _write_html_document returns.
+        """
+        analysis = self.data_processor.analysis_from_aggregates(aggregates)
+        chart_data = self.data_processor.prepare_chart_data(analysis, self.granularity, self.temporal_range)
+        tmp_filepath = output_filepath + '.tmp'
+        try:
+            with open(tmp_filepath, 'w', encoding='utf-8', buffering=1 << 20) as f:
+                written = self._write_html_document(f, records, analysis, chart_data, search_term, data_types,
+                                                    navigation)
+            os.replace(tmp_filepath, output_filepath)
+        finally:
+            if os.path.exists(tmp_filepath):
+                os.remove(tmp_filepath)
+        return written
+
+    def _state_options(self) -> Dict[str, Any]:
+        return {'granularity': self.granularity, 'compress': self.compress, 'minify': self.minify,
+                'temporal_range': _iso_date_range(self.temporal_range)}
+
+    def _report_state(self, aggregates: Dict[str, Any], table: Dict[str, Any], layout: Dict[str, int],
+                      keys_size: int, search_term: str) -> Dict[str, Any]:
+        return {
+            'version': REPORT_STATE_VERSION,
+            'options': self._state_options(),
+            'search_term': search_term,
+            'aggregates': _aggregates_to_state(aggregates),
+            'table': table,
+            'layout': layout,
+            'keys_size': keys_size,
+        }
+
+    def _build_html_document(self, 
+                           records: List[Dict[str, Any]], 
+                           analysis: Dict[str, Any], 
+                           chart_data: Dict[str, Any], 
+                           search_term: str,
+                           data_types: Optional[List[str]] = None,
+                           navigation: str = '') -> str:
+        """Build the complete HTML document in memory (see _write_html_document)."""
+        buffer = io.StringIO()
+        self._write_html_document(buffer, records, analysis, chart_data, search_term, data_types, navigation)
+        return buffer.getvalue()
+
+    def _write_html_document(self,
+                             fh: IO[str],
+                             records: List[Dict[str, Any]],
+                             analysis: Dict[str, Any],
+                             chart_data: Dict[str, Any],
+                             search_term: str,
+                             data_types: Optional[List[str]] = None,
+                             navigation: str = '') -> Optional[Tuple[Dict[str, Any], Dict[str, Any]]]:
+        """Write the complete HTML document to ``fh`` section by section.
+
+        Only one section is held in memory at a time and the table payload
+        is serialized in chunks of TABLE_CHUNK_SIZE values per column. With
+        ``keep_state`` the rows are written as the first table part instead
+        and the table state and layout are returned (see _write_table_update).
+        """
+        if data_types is None:
+            data_types = self.data_processor.classify_records(records)
+        rows = self.data_processor.iter_projected(records, data_types, self.granularity)
+        self._write_document_head(fh, search_term)
+        if self.keep_state:
+            fh.write(_DOCUMENT_TABLE_PARTS)
+            return self._write_table_update(fh, rows, None, fh.tell(), analysis, chart_data, search_term,
+                                            navigation)
+        self._write_document_tail(
+            fh, analysis, chart_data, search_term, navigation,
+            lambda out: self.table_generator.write_table_js(
+                out, rows, minify=self.minify, compress=self.compress, temporal=chart_data.get('temporal'),
+                include_body=not self.shared_assets))
+        return None
+
+    def _write_table_update(self, fh: IO[str], rows: Iterator[Dict[str, Any]], table: Optional[Dict[str, Any]],
+                            data: int, analysis: Dict[str, Any], chart_data: Dict[str, Any], search_term: str,
+                            navigation: str = '') -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """Write ``rows`` as a table part after the parts of ``table``, then the rest of the document.
+
+        Returns the table state and the layout of the document: byte offsets
+        of the first part (``data``) and of the summary after the last one
+        (``tail``), and its ``size``.
+        """
+        temporal = chart_data.get('temporal')
+        table = self.table_generator.write_table_part(fh, rows, compress=self.compress, temporal=temporal,
+                                                      base=table)
+        tail = fh.tell()
+        self._write_document_tail(
+            fh, analysis, chart_data, search_term, navigation,
+            lambda out: self.table_generator.write_table_source(out, table, minify=self.minify, temporal=temporal,
+                                                                include_body=not self.shared_assets))
+        return table, {'data': data, 'tail': tail, 'size': fh.tell()}
+
+    def _write_document_head(self, fh: IO[str], search_term: str):
+        if self.shared_assets:
+            _DOCUMENT_HEAD_SHARED.write(fh, search_term=search_term, css_href=SHARED_CSS_FILE)
+        else:
+            _DOCUMENT_HEAD.write(fh, search_term=search_term)
+            fh.write(get_asset('interactive.css', self.minify))
+            fh.write(_DOCUMENT_STYLE_END)
+
+    def _write_document_tail(self, fh: IO[str], analysis: Dict[str, Any], chart_data: Dict[str, Any],
+                             search_term: str, navigation: str, write_table: Callable[[IO[str]], None]):
+        """Write the summary, charts, table section and scripts; ``write_table`` writes the table script."""
+        timestamp = datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S UTC")
+        _DOCUMENT_SUMMARY.write(
+            fh,
+            header_term=search_term or 'N/A',
+            total_results=analysis['total_results'],
+            timestamp=timestamp,
+            app_version=self.app_version,
+            navigation=navigation,
+            kpi_cards=self._build_kpi_cards(analysis),
+            charts_html=self.visualization_generator.generate_charts_html(chart_data),
+        )
+        
+        # Table section: filter options come from the data types and sources of the analysis
+        unique_types = sorted(analysis['data_types'])
+        unique_sources = sorted(analysis['source_distribution'])
+        _DOCUMENT_TABLE.write(
+            fh,
+            table_html=self.table_generator._table_html(unique_types, unique_sources, analysis['total_results']),
+            app_version=self.app_version,
+            timestamp=timestamp,
+            charts_js='' if self.shared_assets else get_asset('interactive.charts.js', self.minify),
+        )
+        write_table(fh)
+        if self.shared_assets:
+            _DOCUMENT_END_SHARED.write(fh, js_href=SHARED_JS_FILE)
+        else:
+            fh.write(_DOCUMENT_END)
 
     def _build_kpi_cards(self, analysis: Dict[str, Any]) -> str:
         """Build KPI cards HTML."""
         kpis = analysis['kpis']
         exposure = analysis['exposure_levels']
         
+        # The key names the value the report script recomputes when filtering
         cards = [
-            ("📝 Total de Registros", f"{analysis['total_results']:,}", ""),
-            ("📊 Fuentes Únicas", f"{analysis['unique_sources']}", ""),
-            ("📄 Documentos Descargables", f"{kpis['downloadable_documents_count']}", ""),
-            ("✅ Metadatos Completos", f"{kpis['complete_metadata_percentage']:.1f}%", ""),
-            ("⚠️ Posibles Leaks", f"{kpis['leaks_percentage']:.1f}%", ""),
-            ("🌐 Exposición Pública", f"{exposure['public']}", ""),
-            ("🔍 Indexados", f"{exposure['indexed']}", ""),
-            ("🔒 Sensibles", f"{exposure['sensitive']}", "")
+            ("total", "📝 Total de Registros", f"{analysis['total_results']:,}", ""),
+            ("unique_sources", "📊 Fuentes Únicas", f"{analysis['unique_sources']}", ""),
+            ("downloadable", "📄 Documentos Descargables", f"{kpis['downloadable_documents_count']}", ""),
+            ("complete_metadata", "✅ Metadatos Completos", f"{kpis['complete_metadata_percentage']:.1f}%", ""),
+            ("leak", "⚠️ Posibles Leaks", f"{kpis['leaks_percentage']:.1f}%", ""),
+            ("public", "🌐 Exposición Pública", f"{exposure['public']}", ""),
+            ("indexed", "🔍 Indexados", f"{exposure['indexed']}", ""),
+            ("sensitive", "🔒 Sensibles", f"{exposure['sensitive']}", "")
         ]
         
         cards_html = []
-        for title, value, change in cards:
+        for key, title, value, change in cards:
             change_html = f'<div class="kpi-change {change.split()[0] if change else ""}">{change}</div>' if change else ''
             cards_html.append(f"""
                 <div class="kpi-card">
                     <div class="kpi-label">{title}</div>
-                    <div class="kpi-value">{value}</div>
+                    <div class="kpi-value" data-kpi="{key}">{value}</div>
                     {change_html}
                 </div>
             """)
@@ -1164,12 +2762,282 @@ class InteractiveReportGenerator:
 def generate_interactive_html_report(records: List[Dict[str, Any]], 
                                    output_filepath: str, 
                                    search_term: str, 
-                                   app_version: str = "2.0.0") -> str:
+                                   app_version: str = "2.0.0",
+                                   minify: bool = False,
+                                   compress: bool = False,
+                                   granularity: str = 'quarter',
+                                   temporal_range: Optional[Tuple[Any, Any]] = None,
+                                   keep_state: bool = False,
+                                   data_types: Optional[List[str]] = None,
+                                   aggregates: Optional[Dict[str, Any]] = None) -> str:
     """
     Main function to generate an interactive HTML report.
     
     This function provides a simple interface to generate a complete
-    interactive HTML report with all the requested features.
+    interactive HTML report with all the requested features. With
+    ``keep_state`` the report can later be extended with
+    append_interactive_html_report(). ``data_types`` and ``aggregates``
+    let a caller that already classified and counted the records skip
+    that work (see exports.ExportProjection).
+    """
+    generator = InteractiveReportGenerator(app_version, minify=minify, compress=compress,
+                                           granularity=granularity, temporal_range=temporal_range,
+                                           keep_state=keep_state)
+    return generator.generate_report(records, output_filepath, search_term,
+                                     data_types=data_types, aggregates=aggregates)
+
+
+def append_interactive_html_report(records: List[Dict[str, Any]],
+                                   output_filepath: str,
+                                   search_term: Optional[str] = None,
+                                   app_version: str = "2.0.0",
+                                   minify: bool = False,
+                                   compress: bool = False,
+                                   granularity: str = 'quarter',
+                                   temporal_range: Optional[Tuple[Any, Any]] = None) -> Dict[str, Any]:
+    """
+    Add new records to an interactive HTML report generated with ``keep_state``.
+
+    Only the records not yet in the report are processed (see
+    InteractiveReportGenerator.append_report); ``minify``, ``compress``
+    and ``granularity`` apply when the report does not exist yet. The
+    report keeps its temporal range unless ``temporal_range`` is given.
+    """
+    generator = InteractiveReportGenerator(app_version, minify=minify, compress=compress,
+                                           granularity=granularity, temporal_range=temporal_range,
+                                           keep_state=True)
+    return generator.append_report(records, output_filepath, search_term)
+
+
+def _write_report_page(records: List[Dict[str, Any]], output_filepath: str, search_term: str,
+                       navigation: str, options: Dict[str, Any]) -> Tuple[str, int]:
+    # Module level so it can run in a worker process
+    generator = InteractiveReportGenerator(shared_assets=True, **options)
+    return generator.generate_report(records, output_filepath, search_term, navigation), len(records)
+
+
+class ShardedReportGenerator:
+    """Multi-page interactive report for very large result sets.
+
+    Records are grouped by bucket or by temporal period and every group is
+    split into data pages of at most ``max_page_records`` records. Each data
+    page is a complete interactive report of its records (KPIs, charts,
+    filterable table) with links to the previous/next page and to an index
+    page carrying the KPIs and charts of the whole result set and the list of
+    pages. Pages are written in parallel and share one stylesheet and one
+    script (SHARED_CSS_FILE, SHARED_JS_FILE).
+    """
+
+    def __init__(self, app_version: str = "2.0.0", shard_by: str = 'bucket',
+                 max_page_records: int = SHARD_PAGE_RECORDS, max_workers: Optional[int] = None,
+                 use_processes: bool = True, minify: bool = False, compress: bool = False,
+                 granularity: str = 'quarter', temporal_range: Optional[Tuple[Any, Any]] = None):
+        if shard_by not in SHARD_KEYS:
+            raise ValueError(f"Unknown shard key: {shard_by}")
+        if max_page_records < 1:
+            raise ValueError("max_page_records must be positive")
+        self.shard_by = shard_by
+        self.max_page_records = max_page_records
+        self.max_workers = max_workers
+        # Pages are CPU bound (classification, payload encoding): processes by default
+        self.use_processes = use_processes
+        # Options of the InteractiveReportGenerator of every page
+        self.page_options = dict(app_version=app_version, minify=minify, compress=compress,
+                                 granularity=granularity, temporal_range=temporal_range)
+        self.index_generator = InteractiveReportGenerator(shared_assets=True, **self.page_options)
+
+    def generate_report(self,
+                        records: List[Dict[str, Any]],
+                        output_dir: str,
+                        search_term: str,
+                        progress_callback: Optional[Callable[[int, int], None]] = None) -> str:
+        """Write the report set to ``output_dir`` and return the index page path.
+
+        ``progress_callback`` receives ``(records_written, total_records)``
+        after each data page; an exception raised by it aborts the report.
+        """
+        os.makedirs(output_dir, exist_ok=True)
+        pages = self._plan_pages(records)
+        for name, content in shared_report_assets(self.page_options['minify']).items():
+            _write_file(os.path.join(output_dir, name), content)
+
+        written = 0
+
+        def page_done(future):
+            nonlocal written
+            written += future.result()[1]
+            if progress_callback:
+                progress_callback(written, len(records))
+
+        workers = self.max_workers or min(4, os.cpu_count() or 1)
+        executor_class = ProcessPoolExecutor if self.use_processes else ThreadPoolExecutor
+        with executor_class(max_workers=workers) as executor:
+            pending = []
+            try:
+                for position, page in enumerate(pages):
+                    pending.append(executor.submit(
+                        _write_report_page, page['records'], os.path.join(output_dir, page['file']),
+                        search_term, self._navigation(pages, position), self.page_options))
+                    # Bound the number of page subsets queued for the workers
+                    while len(pending) >= workers * 2:
+                        page_done(pending.pop(0))
+                # The index is built here while the workers write the last pages
+                index_filepath = os.path.join(output_dir, SHARDED_INDEX_FILE)
+                self._write_index(index_filepath, records, pages, search_term)
+                while pending:
+                    page_done(pending.pop(0))
+            except BaseException:
+                for future in pending:
+                    future.cancel()
+                raise
+
+        logger.info(f"Sharded interactive report generated: {index_filepath} "
+                    f"({len(records)} records in {len(pages)} pages)")
+        return index_filepath
+
+    def _group_key(self) -> Callable[[Dict[str, Any]], str]:
+        if self.shard_by == 'bucket':
+            return lambda record: str(record.get('bucket', 'N/A'))
+        granularity = self.page_options['granularity']
+        periods: Dict[Any, str] = {}
+
+        def period(record: Dict[str, Any]) -> str:
+            date_str = record.get('date')
+            day = date_str[:10] if isinstance(date_str, str) else date_str
+            if day not in periods:
+                periods[day] = DataProcessor.record_period(date_str, granularity) or _NO_PERIOD_LABEL
+            return periods[day]
+        return period
+
+    def _plan_pages(self, records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Group ``records`` and split the groups into pages.
+
+        Buckets are listed alphabetically and periods newest first, with the
+        records without a date last.
+        """
+        groups: Dict[str, List[Dict[str, Any]]] = {}
+        key = self._group_key()
+        for record in records:
+            groups.setdefault(key(record), []).append(record)
+        if self.shard_by == 'bucket':
+            labels = sorted(groups)
+        else:
+            labels = sorted((label for label in groups if label != _NO_PERIOD_LABEL), reverse=True)
+            if _NO_PERIOD_LABEL in groups:
+                labels.append(_NO_PERIOD_LABEL)
+
+        pages = []
+        for label in labels:
+            group = groups.pop(label)
+            parts = (len(group) + self.max_page_records - 1) // self.max_page_records
+            for part in range(parts):
+                start = part * self.max_page_records
+                pages.append({
+                    'file': f'page-{len(pages) + 1:04d}.html',
+                    'group': label,
+                    'part': part + 1,
+                    'parts': parts,
+                    'records': group[start:start + self.max_page_records],
+                })
+        return pages
+
+    @staticmethod
+    def _page_title(page: Dict[str, Any]) -> str:
+        group = html.escape(page['group'])
+        return f"{group} ({page['part']}/{page['parts']})" if page['parts'] > 1 else group
+
+    def _navigation(self, pages: List[Dict[str, Any]], position: int) -> str:
+        """Links of a data page to the index and its neighbouring pages."""
+        previous_page = pages[position - 1] if position else None
+        next_page = pages[position + 1] if position + 1 < len(pages) else None
+        return _SHARDED_NAV.render(
+            index_href=SHARDED_INDEX_FILE,
+            previous_link=(f'<a class="btn-link" href="{previous_page["file"]}">‹ Anterior</a>'
+                           if previous_page else ''),
+            next_link=f'<a class="btn-link" href="{next_page["file"]}">Siguiente ›</a>' if next_page else '',
+            key_name=_SHARD_KEY_NAMES[self.shard_by],
+            group=self._page_title(pages[position]),
+            page=position + 1,
+            pages=len(pages),
+        )
+
+    def _write_index(self, output_filepath: str, records: List[Dict[str, Any]],
+                     pages: List[Dict[str, Any]], search_term: str):
+        """Index page: KPIs and static charts of all records plus the page list."""
+        generator = self.index_generator
+        processor = generator.data_processor
+        analysis = processor.analyze_records(records, processor.classify_records(records))
+        chart_data = processor.prepare_chart_data(analysis, generator.granularity, generator.temporal_range)
+        timestamp = datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S UTC")
+
+        rows: Dict[str, List[Dict[str, Any]]] = {}
+        for page in pages:
+            rows.setdefault(page['group'], []).append(page)
+        page_rows = []
+        for group, group_pages in rows.items():
+            links = ' '.join(f'<a class="btn-link" href="{page["file"]}">{page["part"]}</a>'
+                             for page in group_pages)
+            count = sum(len(page['records']) for page in group_pages)
+            page_rows.append(f'<tr><td>{html.escape(group)}</td><td>{count:,}</td><td>{links}</td></tr>')
+
+        buffer = io.StringIO()
+        _DOCUMENT_HEAD_SHARED.write(buffer, search_term=search_term, css_href=SHARED_CSS_FILE)
+        _DOCUMENT_SUMMARY.write(
+            buffer,
+            header_term=search_term or 'N/A',
+            total_results=analysis['total_results'],
+            timestamp=timestamp,
+            app_version=generator.app_version,
+            navigation='',
+            kpi_cards=generator._build_kpi_cards(analysis),
+            charts_html=generator.visualization_generator.generate_charts_html(chart_data),
+        )
+        _SHARDED_INDEX.write(
+            buffer,
+            key_name=_SHARD_KEY_NAMES[self.shard_by],
+            page_rows='\n                    '.join(page_rows),
+            app_version=generator.app_version,
+            timestamp=timestamp,
+            pages=len(pages),
+        )
+        _write_file(output_filepath, buffer.getvalue())
+
+
+def _write_file(filepath: str, content: str):
+    """Write ``content`` to a temporary file, then move it into place."""
+    tmp_filepath = filepath + '.tmp'
+    try:
+        with open(tmp_filepath, 'w', encoding='utf-8') as fh:
+            fh.write(content)
+        os.replace(tmp_filepath, filepath)
+    finally:
+        if os.path.exists(tmp_filepath):
+            os.remove(tmp_filepath)
+
+
+def generate_sharded_html_report(records: List[Dict[str, Any]],
+                                 output_dir: str,
+                                 search_term: str,
+                                 app_version: str = "2.0.0",
+                                 shard_by: str = 'bucket',
+                                 max_page_records: int = SHARD_PAGE_RECORDS,
+                                 max_workers: Optional[int] = None,
+                                 use_processes: bool = True,
+                                 minify: bool = False,
+                                 compress: bool = False,
+                                 granularity: str = 'quarter',
+                                 temporal_range: Optional[Tuple[Any, Any]] = None,
+                                 progress_callback: Optional[Callable[[int, int], None]] = None) -> str:
+    """
+    Generate a multi-page interactive report in ``output_dir``.
+
+    Writes an index page (SHARDED_INDEX_FILE) with the KPIs and charts of all
+    records, one data page per ``shard_by`` group ('bucket' or temporal
+    'period' at ``granularity``) and part of at most ``max_page_records``
+    records, and the shared stylesheet and script. Returns the index path.
     """
-    generator = InteractiveReportGenerator(app_version)
-    return generator.generate_report(records, output_filepath, search_term)
+    generator = ShardedReportGenerator(app_version, shard_by=shard_by, max_page_records=max_page_records,
+                                       max_workers=max_workers, use_processes=use_processes,
+                                       minify=minify, compress=compress,
+                                       granularity=granularity, temporal_range=temporal_range)
+    return generator.generate_report(records, output_dir, search_term, progress_callback)
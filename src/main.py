@@ -38,6 +38,14 @@ if __name__ == "__main__":
                     for sid in open_previews:
                         if hasattr(app, '_on_preview_close'):
                             app._on_preview_close(sid)
+            if hasattr(app, 'search_scheduler'):
+                app.search_scheduler.shutdown()
+            if hasattr(app, 'export_jobs'):
+                app.export_jobs.shutdown()
+            if getattr(app, 'warehouse', None):
+                app.warehouse.close()
+            if hasattr(app, 'ui_bus'):
+                app.ui_bus.stop()
             app.destroy()
             logger.info("Aplicación IntelX Checker cerrada.")
         app.protocol("WM_DELETE_WINDOW", on_closing)
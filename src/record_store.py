@@ -0,0 +1,283 @@
+"""
+Módulo: record_store.py
+Registro en memoria de los resultados de una búsqueda con índices hash
+por systemid, storageid e iid del Treeview.
+
+Las búsquedas de registros (vista previa, doble clic, exportación de la
+selección) pasan a ser O(1) por elemento en lugar de recorrer toda la lista.
+"""
+import hashlib
+import json
+import logging
+import re
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Patrones precompilados para extraer direcciones IP
+_IPV4_RE = re.compile(r'\b(?:[0-9]{1,3}\.){3}[0-9]{1,3}\b')
+_IPV6_RE = re.compile(r'\b(?:[0-9a-fA-F]{1,4}:){7}[0-9a-fA-F]{1,4}\b')
+
+
+def normalize_record(record: Any, index: int) -> Dict[str, Any]:
+    """Convierte un resultado de la API en un diccionario con los campos esperados.
+
+    La API puede devolver cadenas u otros tipos; en ese caso se crea un
+    registro básico identificado como ``record_<index>``.
+    """
+    if isinstance(record, dict):
+        return record
+    if isinstance(record, str):
+        return {
+            'name': f'Resultado {index+1}',
+            'type': 1,  # Texto
+            'media': 1,  # Paste
+            'bucket': 'unknown',
+            'size': len(record),
+            'date': '',
+            'xscore': 0,
+            'systemid': f'record_{index}',
+            'data': record
+        }
+    return {
+        'name': f'Resultado {index+1}',
+        'type': 0,
+        'media': 0,
+        'bucket': 'unknown',
+        'size': 0,
+        'date': '',
+        'xscore': 0,
+        'systemid': f'record_{index}',
+        'data': str(record)
+    }
+
+
+def record_key(record: Any) -> str:
+    """Clave de deduplicación: systemid, o storageid, o hash del contenido.
+
+    Los resultados que no son diccionarios se identifican por su contenido
+    (el ``record_<n>`` de normalize_record depende de la posición).
+    """
+    if isinstance(record, dict):
+        key = record.get('systemid') or record.get('storageid')
+        if key:
+            return str(key)
+        payload = json.dumps(record, sort_keys=True, ensure_ascii=False, default=str)
+    else:
+        payload = str(record)
+    return 'sha1:' + hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+
+def extract_ip_address(record_dict: Dict[str, Any]) -> str:
+    """Extrae la primera dirección IPv4/IPv6 del nombre, los datos o el registro completo."""
+    search_fields = (
+        record_dict.get('name', ''),
+        record_dict.get('data', ''),
+    )
+    for field in search_fields:
+        if field and isinstance(field, str):
+            match = _IPV4_RE.search(field) or _IPV6_RE.search(field)
+            if match:
+                return match.group()
+    text = str(record_dict)
+    match = _IPV4_RE.search(text) or _IPV6_RE.search(text)
+    return match.group() if match else 'N/A'
+
+
+def _as_int(value: Any) -> int:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return 0
+
+
+def _ip_sort_key(ip: str) -> Tuple:
+    """Clave numérica para IPs; las ausentes ('N/A') quedan primero en orden ascendente."""
+    if ':' in ip:
+        try:
+            return (6, int(ip.replace(':', ''), 16))
+        except ValueError:
+            return (0, 0)
+    parts = ip.split('.')
+    if len(parts) == 4 and all(p.isdigit() for p in parts):
+        return (4, tuple(int(p) for p in parts))
+    return (0, 0)
+
+
+# Claves de ordenamiento tipadas por columna del Treeview. Operan sobre los
+# campos originales del registro, no sobre el texto formateado de la celda.
+SORT_KEYS: Dict[str, Callable[[Dict[str, Any]], Any]] = {
+    'date': lambda r: str(r.get('date') or ''),
+    'name': lambda r: str(r.get('name') or '').lower(),
+    'ip': lambda r: _ip_sort_key(extract_ip_address(r)),
+    'type': lambda r: _as_int(r.get('type')),
+    'media': lambda r: _as_int(r.get('media')),
+    'bucket': lambda r: str(r.get('bucketh') or r.get('bucket') or '').lower(),
+    'size': lambda r: _as_int(r.get('size')),
+    'score': lambda r: _as_int(r.get('xscore')),
+    'systemid': lambda r: str(r.get('systemid') or r.get('storageid') or ''),
+}
+
+
+class RecordRegistry:
+    """Almacena registros normalizados y mantiene índices hash al ingerirlos."""
+
+    def __init__(self, records: Optional[Iterable[Any]] = None):
+        self._records: List[Dict[str, Any]] = []
+        self._iids: List[str] = []
+        self._by_iid: Dict[str, Dict[str, Any]] = {}
+        self._by_systemid: Dict[str, str] = {}
+        self._by_storageid: Dict[str, str] = {}
+        # Se incrementa en cada cambio; permite invalidar cachés derivadas
+        self.version = 0
+        # Cachés de ordenamiento: claves tipadas y permutaciones por columna
+        self._sort_cache_version = -1
+        self._sort_keys: Dict[str, List[Any]] = {}
+        self._permutations: Dict[Tuple[Tuple[str, bool], ...], List[int]] = {}
+        if records:
+            self.extend(records)
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        return iter(self._records)
+
+    def __contains__(self, record_id: Any) -> bool:
+        return self.iid_for(record_id) is not None
+
+    @property
+    def records(self) -> List[Dict[str, Any]]:
+        """Lista de registros normalizados en orden de ingesta."""
+        return self._records
+
+    def clear(self):
+        self._records = []
+        self._iids = []
+        self._by_iid = {}
+        self._by_systemid = {}
+        self._by_storageid = {}
+        self.version += 1
+
+    def add(self, record: Any) -> Tuple[str, Dict[str, Any]]:
+        """Ingresa un registro y devuelve ``(iid, registro_normalizado)``."""
+        index = len(self._records)
+        record_dict = normalize_record(record, index)
+        iid = f"r{index}"
+
+        self._records.append(record_dict)
+        self._iids.append(iid)
+        self._by_iid[iid] = record_dict
+
+        system_id = record_dict.get('systemid')
+        if system_id not in (None, ''):
+            self._by_systemid.setdefault(str(system_id), iid)
+        storage_id = record_dict.get('storageid')
+        if storage_id not in (None, ''):
+            self._by_storageid.setdefault(str(storage_id), iid)
+
+        self.version += 1
+        return iid, record_dict
+
+    def extend(self, records: Iterable[Any]) -> List[Tuple[str, Dict[str, Any]]]:
+        """Ingresa varios registros; devuelve los pares ``(iid, registro)`` agregados."""
+        return [self.add(r) for r in records]
+
+    def items(self) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """Itera pares ``(iid, registro)`` en orden de ingesta."""
+        return zip(self._iids, self._records)
+
+    def iid_for(self, record_id: Any) -> Optional[str]:
+        """Devuelve el iid asociado a un systemid, storageid o iid."""
+        if record_id is None:
+            return None
+        key = str(record_id)
+        if key in self._by_iid:
+            return key
+        return self._by_systemid.get(key) or self._by_storageid.get(key)
+
+    def get(self, record_id: Any) -> Optional[Dict[str, Any]]:
+        """Busca un registro por systemid, storageid o iid del Treeview."""
+        iid = self.iid_for(record_id)
+        return self._by_iid.get(iid) if iid else None
+
+    def by_iid(self, iid: str) -> Optional[Dict[str, Any]]:
+        return self._by_iid.get(iid)
+
+    def select(self, ids: Iterable[Any], id_field: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Devuelve los registros correspondientes a ``ids`` sin recorrer todo el registro.
+
+        Con ``id_field`` ('systemid', 'storageid' o 'iid') sólo se consulta ese
+        índice; sin él se acepta cualquiera de los tres. El coste es
+        proporcional al tamaño de la selección. Se conserva el orden de ``ids``
+        y se omiten duplicados y ids desconocidos.
+        """
+        index = {
+            'systemid': self._by_systemid,
+            'storageid': self._by_storageid,
+        }.get(id_field)
+
+        selected = []
+        seen = set()
+        for record_id in ids:
+            key = str(record_id)
+            if id_field == 'iid':
+                iid = key if key in self._by_iid else None
+            elif index is not None:
+                iid = index.get(key)
+            else:
+                iid = self.iid_for(key)
+            if iid is None or iid in seen:
+                continue
+            seen.add(iid)
+            selected.append(self._by_iid[iid])
+        return selected
+
+    # --- Ordenamiento ---
+    def _check_sort_cache(self):
+        if self._sort_cache_version != self.version:
+            self._sort_keys = {}
+            self._permutations = {}
+            self._sort_cache_version = self.version
+
+    def sort_keys(self, column: str) -> List[Any]:
+        """Claves tipadas de ``column`` para cada registro (calculadas una sola vez)."""
+        self._check_sort_cache()
+        keys = self._sort_keys.get(column)
+        if keys is None:
+            key_func = SORT_KEYS.get(column)
+            if key_func is None:
+                raise KeyError(f"Columna de ordenamiento desconocida: {column}")
+            keys = [key_func(r) for r in self._records]
+            self._sort_keys[column] = keys
+        return keys
+
+    def _permutation(self, spec: Tuple[Tuple[str, bool], ...]) -> List[int]:
+        self._check_sort_cache()
+        perm = self._permutations.get(spec)
+        if perm is not None:
+            return perm
+
+        if len(spec) == 1:
+            column, reverse = spec[0]
+            # Se reutilizan las claves tipadas; no se invierte la permutación
+            # opuesta, que cambiaría el orden de los empates (sort estable)
+            keys = self.sort_keys(column)
+            perm = sorted(range(len(keys)), key=keys.__getitem__, reverse=reverse)
+        else:
+            # Orden estable multi-columna: se ordena desde la clave menos significativa
+            perm = list(range(len(self._records)))
+            for column, reverse in reversed(spec):
+                keys = self.sort_keys(column)
+                perm.sort(key=keys.__getitem__, reverse=reverse)
+
+        self._permutations[spec] = perm
+        return perm
+
+    def sorted_iids(self, spec: Sequence[Tuple[str, bool]]) -> List[str]:
+        """iids ordenados según ``spec``: lista de ``(columna, descendente)`` por prioridad."""
+        spec = tuple((column, bool(reverse)) for column, reverse in spec)
+        if not spec:
+            return list(self._iids)
+        iids = self._iids
+        return [iids[i] for i in self._permutation(spec)]
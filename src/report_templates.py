@@ -0,0 +1,129 @@
+"""
+Report template layer shared by the HTML report generators.
+
+Static parts of a report (stylesheets, scripts) are registered once as named
+assets and built at most once per process, optionally minified. Document
+shells are compiled once into literal segments and named placeholders, so
+rendering a report only interpolates its dynamic values. Generating hundreds
+of per-term reports therefore does not rebuild identical strings each time.
+
+Templates use ``str.format`` syntax: ``{name}`` or ``{name:spec}`` for a
+value and ``{{``/``}}`` for a literal brace.
+"""
+
+import functools
+import re
+import string
+from typing import IO, Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+# Asset kinds and their minifiers
+ASSET_CSS = "css"
+ASSET_JS = "js"
+ASSET_HTML = "html"
+
+_ASSETS: Dict[str, Tuple[Callable[[], str], str]] = {}
+
+_CSS_COMMENT_RE = re.compile(r'/\*.*?\*/', re.S)
+_CSS_SPACE_RE = re.compile(r'\s+')
+_CSS_PUNCT_RE = re.compile(r'\s*([{};,>])\s*|(?<=:)\s+')
+
+
+def minify_css(css: str) -> str:
+    """Drop comments and redundant whitespace from a stylesheet."""
+    css = _CSS_COMMENT_RE.sub('', css)
+    css = _CSS_SPACE_RE.sub(' ', css)
+    css = _CSS_PUNCT_RE.sub(r'\1', css)
+    return css.replace(';}', '}').strip()
+
+
+def minify_js(js: str) -> str:
+    """Conservatively shrink a script: strip indentation, blank lines and
+    whole-line ``//`` comments.
+
+    Line breaks are kept so automatic semicolon insertion is unaffected, and
+    lines inside multi-line template literals are left untouched.
+    """
+    out: List[str] = []
+    in_template = False
+    for line in js.splitlines():
+        if in_template:
+            out.append(line)
+        else:
+            stripped = line.strip()
+            if stripped and not stripped.startswith('//'):
+                out.append(stripped)
+        if (line.count('`') - line.count('\\`')) % 2:
+            in_template = not in_template
+    return '\n'.join(out)
+
+
+def minify_html(html: str) -> str:
+    """Strip indentation and blank lines from static markup."""
+    return '\n'.join(line.strip() for line in html.splitlines() if line.strip())
+
+
+_MINIFIERS: Dict[str, Callable[[str], str]] = {
+    ASSET_CSS: minify_css,
+    ASSET_JS: minify_js,
+    ASSET_HTML: minify_html,
+}
+
+
+def register_asset(name: str, builder: Callable[[], str], kind: str) -> None:
+    """Register a static asset; ``builder`` is called at most once per process."""
+    if kind not in _MINIFIERS:
+        raise ValueError(f"Unknown asset kind: {kind}")
+    _ASSETS[name] = (builder, kind)
+    get_asset.cache_clear()
+
+
+@functools.lru_cache(maxsize=None)
+def get_asset(name: str, minify: bool = False) -> str:
+    """Return the cached text of a registered asset, optionally minified."""
+    try:
+        builder, kind = _ASSETS[name]
+    except KeyError:
+        raise KeyError(f"Unknown report asset: {name}") from None
+    if minify:
+        return _MINIFIERS[kind](get_asset(name))
+    return builder()
+
+
+class ReportTemplate:
+    """A document fragment compiled once into literals and named placeholders."""
+
+    _formatter = string.Formatter()
+
+    def __init__(self, source: str):
+        self._parts: List[Tuple[str, Optional[str], str, Optional[str]]] = []
+        for literal, field, spec, conversion in self._formatter.parse(source):
+            if field is not None and not field.isidentifier():
+                raise ValueError(f"Template placeholders must be plain names: {{{field}}}")
+            self._parts.append((literal, field, spec or '', conversion))
+        self.fields = frozenset(field for _, field, _, _ in self._parts if field)
+
+    def _iter(self, values: Dict[str, Any]) -> Iterator[str]:
+        for literal, field, spec, conversion in self._parts:
+            if literal:
+                yield literal
+            if field is None:
+                continue
+            value = values[field]
+            if conversion:
+                value = self._formatter.convert_field(value, conversion)
+            yield value if (not spec and type(value) is str) else format(value, spec)
+
+    def render(self, **values: Any) -> str:
+        """Interpolate ``values`` into the template."""
+        return ''.join(self._iter(values))
+
+    def write(self, fh: IO[str], **values: Any) -> None:
+        """Stream the rendered template to ``fh``."""
+        for piece in self._iter(values):
+            fh.write(piece)
+
+
+@functools.lru_cache(maxsize=None)
+def compile_template(source: str) -> ReportTemplate:
+    """Compile ``source`` once; identical sources share the compiled template."""
+    return ReportTemplate(source)
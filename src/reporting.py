@@ -2,16 +2,13 @@
 import json
 import logging
 from analysis import clean_data_for_mandiant_report, prepare_mandiant_chart_data
+from report_templates import compile_template
 
 logger = logging.getLogger(__name__)
 
 
-def generate_modern_html_content(search_term, analysis, timestamp, data, helpers=None):
-    # keep compatibility with previous signatures
-    clean_data = clean_data_for_mandiant_report(data)
-    chart_data = prepare_mandiant_chart_data(clean_data, analysis)
-
-    html = f"""<!doctype html>
+# Modern report shell, compiled once per process
+_MODERN_REPORT = compile_template("""<!doctype html>
 <html lang="en">
 <head>
   <meta charset="utf-8">
@@ -29,23 +26,23 @@ def generate_modern_html_content(search_term, analysis, timestamp, data, helpers
 <body>
   <h1>IntelX Intelligence Report</h1>
   <div class="card kpi">
-    <div>Total Records: {analysis.get('total_records', 0)}</div>
-    <div>Sources: {len(analysis.get('source_distribution', {}))}</div>
+    <div>Total Records: {total_records}</div>
+    <div>Sources: {source_count}</div>
   </div>
   <div class="card">
     <h2>Executive Summary</h2>
-    {generate_executive_summary_html(analysis)}
+    {executive_summary}
   </div>
   <div class="card">
     <h2>Indicators of Compromise (sample)</h2>
-    {generate_iocs_html(analysis.get('iocs', {}))}
+    {iocs_html}
   </div>
   <div class="card">
     <h2>Data (first 100)</h2>
-    {generate_data_table_html(data[:100])}
+    {data_table}
   </div>
   <script>
-    const chartData = {json.dumps(chart_data)};
+    const chartData = {chart_data_json};
     // simple pie if sources exist
         if (chartData.sources && Object.keys(chartData.sources).length>0) {{
             const data = [{{ values: Object.values(chartData.sources), labels: Object.keys(chartData.sources), type:'pie' }}];
@@ -53,8 +50,23 @@ def generate_modern_html_content(search_term, analysis, timestamp, data, helpers
         }}
   </script>
 </body>
-</html>"""
-    return html
+</html>""")
+
+
+def generate_modern_html_content(search_term, analysis, timestamp, data, helpers=None):
+    # keep compatibility with previous signatures
+    clean_data = clean_data_for_mandiant_report(data)
+    chart_data = prepare_mandiant_chart_data(clean_data, analysis)
+
+    return _MODERN_REPORT.render(
+        search_term=search_term,
+        total_records=analysis.get('total_records', 0),
+        source_count=len(analysis.get('source_distribution', {})),
+        executive_summary=generate_executive_summary_html(analysis),
+        iocs_html=generate_iocs_html(analysis.get('iocs', {})),
+        data_table=generate_data_table_html(data[:100]),
+        chart_data_json=json.dumps(chart_data),
+    )
 
 
 def generate_executive_summary_html(analysis):
@@ -0,0 +1,115 @@
+"""
+Módulo: search_session.py
+Sesiones de búsqueda independientes y planificador compartido
+
+Cada búsqueda vive en su propia ``SearchSession`` (registro de resultados,
+estado de filtro y orden, evento de cancelación). Las sesiones se ejecutan en
+un pool acotado que respeta el límite global de peticiones a la API, de modo
+que un analista puede lanzar varias búsquedas y revisarlas en paralelo.
+"""
+import itertools
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from api import DEFAULT_RATE_LIMITER, RateLimiter
+from record_store import RecordRegistry
+
+logger = logging.getLogger(__name__)
+
+# Búsquedas simultáneas máximas contra la API
+MAX_CONCURRENT_SEARCHES: int = 3
+
+# Estados de una sesión
+SESSION_IDLE = "idle"
+SESSION_QUEUED = "queued"
+SESSION_RUNNING = "running"
+SESSION_DONE = "done"
+SESSION_CANCELLED = "cancelled"
+SESSION_ERROR = "error"
+
+
+class SearchSession:
+    """Estado de una búsqueda: resultados, filtro, orden y cancelación propios."""
+
+    _ids = itertools.count(1)
+
+    def __init__(self, term: str = ""):
+        self.id = next(SearchSession._ids)
+        self.term = term
+        self.records: List[Any] = []
+        self.registry = RecordRegistry()
+        self.filter_text = ""
+        self.sort_spec: List[Tuple[str, bool]] = []
+        self.cancel_event = threading.Event()
+        self.status = SESSION_IDLE
+        self.error: Optional[str] = None
+        self.future = None
+        # Último valor publicado de cada widget (status, progress, progress_text)
+        self.ui_state: Dict[str, Any] = {}
+        # Widgets asociados por la GUI (pestaña y Treeview)
+        self.tab_name: Optional[str] = None
+        self.tree = None
+
+    @property
+    def running(self) -> bool:
+        return self.status in (SESSION_QUEUED, SESSION_RUNNING)
+
+    def cancel(self):
+        self.cancel_event.set()
+        if self.future is not None and self.future.cancel():
+            self.status = SESSION_CANCELLED
+
+
+class SearchScheduler:
+    """Ejecuta sesiones en un pool acotado que respeta el límite de peticiones."""
+
+    def __init__(self, max_workers: int = MAX_CONCURRENT_SEARCHES,
+                 rate_limiter: Optional[RateLimiter] = None):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="search")
+        self.rate_limiter = rate_limiter or DEFAULT_RATE_LIMITER
+
+    def submit(self, session: SearchSession, worker: Callable[[SearchSession], None],
+               on_done: Optional[Callable[[SearchSession], None]] = None):
+        """Encola ``worker(session)``.
+
+        El worker debe pasar ``self.rate_limiter`` a ``check_intelx`` para que
+        cada petición HTTP de todas las sesiones espere su turno.
+
+        ``on_done`` se invoca (desde un hilo de trabajo) al terminar la sesión,
+        incluso si se canceló antes de empezar.
+        """
+        session.status = SESSION_QUEUED
+        session.future = self._executor.submit(self._run, session, worker)
+        if on_done is not None:
+            session.future.add_done_callback(lambda _future: self._finish(session, on_done))
+        return session.future
+
+    def _run(self, session: SearchSession, worker: Callable[[SearchSession], None]):
+        if session.cancel_event.is_set():
+            session.status = SESSION_CANCELLED
+            return
+        session.status = SESSION_RUNNING
+        try:
+            worker(session)
+        except Exception as e:
+            logger.exception(f"Error en la sesión de búsqueda #{session.id}")
+            session.error = str(e)
+            session.status = SESSION_ERROR
+            return
+        if session.status == SESSION_RUNNING:
+            session.status = SESSION_CANCELLED if session.cancel_event.is_set() else SESSION_DONE
+
+    @staticmethod
+    def _finish(session: SearchSession, on_done: Callable[[SearchSession], None]):
+        if session.running:
+            # Cancelada mientras estaba en cola
+            session.status = SESSION_CANCELLED
+        try:
+            on_done(session)
+        except Exception:
+            logger.exception("Error notificando fin de búsqueda")
+
+    def shutdown(self, wait: bool = False):
+        self._executor.shutdown(wait=wait, cancel_futures=True)
@@ -1,320 +1,452 @@
 """
 SVG Chart Generator - Generador de gráficos SVG puros sin dependencias JavaScript
+
+El renderizado no tiene estado: el tamaño de cada gráfico es un parámetro y
+el SVG resultante se memoiza por (tipo, título, etiquetas, valores, tamaño,
+colores), de modo que varios reportes generados en paralelo o en lote
+comparten los gráficos idénticos sin interferir entre sí.
 """
 
+import functools
 import math
-from typing import List, Dict, Any, Tuple
+from typing import List, Dict, Any, Optional, Sequence, Tuple
 import json
 
+# Gráficos renderizados que se conservan en memoria (ver _render_chart)
+CHART_CACHE_SIZE = 256
 
-class SVGChartGenerator:
-    """Generador de gráficos SVG puros sin dependencias externas."""
-    
-    def __init__(self, width: int = 500, height: int = 400):
-        self.width = width
-        self.height = height
-        self.colors = [
-            '#6366f1', '#8b5cf6', '#ec4899', '#f59e0b', '#10b981',
-            '#06b6d4', '#f97316', '#84cc16', '#ef4444', '#6b7280'
-        ]
-    
-    def create_donut_chart(self, labels: List[str], values: List[int], title: str = "") -> str:
-        """Crea un gráfico de donut en SVG."""
-        if not values or sum(values) == 0:
-            return self._create_empty_chart(title, "No hay datos disponibles")
-        
-        total = sum(values)
-        cx, cy = self.width // 2, self.height // 2
-        outer_radius = min(cx, cy) - 40
-        inner_radius = outer_radius * 0.6
-        
-        svg_parts = [
-            f'<svg width="{self.width}" height="{self.height}" viewBox="0 0 {self.width} {self.height}" xmlns="http://www.w3.org/2000/svg">',
-            '<style>',
-            '.chart-text { font-family: "Segoe UI", Arial, sans-serif; font-size: 11px; fill: #374151; }',
-            '.chart-title { font-family: "Segoe UI", Arial, sans-serif; font-size: 16px; font-weight: bold; fill: #1f2937; }',
-            '.legend-text { font-family: "Segoe UI", Arial, sans-serif; font-size: 11px; fill: #6b7280; }',
-            '.slice:hover { opacity: 0.8; cursor: pointer; }',
-            '</style>'
-        ]
-        
-        if title:
-            svg_parts.append(f'<text x="{self.width//2}" y="20" text-anchor="middle" class="chart-title">{title}</text>')
-        
-        # Crear segmentos del donut
-        start_angle = -90  # Empezar desde arriba
-        for i, (label, value) in enumerate(zip(labels, values)):
-            if value <= 0:
-                continue
-                
-            angle = (value / total) * 360
-            end_angle = start_angle + angle
-            
-            # Calcular coordenadas del arco
-            large_arc = 1 if angle > 180 else 0
-            
-            # Puntos del arco exterior
-            x1_outer = cx + outer_radius * math.cos(math.radians(start_angle))
-            y1_outer = cy + outer_radius * math.sin(math.radians(start_angle))
-            x2_outer = cx + outer_radius * math.cos(math.radians(end_angle))
-            y2_outer = cy + outer_radius * math.sin(math.radians(end_angle))
-            
-            # Puntos del arco interior
-            x1_inner = cx + inner_radius * math.cos(math.radians(start_angle))
-            y1_inner = cy + inner_radius * math.sin(math.radians(start_angle))
-            x2_inner = cx + inner_radius * math.cos(math.radians(end_angle))
-            y2_inner = cy + inner_radius * math.sin(math.radians(end_angle))
-            
-            # Path del segmento
-            path = f"""M {x1_outer} {y1_outer}
+# Puntos como máximo en un gráfico de líneas; las series más largas se
+# reducen con lttb_indices
+LINE_CHART_MAX_POINTS = 200
+
+DEFAULT_COLORS = (
+    '#6366f1', '#8b5cf6', '#ec4899', '#f59e0b', '#10b981',
+    '#06b6d4', '#f97316', '#84cc16', '#ef4444', '#6b7280'
+)
+
+# Bloques de estilo de cada tipo de gráfico, construidos una sola vez
+_TEXT_STYLES = (
+    '.chart-text { font-family: "Segoe UI", Arial, sans-serif; font-size: 11px; fill: #374151; }',
+    '.chart-title { font-family: "Segoe UI", Arial, sans-serif; font-size: 16px; font-weight: bold; fill: #1f2937; }',
+)
+_DONUT_STYLE = ('<style>',) + _TEXT_STYLES + (
+    '.legend-text { font-family: "Segoe UI", Arial, sans-serif; font-size: 11px; fill: #6b7280; }',
+    '.slice:hover { opacity: 0.8; cursor: pointer; }',
+    '</style>'
+)
+_BAR_STYLE = ('<style>',) + _TEXT_STYLES + (
+    '.axis-line { stroke: #e5e7eb; stroke-width: 1; }',
+    '.bar:hover { opacity: 0.8; cursor: pointer; }',
+    '</style>'
+)
+_LINE_STYLE = ('<style>',) + _TEXT_STYLES + (
+    '.axis-line { stroke: #e5e7eb; stroke-width: 1; }',
+    '.line-path { fill: none; stroke: #6366f1; stroke-width: 3; }',
+    '.point { fill: #6366f1; stroke: #ffffff; stroke-width: 2; }',
+    '.point:hover { r: 6; cursor: pointer; }',
+    '</style>'
+)
+
+
+def lttb_indices(values: Sequence[float], max_points: int) -> List[int]:
+    """Índices de los puntos que conserva Largest-Triangle-Three-Buckets.
+
+    Se conservan el primer y el último punto; el resto de la serie se divide
+    en ``max_points - 2`` grupos y de cada uno se elige el punto que forma el
+    triángulo de mayor área con el punto elegido antes y con el promedio del
+    grupo siguiente, lo que preserva picos y valles.
+    """
+    count = len(values)
+    if max_points < 3:
+        raise ValueError("max_points debe ser al menos 3")
+    if count <= max_points:
+        return list(range(count))
+
+    every = (count - 2) / (max_points - 2)
+    selected = [0]
+    previous = 0
+    for bucket in range(max_points - 2):
+        # Promedio del grupo siguiente (el último punto para el último grupo)
+        next_start = int((bucket + 1) * every) + 1
+        next_end = min(int((bucket + 2) * every) + 1, count)
+        avg_x = (next_start + next_end - 1) / 2
+        avg_y = sum(values[next_start:next_end]) / (next_end - next_start)
+
+        prev_x, prev_y = previous, values[previous]
+        best, best_area = -1, -1.0
+        for index in range(int(bucket * every) + 1, next_start):
+            area = abs((prev_x - avg_x) * (values[index] - prev_y) - (prev_x - index) * (avg_y - prev_y))
+            if area > best_area:
+                best, best_area = index, area
+        selected.append(best)
+        previous = best
+    selected.append(count - 1)
+    return selected
+
+
+def _svg_open(width: int, height: int) -> str:
+    return f'<svg width="{width}" height="{height}" viewBox="0 0 {width} {height}" xmlns="http://www.w3.org/2000/svg">'
+
+
+def _empty_svg(title: str, message: str, width: int, height: int) -> str:
+    """Crea un gráfico vacío con mensaje."""
+    return f'''
+        <svg width="{width}" height="{height}" viewBox="0 0 {width} {height}" xmlns="http://www.w3.org/2000/svg">
+            <style>
+                .chart-title {{ font-family: "Segoe UI", Arial, sans-serif; font-size: 14px; font-weight: bold; fill: #1f2937; }}
+                .empty-message {{ font-family: "Segoe UI", Arial, sans-serif; font-size: 12px; fill: #6b7280; }}
+            </style>
+            <rect width="{width}" height="{height}" fill="#f9fafb" stroke="#e5e7eb"/>
+            {f'<text x="{width//2}" y="30" text-anchor="middle" class="chart-title">{title}</text>' if title else ''}
+            <text x="{width//2}" y="{height//2}" text-anchor="middle" class="empty-message">{message}</text>
+        </svg>'''
+
+
+def _donut_svg(labels: Tuple[str, ...], values: Tuple[int, ...], title: str,
+               width: int, height: int, colors: Tuple[str, ...]) -> str:
+    if not values or sum(values) == 0:
+        return _empty_svg(title, "No hay datos disponibles", width, height)
+
+    total = sum(values)
+    cx, cy = width // 2, height // 2
+    outer_radius = min(cx, cy) - 40
+    inner_radius = outer_radius * 0.6
+
+    svg_parts = [_svg_open(width, height)]
+    svg_parts.extend(_DONUT_STYLE)
+
+    if title:
+        svg_parts.append(f'<text x="{width//2}" y="20" text-anchor="middle" class="chart-title">{title}</text>')
+
+    # Crear segmentos del donut; el final de un segmento es el inicio del
+    # siguiente, así que cada ángulo se calcula una sola vez
+    start_angle = -90  # Empezar desde arriba
+    start_cos = math.cos(math.radians(start_angle))
+    start_sin = math.sin(math.radians(start_angle))
+    for i, (label, value) in enumerate(zip(labels, values)):
+        if value <= 0:
+            continue
+
+        angle = (value / total) * 360
+        end_angle = start_angle + angle
+        end_cos = math.cos(math.radians(end_angle))
+        end_sin = math.sin(math.radians(end_angle))
+
+        # Calcular coordenadas del arco
+        large_arc = 1 if angle > 180 else 0
+
+        # Puntos del arco exterior
+        x1_outer = cx + outer_radius * start_cos
+        y1_outer = cy + outer_radius * start_sin
+        x2_outer = cx + outer_radius * end_cos
+        y2_outer = cy + outer_radius * end_sin
+
+        # Puntos del arco interior
+        x1_inner = cx + inner_radius * start_cos
+        y1_inner = cy + inner_radius * start_sin
+        x2_inner = cx + inner_radius * end_cos
+        y2_inner = cy + inner_radius * end_sin
+
+        # Path del segmento
+        path = f"""M {x1_outer} {y1_outer}
                       A {outer_radius} {outer_radius} 0 {large_arc} 1 {x2_outer} {y2_outer}
                       L {x2_inner} {y2_inner}
                       A {inner_radius} {inner_radius} 0 {large_arc} 0 {x1_inner} {y1_inner}
                       Z"""
-            
-            color = self.colors[i % len(self.colors)]
-            percentage = (value / total) * 100
-            
-            svg_parts.append(f'''
+
+        color = colors[i % len(colors)]
+        percentage = (value / total) * 100
+
+        svg_parts.append(f'''
             <path d="{path}" fill="{color}" class="slice">
                 <title>{label}: {value} ({percentage:.1f}%)</title>
             </path>''')
-            
-            start_angle = end_angle
-        
-        # Agregar leyenda
-        legend_y = self.height - 120
-        cols = 1 if len(labels) > 4 else 2
-        col_width = self.width // cols
-        
-        for i, (label, value) in enumerate(zip(labels, values)):
-            if value <= 0:
-                continue
-                
-            col = i % cols
-            row = i // cols
-            x = 20 + col * col_width
-            y = legend_y + row * 22
-            
-            color = self.colors[i % len(self.colors)]
-            percentage = (value / total) * 100
-            
-            # Truncar etiquetas largas
-            display_label = label[:30] + "..." if len(label) > 30 else label
-            
-            svg_parts.extend([
-                f'<rect x="{x}" y="{y-8}" width="12" height="12" fill="{color}"/>',
-                f'<text x="{x+18}" y="{y+1}" class="legend-text">{display_label}: {value} ({percentage:.1f}%)</text>'
-            ])
-        
-        svg_parts.append('</svg>')
-        return '\n'.join(svg_parts)
-    
-    def create_bar_chart(self, labels: List[str], values: List[int], title: str = "") -> str:
-        """Crea un gráfico de barras en SVG."""
-        if not values or max(values) == 0:
-            return self._create_empty_chart(title, "No hay datos disponibles")
-        
-        margin = 60
-        chart_width = self.width - 2 * margin
-        chart_height = self.height - 2 * margin - 40  # Extra espacio para título
-        
-        max_value = max(values)
-        bar_width = chart_width / len(values) * 0.8
-        bar_spacing = chart_width / len(values)
-        
-        svg_parts = [
-            f'<svg width="{self.width}" height="{self.height}" viewBox="0 0 {self.width} {self.height}" xmlns="http://www.w3.org/2000/svg">',
-            '<style>',
-            '.chart-text { font-family: "Segoe UI", Arial, sans-serif; font-size: 11px; fill: #374151; }',
-            '.chart-title { font-family: "Segoe UI", Arial, sans-serif; font-size: 16px; font-weight: bold; fill: #1f2937; }',
-            '.axis-line { stroke: #e5e7eb; stroke-width: 1; }',
-            '.bar:hover { opacity: 0.8; cursor: pointer; }',
-            '</style>'
-        ]
-        
-        if title:
-            svg_parts.append(f'<text x="{self.width//2}" y="25" text-anchor="middle" class="chart-title">{title}</text>')
-        
-        chart_top = 40 if title else 20
-        
-        # Líneas de la cuadrícula
-        for i in range(0, 6):
-            y = chart_top + margin + (chart_height * i / 5)
-            grid_value = max_value * (5 - i) / 5
-            svg_parts.extend([
-                f'<line x1="{margin}" y1="{y}" x2="{self.width - margin}" y2="{y}" class="axis-line"/>',
-                f'<text x="{margin - 10}" y="{y + 4}" text-anchor="end" class="chart-text">{int(grid_value)}</text>'
-            ])
-        
-        # Barras
-        for i, (label, value) in enumerate(zip(labels, values)):
-            if value < 0:
-                continue
-                
-            x = margin + i * bar_spacing + (bar_spacing - bar_width) / 2
-            bar_height = (value / max_value) * chart_height
-            y = chart_top + margin + chart_height - bar_height
-            
-            color = self.colors[0]  # Color principal para barras
-            
-            svg_parts.append(f'''
+
+        start_angle, start_cos, start_sin = end_angle, end_cos, end_sin
+
+    # Agregar leyenda
+    legend_y = height - 120
+    cols = 1 if len(labels) > 4 else 2
+    col_width = width // cols
+
+    for i, (label, value) in enumerate(zip(labels, values)):
+        if value <= 0:
+            continue
+
+        col = i % cols
+        row = i // cols
+        x = 20 + col * col_width
+        y = legend_y + row * 22
+
+        color = colors[i % len(colors)]
+        percentage = (value / total) * 100
+
+        # Truncar etiquetas largas
+        display_label = label[:30] + "..." if len(label) > 30 else label
+
+        svg_parts.extend([
+            f'<rect x="{x}" y="{y-8}" width="12" height="12" fill="{color}"/>',
+            f'<text x="{x+18}" y="{y+1}" class="legend-text">{display_label}: {value} ({percentage:.1f}%)</text>'
+        ])
+
+    svg_parts.append('</svg>')
+    return '\n'.join(svg_parts)
+
+
+def _bar_svg(labels: Tuple[str, ...], values: Tuple[int, ...], title: str,
+             width: int, height: int, colors: Tuple[str, ...]) -> str:
+    if not values or max(values) == 0:
+        return _empty_svg(title, "No hay datos disponibles", width, height)
+
+    margin = 60
+    chart_width = width - 2 * margin
+    chart_height = height - 2 * margin - 40  # Extra espacio para título
+
+    max_value = max(values)
+    bar_width = chart_width / len(values) * 0.8
+    bar_spacing = chart_width / len(values)
+
+    svg_parts = [_svg_open(width, height)]
+    svg_parts.extend(_BAR_STYLE)
+
+    if title:
+        svg_parts.append(f'<text x="{width//2}" y="25" text-anchor="middle" class="chart-title">{title}</text>')
+
+    chart_top = 40 if title else 20
+
+    # Líneas de la cuadrícula
+    for i in range(0, 6):
+        y = chart_top + margin + (chart_height * i / 5)
+        grid_value = max_value * (5 - i) / 5
+        svg_parts.extend([
+            f'<line x1="{margin}" y1="{y}" x2="{width - margin}" y2="{y}" class="axis-line"/>',
+            f'<text x="{margin - 10}" y="{y + 4}" text-anchor="end" class="chart-text">{int(grid_value)}</text>'
+        ])
+
+    # Barras
+    color = colors[0]  # Color principal para barras
+    for i, (label, value) in enumerate(zip(labels, values)):
+        if value < 0:
+            continue
+
+        x = margin + i * bar_spacing + (bar_spacing - bar_width) / 2
+        bar_height = (value / max_value) * chart_height
+        y = chart_top + margin + chart_height - bar_height
+
+        svg_parts.append(f'''
             <rect x="{x}" y="{y}" width="{bar_width}" height="{bar_height}" fill="{color}" class="bar">
                 <title>{label}: {value}</title>
             </rect>''')
-            
-            # Etiquetas del eje X
-            label_x = x + bar_width / 2
-            label_y = chart_top + margin + chart_height + 20
-            
-            # Rotar etiquetas si son muy largas para evitar superposición
-            if len(label) > 8:
-                truncated_label = label[:8] + "..."
-                svg_parts.append(f'''
+
+        # Etiquetas del eje X
+        label_x = x + bar_width / 2
+        label_y = chart_top + margin + chart_height + 20
+
+        # Rotar etiquetas si son muy largas para evitar superposición
+        if len(label) > 8:
+            truncated_label = label[:8] + "..."
+            svg_parts.append(f'''
                 <text x="{label_x}" y="{label_y}" text-anchor="middle" class="chart-text" 
                       transform="rotate(-45, {label_x}, {label_y})">{truncated_label}</text>''')
-            else:
-                svg_parts.append(f'<text x="{label_x}" y="{label_y}" text-anchor="middle" class="chart-text">{label}</text>')
-        
-        svg_parts.append('</svg>')
-        return '\n'.join(svg_parts)
-    
-    def create_line_chart(self, labels: List[str], values: List[int], title: str = "") -> str:
-        """Crea un gráfico de líneas en SVG."""
-        if not values or len(values) < 2:
-            return self._create_empty_chart(title, "Datos insuficientes para gráfico de líneas")
-        
-        margin = 60
-        chart_width = self.width - 2 * margin
-        chart_height = self.height - 2 * margin - 40
-        
-        max_value = max(values) if values else 1
-        min_value = min(values) if values else 0
-        value_range = max_value - min_value if max_value != min_value else 1
-        
-        svg_parts = [
-            f'<svg width="{self.width}" height="{self.height}" viewBox="0 0 {self.width} {self.height}" xmlns="http://www.w3.org/2000/svg">',
-            '<style>',
-            '.chart-text { font-family: "Segoe UI", Arial, sans-serif; font-size: 11px; fill: #374151; }',
-            '.chart-title { font-family: "Segoe UI", Arial, sans-serif; font-size: 16px; font-weight: bold; fill: #1f2937; }',
-            '.axis-line { stroke: #e5e7eb; stroke-width: 1; }',
-            '.line-path { fill: none; stroke: #6366f1; stroke-width: 3; }',
-            '.point { fill: #6366f1; stroke: #ffffff; stroke-width: 2; }',
-            '.point:hover { r: 6; cursor: pointer; }',
-            '</style>'
-        ]
-        
-        if title:
-            svg_parts.append(f'<text x="{self.width//2}" y="25" text-anchor="middle" class="chart-title">{title}</text>')
-        
-        chart_top = 40 if title else 20
-        
-        # Líneas de la cuadrícula
-        for i in range(0, 6):
-            y = chart_top + margin + (chart_height * i / 5)
-            grid_value = max_value - (value_range * i / 5)
-            svg_parts.extend([
-                f'<line x1="{margin}" y1="{y}" x2="{self.width - margin}" y2="{y}" class="axis-line"/>',
-                f'<text x="{margin - 10}" y="{y + 4}" text-anchor="end" class="chart-text">{int(grid_value)}</text>'
-            ])
-        
-        # Crear puntos y línea
-        points = []
-        point_width = chart_width / (len(values) - 1) if len(values) > 1 else chart_width
-        
-        for i, (label, value) in enumerate(zip(labels, values)):
-            x = margin + i * point_width
-            y = chart_top + margin + chart_height - ((value - min_value) / value_range) * chart_height
-            points.append((x, y))
-            
-            # Punto
-            svg_parts.append(f'''
+        else:
+            svg_parts.append(f'<text x="{label_x}" y="{label_y}" text-anchor="middle" class="chart-text">{label}</text>')
+
+    svg_parts.append('</svg>')
+    return '\n'.join(svg_parts)
+
+
+def _line_svg(labels: Tuple[str, ...], values: Tuple[int, ...], title: str,
+              width: int, height: int, colors: Tuple[str, ...],
+              max_points: Optional[int] = LINE_CHART_MAX_POINTS) -> str:
+    if not values or len(values) < 2:
+        return _empty_svg(title, "Datos insuficientes para gráfico de líneas", width, height)
+
+    margin = 60
+    chart_width = width - 2 * margin
+    chart_height = height - 2 * margin - 40
+
+    max_value = max(values) if values else 1
+    min_value = min(values) if values else 0
+    value_range = max_value - min_value if max_value != min_value else 1
+
+    svg_parts = [_svg_open(width, height)]
+    svg_parts.extend(_LINE_STYLE)
+
+    if title:
+        svg_parts.append(f'<text x="{width//2}" y="25" text-anchor="middle" class="chart-title">{title}</text>')
+
+    chart_top = 40 if title else 20
+
+    # Líneas de la cuadrícula
+    for i in range(0, 6):
+        y = chart_top + margin + (chart_height * i / 5)
+        grid_value = max_value - (value_range * i / 5)
+        svg_parts.extend([
+            f'<line x1="{margin}" y1="{y}" x2="{width - margin}" y2="{y}" class="axis-line"/>',
+            f'<text x="{margin - 10}" y="{y + 4}" text-anchor="end" class="chart-text">{int(grid_value)}</text>'
+        ])
+
+    # Crear puntos y línea; en series largas solo los puntos que elige LTTB,
+    # en la posición horizontal que les corresponde en la serie completa
+    points = []
+    point_width = chart_width / (len(values) - 1) if len(values) > 1 else chart_width
+    kept = lttb_indices(values, max_points) if max_points else range(len(values))
+
+    for i, index in enumerate(kept):
+        label, value = labels[index], values[index]
+        x = margin + index * point_width
+        y = chart_top + margin + chart_height - ((value - min_value) / value_range) * chart_height
+        points.append((x, y))
+
+        # Punto
+        svg_parts.append(f'''
             <circle cx="{x}" cy="{y}" r="4" class="point">
                 <title>{label}: {value}</title>
             </circle>''')
-            
-            # Etiqueta del eje X (cada 2 puntos para evitar solapamiento)
-            if i % max(1, len(values) // 8) == 0 or i == len(values) - 1:
-                label_y = chart_top + margin + chart_height + 20
-                # Truncar etiquetas para fechas
-                display_label = label[:7] if len(label) > 7 else label  # Formato YYYY-MM
-                svg_parts.append(f'<text x="{x}" y="{label_y}" text-anchor="middle" class="chart-text">{display_label}</text>')
-        
-        # Línea conectando puntos
-        if len(points) >= 2:
-            path_data = f"M {points[0][0]} {points[0][1]}"
-            for x, y in points[1:]:
-                path_data += f" L {x} {y}"
-            svg_parts.append(f'<path d="{path_data}" class="line-path"/>')
-        
-        svg_parts.append('</svg>')
-        return '\n'.join(svg_parts)
-    
+
+        # Etiqueta del eje X (unas 8 como máximo para evitar solapamiento)
+        if i % max(1, len(kept) // 8) == 0 or i == len(kept) - 1:
+            label_y = chart_top + margin + chart_height + 20
+            # Truncar etiquetas para fechas
+            display_label = label[:10] if len(label) > 10 else label  # Formato YYYY-MM-DD
+            svg_parts.append(f'<text x="{x}" y="{label_y}" text-anchor="middle" class="chart-text">{display_label}</text>')
+
+    # Línea conectando puntos
+    if len(points) >= 2:
+        path_data = f"M {points[0][0]} {points[0][1]}"
+        for x, y in points[1:]:
+            path_data += f" L {x} {y}"
+        svg_parts.append(f'<path d="{path_data}" class="line-path"/>')
+
+    svg_parts.append('</svg>')
+    return '\n'.join(svg_parts)
+
+
+_RENDERERS = {
+    'donut': _donut_svg,
+    'bar': _bar_svg,
+    'line': _line_svg,
+}
+
+
+@functools.lru_cache(maxsize=CHART_CACHE_SIZE)
+def _render_chart(kind: str, labels: Tuple[str, ...], values: Tuple[int, ...], title: str,
+                  width: int, height: int, colors: Tuple[str, ...], options: Tuple[Any, ...]) -> str:
+    """Renderiza un gráfico; la clave del caché es el hash de todos los argumentos."""
+    return _RENDERERS[kind](labels, values, title, width, height, colors, **dict(options))
+
+
+def render_chart(kind: str, labels: Sequence[Any], values: Sequence[int], title: str = "",
+                 width: int = 500, height: int = 400,
+                 colors: Sequence[str] = DEFAULT_COLORS, **options: Any) -> str:
+    """Renderiza (o reutiliza del caché) un gráfico 'donut', 'bar' o 'line'.
+
+    ``options`` son los parámetros propios del tipo de gráfico (p. ej.
+    ``max_points`` para 'line'). Es seguro llamarla desde varios hilos: no
+    hay estado compartido salvo el caché de resultados.
+    """
+    if kind not in _RENDERERS:
+        raise ValueError(f"Tipo de gráfico desconocido: {kind}")
+    return _render_chart(kind, tuple(labels), tuple(values), title, width, height, tuple(colors),
+                         tuple(sorted(options.items())))
+
+
+class SVGChartGenerator:
+    """Generador de gráficos SVG puros sin dependencias externas.
+
+    ``width`` y ``height`` son el tamaño por defecto; cada gráfico puede
+    pedir otro sin modificar la instancia.
+    """
+
+    def __init__(self, width: int = 500, height: int = 400):
+        self.width = width
+        self.height = height
+        self.colors = list(DEFAULT_COLORS)
+
+    def _render(self, kind: str, labels: List[str], values: List[int], title: str,
+                width: Optional[int], height: Optional[int], **options: Any) -> str:
+        return render_chart(kind, labels, values, title,
+                            self.width if width is None else width,
+                            self.height if height is None else height,
+                            self.colors, **options)
+
+    def create_donut_chart(self, labels: List[str], values: List[int], title: str = "",
+                           width: Optional[int] = None, height: Optional[int] = None) -> str:
+        """Crea un gráfico de donut en SVG."""
+        return self._render('donut', labels, values, title, width, height)
+
+    def create_bar_chart(self, labels: List[str], values: List[int], title: str = "",
+                         width: Optional[int] = None, height: Optional[int] = None) -> str:
+        """Crea un gráfico de barras en SVG."""
+        return self._render('bar', labels, values, title, width, height)
+
+    def create_line_chart(self, labels: List[str], values: List[int], title: str = "",
+                          width: Optional[int] = None, height: Optional[int] = None,
+                          max_points: Optional[int] = LINE_CHART_MAX_POINTS) -> str:
+        """Crea un gráfico de líneas en SVG.
+
+        Las series de más de ``max_points`` valores se reducen con LTTB
+        (``None`` dibuja todos los puntos).
+        """
+        return self._render('line', labels, values, title, width, height, max_points=max_points)
+
     def _create_empty_chart(self, title: str, message: str) -> str:
         """Crea un gráfico vacío con mensaje."""
-        return f'''
-        <svg width="{self.width}" height="{self.height}" viewBox="0 0 {self.width} {self.height}" xmlns="http://www.w3.org/2000/svg">
-            <style>
-                .chart-title {{ font-family: "Segoe UI", Arial, sans-serif; font-size: 14px; font-weight: bold; fill: #1f2937; }}
-                .empty-message {{ font-family: "Segoe UI", Arial, sans-serif; font-size: 12px; fill: #6b7280; }}
-            </style>
-            <rect width="{self.width}" height="{self.height}" fill="#f9fafb" stroke="#e5e7eb"/>
-            {f'<text x="{self.width//2}" y="30" text-anchor="middle" class="chart-title">{title}</text>' if title else ''}
-            <text x="{self.width//2}" y="{self.height//2}" text-anchor="middle" class="empty-message">{message}</text>
-        </svg>'''
+        return _empty_svg(title, message, self.width, self.height)
 
 
 class SVGVisualizationGenerator:
     """Generador de visualizaciones usando SVG puro."""
-    
+
+    # Tamaño del gráfico temporal (más ancho que el resto)
+    TEMPORAL_SIZE = (1000, 450)
+
     def __init__(self):
         self.chart_generator = SVGChartGenerator()
-    
+
     def generate_charts_html(self, chart_data: Dict[str, Any]) -> str:
         """Genera HTML con gráficos SVG."""
-        
+
         # Gráfico de tipos de datos (donut)
         data_types_svg = self.chart_generator.create_donut_chart(
             labels=chart_data.get('dataTypes', {}).get('labels', []),
             values=chart_data.get('dataTypes', {}).get('values', []),
             title="Distribución por Tipo de Dato"
         )
-        
+
         # Gráfico de fuentes (barras)
         sources_svg = self.chart_generator.create_bar_chart(
             labels=chart_data.get('sources', {}).get('labels', []),
             values=chart_data.get('sources', {}).get('values', []),
             title="Fuentes Principales"
         )
-        
+
         # Gráfico temporal (líneas) - tamaño extra grande
-        self.chart_generator.width = 1000  # Aumentar más el ancho para temporal
-        self.chart_generator.height = 450   # Aumentar más la altura para temporal
+        temporal_width, temporal_height = self.TEMPORAL_SIZE
         temporal_svg = self.chart_generator.create_line_chart(
             labels=chart_data.get('temporal', {}).get('labels', []),
             values=chart_data.get('temporal', {}).get('values', []),
-            title="Evolución Temporal (Últimos 5 Años)"
+            title=chart_data.get('temporal', {}).get('title', "Evolución Temporal (Últimos 5 Años)"),
+            width=temporal_width,
+            height=temporal_height
         )
-        # Restaurar tamaño normal (ahora más grande)
-        self.chart_generator.width = 500
-        self.chart_generator.height = 400
-        
+
         return f"""
         <div class="charts-container">
             <div class="chart-grid-three">
-                <div class="chart-card">
+                <div class="chart-card" id="chartDataTypes">
                     {data_types_svg}
                 </div>
-                <div class="chart-card">
+                <div class="chart-card" id="chartSources">
                     {sources_svg}
                 </div>
             </div>
-            <div class="chart-card chart-wide">
+            <div class="chart-card chart-wide" id="chartTemporal">
                 {temporal_svg}
             </div>
         </div>
         """
-    
+
     def generate_charts_js(self, chart_data: Dict[str, Any]) -> str:
         """Genera JavaScript mínimo para interactividad SVG."""
         return """
@@ -0,0 +1,106 @@
+"""
+Módulo: ui_bus.py
+Canal thread-safe de actualizaciones de interfaz para trabajos en segundo plano
+
+Los hilos de trabajo (búsquedas, exportaciones, vistas previas) publican el
+estado de cada widget con ``post``; el hilo principal drena el canal a una
+frecuencia fija y aplica sólo el último valor de cada clave. Así una ráfaga
+de actualizaciones no inunda la cola de eventos de Tk ni bloquea la entrada
+del usuario.
+"""
+import logging
+import threading
+from collections import deque
+from typing import Any, Callable, Dict, Hashable
+
+logger = logging.getLogger(__name__)
+
+# ~30 actualizaciones por segundo
+DEFAULT_FRAME_INTERVAL_MS: int = 33
+# Máximo de acciones puntuales ejecutadas por cuadro
+DEFAULT_MAX_CALLS_PER_FRAME: int = 20
+
+
+class UIUpdateBus:
+    """Coalesce actualizaciones de widgets publicadas desde cualquier hilo."""
+
+    def __init__(self, root, interval_ms: int = DEFAULT_FRAME_INTERVAL_MS,
+                 max_calls_per_frame: int = DEFAULT_MAX_CALLS_PER_FRAME):
+        self.root = root
+        self.interval_ms = interval_ms
+        self.max_calls_per_frame = max_calls_per_frame
+        self._lock = threading.Lock()
+        self._pending: Dict[Hashable, Any] = {}
+        self._calls = deque()
+        self._handlers: Dict[Hashable, Callable[[Any], None]] = {}
+        self._after_id = None
+        self._running = False
+
+    # --- Registro de widgets (hilo principal) ---
+    def register(self, key: Hashable, handler: Callable[[Any], None]):
+        """Asocia una clave de estado con la función que la aplica a un widget."""
+        with self._lock:
+            self._handlers[key] = handler
+
+    def unregister(self, key: Hashable):
+        with self._lock:
+            self._handlers.pop(key, None)
+            self._pending.pop(key, None)
+
+    # --- Publicación (cualquier hilo) ---
+    def post(self, key: Hashable, value: Any):
+        """Publica el estado de ``key``; reemplaza cualquier valor aún no aplicado."""
+        with self._lock:
+            self._pending[key] = value
+
+    def call(self, func: Callable, *args, **kwargs):
+        """Encola una acción puntual para ejecutarse en el hilo principal (en orden)."""
+        with self._lock:
+            self._calls.append((func, args, kwargs))
+
+    # --- Ciclo de drenado (hilo principal) ---
+    def start(self):
+        if self._running:
+            return
+        self._running = True
+        self._schedule()
+
+    def stop(self):
+        self._running = False
+        if self._after_id is not None:
+            try:
+                self.root.after_cancel(self._after_id)
+            except Exception:
+                pass
+            self._after_id = None
+
+    def _schedule(self):
+        if self._running:
+            self._after_id = self.root.after(self.interval_ms, self._drain)
+
+    def _drain(self):
+        """Aplica el último valor de cada clave y un lote acotado de acciones."""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            handlers = dict(self._handlers)
+            calls = []
+            while self._calls and len(calls) < self.max_calls_per_frame:
+                calls.append(self._calls.popleft())
+
+        try:
+            for key, value in pending.items():
+                handler = handlers.get(key)
+                if handler is None:
+                    continue
+                try:
+                    handler(value)
+                except Exception:
+                    logger.exception(f"Error aplicando actualización de UI '{key}'")
+
+            for func, args, kwargs in calls:
+                try:
+                    func(*args, **kwargs)
+                except Exception:
+                    logger.exception("Error ejecutando acción de UI encolada")
+        finally:
+            self._schedule()
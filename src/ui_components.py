@@ -380,17 +380,10 @@ def get_records_to_export_dialog(parent, all_records, selected_ids=None):
     )
     
     if choice is True:
-        # Export selected only
-        selected_records = []
-        for item_id in selected_ids:
-            item = parent.results_tree.item(item_id)
-            values = item['values']
-            if values:
-                record_id = values[0]
-                record = next((r for r in all_records if r.get('storageid') == record_id), None)
-                if record:
-                    selected_records.append(record)
-        return selected_records
+        # Export selected only (los ids son iids del Treeview)
+        return exports_module.select_records_for_export(
+            all_records, selected_ids, id_field='iid', registry=parent.record_registry
+        )
     elif choice is False:
         # Export all
         return all_records
@@ -444,19 +437,15 @@ def show_export_selection_dialog(parent, records):
     cancel_btn.pack(pady=(10, 0), fill="x")
 
 def _export_and_close(dialog, records, export_type):
-    """Helper function to export and close dialog"""
+    """Helper function to queue a background export and close dialog"""
     try:
-        filepath = None
-        if export_type == "csv":
-            filepath = exports_module.export_to_csv(records, "seleccion")
-        elif export_type == "json":
-            filepath = exports_module.export_to_json(records, "seleccion")
+        parent = dialog.master
+        if export_type in ("csv", "json"):
+            # show_export_success_dialog is shown by the app when the job finishes
+            parent.start_export_job(export_type, records, filename="seleccion")
     # elif export_type == "pdf":
     #     filepath = exports_module.generate_pdf_report(records, title="Selección")
-        
-        if filepath:
-            dialog.destroy()
-            show_export_success_dialog(dialog.master, filepath)
+        dialog.destroy()
             
     except Exception as e:
         logger.exception(f"Error exporting {export_type}")
@@ -0,0 +1,350 @@
+"""
+Módulo: warehouse.py
+Almacén local SQLite de resultados de búsqueda
+
+Cada búsqueda se registra con su término y fecha, y sus registros se guardan
+deduplicados por systemid (primera/última vez vistos y cantidad de
+apariciones). Las consultas usan índices y devuelven iteradores, de modo que
+la GUI, los reportes y la línea de comandos pueden responder "¿ya vimos esta
+filtración?" sin cargar el histórico en memoria.
+"""
+import argparse
+import json
+import logging
+import os
+import sqlite3
+import threading
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from record_store import normalize_record, record_key
+
+logger = logging.getLogger(__name__)
+
+# Ruta por defecto de la base (sobrescribible con INTELX_WAREHOUSE)
+DEFAULT_WAREHOUSE_PATH = os.environ.get(
+    'INTELX_WAREHOUSE',
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data', 'intelx_warehouse.db')
+)
+
+# Registros por transacción al ingerir
+INGEST_BATCH = 1000
+# Parámetros por consulta IN (...) (límite clásico de SQLite: 999)
+_MAX_SQL_VARS = 900
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS searches (
+    id INTEGER PRIMARY KEY,
+    term TEXT NOT NULL,
+    searched_at TEXT NOT NULL,
+    record_count INTEGER NOT NULL DEFAULT 0,
+    new_count INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS records (
+    systemid TEXT PRIMARY KEY,
+    storageid TEXT,
+    name TEXT,
+    bucket TEXT,
+    media INTEGER,
+    type INTEGER,
+    date TEXT,
+    xscore INTEGER,
+    size INTEGER,
+    first_seen TEXT NOT NULL,
+    last_seen TEXT NOT NULL,
+    seen_count INTEGER NOT NULL DEFAULT 1,
+    data TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS record_hits (
+    search_id INTEGER NOT NULL REFERENCES searches(id) ON DELETE CASCADE,
+    systemid TEXT NOT NULL,
+    PRIMARY KEY (search_id, systemid)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_records_storageid ON records(storageid);
+CREATE INDEX IF NOT EXISTS idx_records_bucket ON records(bucket);
+CREATE INDEX IF NOT EXISTS idx_records_media ON records(media);
+CREATE INDEX IF NOT EXISTS idx_records_date ON records(date);
+CREATE INDEX IF NOT EXISTS idx_records_xscore ON records(xscore);
+CREATE INDEX IF NOT EXISTS idx_hits_systemid ON record_hits(systemid);
+CREATE INDEX IF NOT EXISTS idx_searches_term ON searches(term);
+"""
+
+# Columnas válidas para ORDER BY en query()
+ORDER_COLUMNS = ('date', 'xscore', 'size', 'media', 'bucket', 'first_seen', 'last_seen', 'seen_count', 'systemid')
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M:%S')
+
+
+def _int_or_none(value: Any) -> Optional[int]:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _chunks(items: Sequence[Any], size: int) -> Iterator[Sequence[Any]]:
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+class ResultWarehouse:
+    """Base SQLite (modo WAL) con el histórico de resultados de todas las búsquedas.
+
+    Cada hilo usa su propia conexión, por lo que la ingesta puede hacerse
+    desde los hilos de búsqueda mientras la GUI consulta.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or DEFAULT_WAREHOUSE_PATH
+        if self.path != ':memory:':
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self._local = threading.local()
+        self._connections: List[sqlite3.Connection] = []
+        self._lock = threading.Lock()
+        self._connection().executescript(_SCHEMA)
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+            conn.row_factory = sqlite3.Row
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            conn.execute('PRAGMA foreign_keys=ON')
+            self._local.conn = conn
+            with self._lock:
+                self._connections.append(conn)
+        return conn
+
+    def close(self):
+        with self._lock:
+            for conn in self._connections:
+                try:
+                    conn.close()
+                except sqlite3.Error:
+                    pass
+            self._connections = []
+        self._local = threading.local()
+
+    # --- Ingesta ---
+    def ingest(self, term: str, records: Iterable[Any], searched_at: Optional[str] = None,
+               batch_size: int = INGEST_BATCH) -> Tuple[int, int, int]:
+        """Registra una búsqueda y sus registros.
+
+        Devuelve ``(search_id, total, nuevos)``; ``total`` cuenta los systemid
+        distintos de la respuesta (un duplicado se ignora aunque llegue en otro
+        lote) y ``nuevos`` los que no estaban en el almacén.
+        """
+        conn = self._connection()
+        searched_at = searched_at or _now()
+        with conn:
+            search_id = conn.execute(
+                'INSERT INTO searches (term, searched_at) VALUES (?, ?)', (term, searched_at)
+            ).lastrowid
+
+        total = new = 0
+        seen = set()
+        batch: List[Tuple[str, Dict[str, Any]]] = []
+        for i, record in enumerate(records):
+            key = record_key(record)
+            # Un mismo systemid puede repetirse dentro de la respuesta: se conserva el primero
+            if key in seen:
+                continue
+            seen.add(key)
+            batch.append((key, normalize_record(record, i)))
+            if len(batch) >= batch_size:
+                new += self._ingest_batch(conn, search_id, searched_at, batch)
+                total += len(batch)
+                batch = []
+        if batch:
+            new += self._ingest_batch(conn, search_id, searched_at, batch)
+            total += len(batch)
+
+        with conn:
+            conn.execute('UPDATE searches SET record_count = ?, new_count = ? WHERE id = ?',
+                         (total, new, search_id))
+        logger.info(f"Almacén: búsqueda '{term}' registrada ({total} registros, {new} nuevos)")
+        return search_id, total, new
+
+    def _ingest_batch(self, conn: sqlite3.Connection, search_id: int, seen_at: str,
+                      batch: List[Tuple[str, Dict[str, Any]]]) -> int:
+        keys = [key for key, _ in batch]
+        with conn:
+            existing = set()
+            for chunk in _chunks(keys, _MAX_SQL_VARS):
+                placeholders = ','.join('?' * len(chunk))
+                existing.update(row[0] for row in conn.execute(
+                    f'SELECT systemid FROM records WHERE systemid IN ({placeholders})', chunk))
+
+            conn.executemany(
+                """
+                INSERT INTO records (systemid, storageid, name, bucket, media, type, date, xscore, size,
+                                     first_seen, last_seen, seen_count, data)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, 1, ?)
+                ON CONFLICT(systemid) DO UPDATE SET
+                    storageid = excluded.storageid,
+                    name = excluded.name,
+                    bucket = excluded.bucket,
+                    media = excluded.media,
+                    type = excluded.type,
+                    date = excluded.date,
+                    xscore = excluded.xscore,
+                    size = excluded.size,
+                    last_seen = excluded.last_seen,
+                    seen_count = records.seen_count + 1,
+                    data = excluded.data
+                """,
+                [
+                    (
+                        key,
+                        r.get('storageid'),
+                        r.get('name'),
+                        r.get('bucket'),
+                        _int_or_none(r.get('media')),
+                        _int_or_none(r.get('type')),
+                        r.get('date') or None,
+                        _int_or_none(r.get('xscore')),
+                        _int_or_none(r.get('size')),
+                        seen_at,
+                        seen_at,
+                        json.dumps(r, ensure_ascii=False, default=str),
+                    )
+                    for key, r in batch
+                ]
+            )
+            conn.executemany(
+                'INSERT OR IGNORE INTO record_hits (search_id, systemid) VALUES (?, ?)',
+                [(search_id, key) for key in keys]
+            )
+        return len(keys) - len(existing)
+
+    # --- Consultas ---
+    def seen_before(self, record_id: str) -> Optional[Dict[str, Any]]:
+        """Historial de un systemid/storageid: primera y última vez, apariciones y términos."""
+        conn = self._connection()
+        row = conn.execute(
+            'SELECT systemid, first_seen, last_seen, seen_count FROM records '
+            'WHERE systemid = ? OR storageid = ? LIMIT 1',
+            (str(record_id), str(record_id))
+        ).fetchone()
+        if row is None:
+            return None
+        terms = [r[0] for r in conn.execute(
+            'SELECT DISTINCT s.term FROM record_hits h JOIN searches s ON s.id = h.search_id '
+            'WHERE h.systemid = ? ORDER BY s.searched_at', (row['systemid'],))]
+        result = dict(row)
+        result['terms'] = terms
+        return result
+
+    def known_ids(self, record_ids: Iterable[str]) -> set:
+        """Subconjunto de ``record_ids`` (systemids) ya presentes en el almacén."""
+        conn = self._connection()
+        ids = [str(i) for i in record_ids]
+        known = set()
+        for chunk in _chunks(ids, _MAX_SQL_VARS):
+            placeholders = ','.join('?' * len(chunk))
+            known.update(row[0] for row in conn.execute(
+                f'SELECT systemid FROM records WHERE systemid IN ({placeholders})', chunk))
+        return known
+
+    def _where(self, term: Optional[str] = None, bucket: Optional[str] = None, media: Optional[int] = None,
+               date_from: Optional[str] = None, date_to: Optional[str] = None,
+               min_score: Optional[int] = None) -> Tuple[str, List[Any]]:
+        clauses, params = [], []
+        if term is not None:
+            clauses.append('systemid IN (SELECT h.systemid FROM record_hits h '
+                           'JOIN searches s ON s.id = h.search_id WHERE s.term = ?)')
+            params.append(term)
+        if bucket is not None:
+            clauses.append('bucket = ?')
+            params.append(bucket)
+        if media is not None:
+            clauses.append('media = ?')
+            params.append(int(media))
+        if date_from is not None:
+            clauses.append('date >= ?')
+            params.append(date_from)
+        if date_to is not None:
+            clauses.append('date <= ?')
+            params.append(date_to)
+        if min_score is not None:
+            clauses.append('xscore >= ?')
+            params.append(int(min_score))
+        return (' WHERE ' + ' AND '.join(clauses)) if clauses else '', params
+
+    def query(self, term: Optional[str] = None, bucket: Optional[str] = None, media: Optional[int] = None,
+              date_from: Optional[str] = None, date_to: Optional[str] = None, min_score: Optional[int] = None,
+              order_by: str = 'date', descending: bool = True,
+              limit: Optional[int] = None, offset: int = 0) -> Iterator[Dict[str, Any]]:
+        """Itera los registros que cumplen los filtros, leyendo la base por cursor."""
+        if order_by not in ORDER_COLUMNS:
+            raise ValueError(f"Columna de orden no válida: {order_by}")
+        where, params = self._where(term, bucket, media, date_from, date_to, min_score)
+        sql = f'SELECT data FROM records{where} ORDER BY {order_by} {"DESC" if descending else "ASC"}'
+        if limit is not None:
+            sql += ' LIMIT ? OFFSET ?'
+            params += [int(limit), int(offset)]
+        for row in self._connection().execute(sql, params):
+            yield json.loads(row[0])
+
+    def count(self, **filters) -> int:
+        where, params = self._where(**filters)
+        return self._connection().execute(f'SELECT COUNT(*) FROM records{where}', params).fetchone()[0]
+
+    def searches(self, term: Optional[str] = None, limit: int = 50) -> List[Dict[str, Any]]:
+        """Últimas búsquedas registradas (opcionalmente de un término)."""
+        sql = 'SELECT id, term, searched_at, record_count, new_count FROM searches'
+        params: List[Any] = []
+        if term is not None:
+            sql += ' WHERE term = ?'
+            params.append(term)
+        sql += ' ORDER BY id DESC LIMIT ?'
+        params.append(int(limit))
+        return [dict(row) for row in self._connection().execute(sql, params)]
+
+
+def main(argv: Optional[List[str]] = None):
+    """Consultas rápidas al almacén desde la línea de comandos."""
+    parser = argparse.ArgumentParser(description='Consultar el almacén local de resultados IntelX')
+    parser.add_argument('--db', default=None, help='Ruta de la base SQLite')
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    seen = sub.add_parser('seen', help='¿Ya vimos este systemid/storageid?')
+    seen.add_argument('record_id')
+
+    query = sub.add_parser('query', help='Listar registros (NDJSON por stdout)')
+    query.add_argument('--term')
+    query.add_argument('--bucket')
+    query.add_argument('--media', type=int)
+    query.add_argument('--since', dest='date_from')
+    query.add_argument('--until', dest='date_to')
+    query.add_argument('--min-score', type=int)
+    query.add_argument('--order-by', default='date', choices=ORDER_COLUMNS)
+    query.add_argument('--limit', type=int, default=100)
+
+    sub.add_parser('searches', help='Últimas búsquedas registradas')
+
+    args = parser.parse_args(argv)
+    warehouse = ResultWarehouse(args.db)
+    try:
+        if args.command == 'seen':
+            info = warehouse.seen_before(args.record_id)
+            print(json.dumps(info, ensure_ascii=False, indent=2) if info else 'No visto')
+        elif args.command == 'query':
+            for record in warehouse.query(term=args.term, bucket=args.bucket, media=args.media,
+                                          date_from=args.date_from, date_to=args.date_to,
+                                          min_score=args.min_score, order_by=args.order_by,
+                                          limit=args.limit):
+                print(json.dumps(record, ensure_ascii=False))
+        else:
+            for search in warehouse.searches():
+                print(f"{search['searched_at']}  {search['term']}  "
+                      f"{search['record_count']} registros ({search['new_count']} nuevos)")
+    finally:
+        warehouse.close()
+
+
+if __name__ == '__main__':
+    main()
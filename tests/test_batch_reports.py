@@ -0,0 +1,55 @@
+import glob
+import os
+import shutil
+
+import batch_reports
+from exports import export_to_csv, export_to_interactive_html, load_records
+
+REPO_CSV_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'reports', 'csv')
+
+RECORDS = [
+    {'systemid': f'id{i}', 'name': f'file{i}.txt', 'bucket': 'leaks.logs', 'media': 24, 'type': 1,
+     'xscore': 90 if i % 2 else 10, 'size': 100 + i, 'date': '2024-03-10T01:02:03Z'}
+    for i in range(20)
+]
+
+
+def test_csv_export_round_trips_integer_columns(tmp_path):
+    path = export_to_csv(RECORDS, filename='results.csv', exports_dir=str(tmp_path))
+    loaded = list(load_records(path))
+    assert [r['xscore'] for r in loaded] == [r['xscore'] for r in RECORDS]
+    assert all(isinstance(r['media'], int) for r in loaded)
+
+
+def test_batch_reports_csv_export(tmp_path):
+    inputs = tmp_path / 'in'
+    inputs.mkdir()
+    export_to_csv(RECORDS, filename='user_at_example_dot_com_20250101_120000.csv', exports_dir=str(inputs))
+    output_dir = tmp_path / 'out'
+
+    results = batch_reports.generate_batch([str(inputs)], output_dir=str(output_dir), use_processes=False)
+
+    assert [r['status'] for r in results] == [batch_reports.BATCH_GENERATED]
+    assert results[0]['records'] == len(RECORDS)
+    assert os.path.exists(results[0]['output'])
+
+
+def test_batch_reports_repo_csv(tmp_path):
+    for path in glob.glob(os.path.join(REPO_CSV_DIR, '*.csv')):
+        shutil.copy(path, tmp_path)
+    results = batch_reports.generate_batch([str(tmp_path)], output_dir=str(tmp_path / 'out'),
+                                           use_processes=False)
+    assert results and all(r['status'] == batch_reports.BATCH_GENERATED for r in results)
+
+
+def test_expand_inputs_skips_bookkeeping_and_output(tmp_path):
+    export_to_csv(RECORDS, filename='results.csv', exports_dir=str(tmp_path))
+    output_dir = tmp_path / 'html'
+    output_dir.mkdir()
+    export_to_interactive_html(RECORDS, filename='state.html', exports_dir=str(tmp_path), keep_state=True)
+    (tmp_path / batch_reports.BATCH_STATE_FILE).write_text('{}')
+    (output_dir / 'old.json').write_text('[]')
+
+    inputs = batch_reports.expand_inputs([str(tmp_path)], exclude_dir=str(output_dir))
+
+    assert inputs == [str(tmp_path / 'results.csv')]
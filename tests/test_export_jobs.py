@@ -0,0 +1,44 @@
+import threading
+
+from export_jobs import JOB_CANCELLED, JOB_DONE, ExportJobManager
+
+
+def test_finished_jobs_are_released(tmp_path):
+    finished = []
+    done = threading.Event()
+
+    def on_finished(job):
+        finished.append(job)
+        if len(finished) == 2:
+            done.set()
+
+    manager = ExportJobManager(max_workers=1, on_finished=on_finished)
+    jobs = [manager.submit('json', [{'systemid': str(i)}], filename=f'{i}.json', exports_dir=str(tmp_path))
+            for i in range(2)]
+    assert done.wait(10)
+    manager.shutdown(wait=True)
+
+    assert [job.status for job in finished] == [JOB_DONE, JOB_DONE]
+    assert manager.active_jobs() == []
+    assert all(manager.get(job.id) is None for job in jobs)
+
+
+def test_progress_is_reported_and_cancel_removes_the_export(tmp_path):
+    finished = threading.Event()
+    progress = []
+
+    def on_progress(job):
+        progress.append(job.written)
+        if job.written >= 1000:
+            job.cancel()
+
+    manager = ExportJobManager(max_workers=1, on_progress=on_progress, on_finished=lambda job: finished.set())
+    job = manager.submit('csv', [{'systemid': str(i)} for i in range(5000)], filename='x.csv',
+                         exports_dir=str(tmp_path))
+    assert finished.wait(10)
+    manager.shutdown(wait=True)
+
+    assert job.status == JOB_CANCELLED
+    assert progress[:2] == [500, 1000]
+    assert job.written < job.total
+    assert not (tmp_path / 'x.csv').exists()
@@ -0,0 +1,216 @@
+import json
+import os
+import threading
+
+import pytest
+
+import exports
+from exports import (FORMAT_WRITERS, append_export, export_all, export_sharded, export_sharded_interactive_html,
+                     export_to_csv, export_to_json, export_to_ndjson, load_records, read_columnar, read_manifest,
+                     read_ndjson)
+
+
+def test_failed_json_append_restores_the_export(tmp_path):
+    path = export_to_json([{'systemid': 'a'}], filename='x.json', exports_dir=str(tmp_path))
+    before = open(path, 'rb').read()
+
+    def failing():
+        yield {'systemid': 'b'}
+        raise OSError('disk full')
+
+    with pytest.raises(OSError):
+        export_to_json(failing(), filename='x.json', exports_dir=str(tmp_path), append=True)
+    assert open(path, 'rb').read() == before
+
+
+def test_json_export_stringifies_unencodable_values(tmp_path):
+    path = export_to_json([{'systemid': 'a', 'seen': {1}}], filename='x.json', exports_dir=str(tmp_path))
+    assert json.load(open(path)) == [{'systemid': 'a', 'seen': '{1}'}]
+
+
+def test_csv_append_adds_new_fields_to_the_header(tmp_path):
+    path = export_to_csv([{'systemid': 'a', 'name': 'one'}], filename='x.csv', exports_dir=str(tmp_path))
+    export_to_csv([{'systemid': 'b', 'name': 'two', 'bucket': 'pastes'}], filename='x.csv',
+                  exports_dir=str(tmp_path), append=True)
+    assert list(load_records(path)) == [
+        {'systemid': 'a', 'name': 'one', 'bucket': ''},
+        {'systemid': 'b', 'name': 'two', 'bucket': 'pastes'},
+    ]
+    assert not os.path.exists(path + '.tmp')
+
+
+def test_csv_append_to_file_without_header(tmp_path):
+    path = tmp_path / 'x.csv'
+    path.write_text('\n')
+    export_to_csv([{'systemid': 'a'}], filename='x.csv', exports_dir=str(tmp_path), append=True)
+    assert list(load_records(str(path))) == [{'systemid': 'a'}]
+
+
+@pytest.mark.parametrize('fmt', ['parquet', 'feather'])
+def test_columnar_round_trip_keeps_booleans(tmp_path, fmt, caplog):
+    pytest.importorskip('pyarrow')
+    records = [{'systemid': 'a', 'instore': True, 'perfectmatch': False, 'xscore': 'high'}]
+    path = FORMAT_WRITERS[fmt](records, filename='x.' + fmt, exports_dir=str(tmp_path))
+    loaded = list(load_records(path))
+    assert loaded == [{'systemid': 'a', 'instore': True, 'perfectmatch': False}]
+    assert 'xscore (1)' in caplog.text
+
+
+def test_failed_csv_append_restores_the_export(tmp_path, monkeypatch):
+    monkeypatch.setattr(exports, 'CSV_WRITE_BATCH', 1)
+    path = export_to_csv([{'systemid': 'a'}], filename='x.csv', exports_dir=str(tmp_path))
+    before = open(path, 'rb').read()
+
+    class Unprintable:
+        def __str__(self):
+            raise OSError('disk full')
+
+    with pytest.raises(OSError):
+        export_to_csv([{'systemid': 'b'}, {'systemid': Unprintable()}], filename='x.csv',
+                      exports_dir=str(tmp_path), append=True)
+    assert open(path, 'rb').read() == before
+
+
+@pytest.mark.parametrize('compress', [False, True])
+def test_failed_ndjson_append_restores_the_export(tmp_path, compress):
+    path = export_to_ndjson([{'systemid': 'a'}], filename='x', exports_dir=str(tmp_path), compress=compress)
+    before = open(path, 'rb').read()
+
+    def failing():
+        yield {'systemid': 'b'}
+        raise OSError('disk full')
+
+    with pytest.raises(OSError):
+        export_to_ndjson(failing(), filename='x', exports_dir=str(tmp_path), compress=compress, append=True)
+    assert open(path, 'rb').read() == before
+    assert list(read_ndjson(path)) == [{'systemid': 'a'}]
+
+
+@pytest.mark.parametrize('error', [exports.ExportCancelled, ValueError])
+def test_export_all_removes_the_bundle_dir_it_created(tmp_path, monkeypatch, error):
+    def failing(records, **options):
+        raise error()
+
+    monkeypatch.setattr(exports, '_default_exports_dir', lambda kind: str(tmp_path))
+    monkeypatch.setitem(exports.FORMAT_WRITERS, 'csv', failing)
+    try:
+        export_all([{'systemid': 'a'}], formats=['csv'])
+    except exports.ExportCancelled:
+        pass
+    assert os.listdir(tmp_path) == []
+
+
+def test_csv_streams_a_generator_with_a_sampled_header(tmp_path, caplog):
+    def records():
+        yield {'systemid': 'a', 'tags': ['x', 'y']}
+        yield {'systemid': 'b', 'name': 'n'}
+        yield {'systemid': 'c', 'late': 1}
+
+    path = export_to_csv(records(), filename='x.csv', exports_dir=str(tmp_path), sample_size=2)
+    assert open(path, encoding='utf-8').read().splitlines() == [
+        'systemid,tags,name', 'a,"[""x"",""y""]",', 'b,,n', 'c,,',
+    ]
+    assert 'late' in caplog.text
+
+
+def test_csv_header_can_be_given(tmp_path):
+    path = export_to_csv([{'systemid': 'a', 'name': 'n'}], filename='x.csv', exports_dir=str(tmp_path),
+                         fieldnames=['name'])
+    assert open(path, encoding='utf-8').read().splitlines() == ['name', 'n']
+
+
+@pytest.mark.parametrize('compress', [False, True])
+def test_ndjson_round_trip_and_append(tmp_path, compress):
+    records = [{'systemid': 'a', 'name': 'ñ', 'tags': [1]}, {'systemid': 'b'}]
+    path = export_to_ndjson(records[:1], filename='x', exports_dir=str(tmp_path), compress=compress)
+    assert path.endswith('.ndjson.gz' if compress else '.ndjson')
+    export_to_ndjson(records[1:], filename='x', exports_dir=str(tmp_path), compress=compress, append=True)
+    assert list(read_ndjson(path)) == records
+    assert list(load_records(path)) == records
+
+
+def test_ndjson_reader_skips_blank_and_malformed_lines(tmp_path):
+    path = tmp_path / 'x.jsonl'
+    path.write_text('{"systemid": "a"}\n\n{"systemid": \n{"systemid": "b"}\n', encoding='utf-8')
+    assert list(read_ndjson(str(path))) == [{'systemid': 'a'}, {'systemid': 'b'}]
+
+
+@pytest.mark.parametrize('fmt', ['parquet', 'feather'])
+def test_read_columnar_types_and_projects_columns(tmp_path, fmt):
+    pytest.importorskip('pyarrow')
+    pytest.importorskip('pandas')
+    records = [{'systemid': 'a', 'bucket': 'pastes', 'size': '10', 'date': '2024-01-02T03:04:05Z'},
+               {'systemid': 'b', 'bucket': 'pastes', 'size': 20, 'date': ''}]
+    path = FORMAT_WRITERS[fmt](records, filename='x.' + fmt, exports_dir=str(tmp_path))
+    df = read_columnar(path)
+    assert str(df['bucket'].dtype) == 'category'
+    assert df['size'].tolist() == [10, 20]
+    assert df['date'].isna().tolist() == [False, True]
+    assert list(read_columnar(path, columns=['systemid']).columns) == ['systemid']
+
+
+@pytest.mark.parametrize('name', ['x.csv', 'x.json', 'x.ndjson', 'x.jsonl.gz'])
+def test_append_export_skips_records_already_exported(tmp_path, name):
+    path = str(tmp_path / name)
+    first = append_export([{'systemid': 'a'}, {'systemid': 'b'}, {'systemid': 'a'}], path)
+    assert (first['new'], first['duplicates']) == (2, 1)
+    second = append_export([{'systemid': 'b'}, {'systemid': 'c'}], path)
+    assert (second['new'], second['duplicates']) == (1, 1)
+    assert [r['systemid'] for r in load_records(path)] == ['a', 'b', 'c']
+
+
+def test_append_export_rebuilds_a_stale_id_index(tmp_path):
+    path = tmp_path / 'x.ndjson'
+    append_export([{'systemid': 'a'}], str(path))
+    with open(path, 'a', encoding='utf-8') as fh:
+        fh.write('{"systemid": "b"}\n')
+    assert append_export([{'systemid': 'b'}, {'systemid': 'c'}], str(path))['new'] == 1
+    assert [r['systemid'] for r in load_records(str(path))] == ['a', 'b', 'c']
+
+
+def test_export_all_writes_every_format_from_one_projection(tmp_path):
+    records = [{'systemid': 'a', 'name': 'one', 'tags': ['t']}, {'systemid': 'b', 'bucket': 'pastes'}]
+    result = export_all(records, formats=['csv', 'json', 'ndjson', 'html'], exports_dir=str(tmp_path),
+                        base_name='bundle', search_term='term')
+
+    assert sorted(result['paths']) == ['csv', 'html', 'json', 'ndjson']
+    assert result['errors'] == {}
+    assert {'projection', 'total', 'csv'} <= set(result['timings'])
+    for fmt in ('json', 'ndjson'):
+        assert list(load_records(result['paths'][fmt])) == records
+    assert [r['systemid'] for r in load_records(result['paths']['csv'])] == ['a', 'b']
+    assert os.path.getsize(result['paths']['html']) > 0
+
+
+@pytest.mark.parametrize('parallel', [False, True])
+def test_sharded_export_manifest_round_trip(tmp_path, parallel):
+    records = [{'systemid': str(i)} for i in range(5)]
+    manifest_path = export_sharded(records, fmt='ndjson', base_name='x', exports_dir=str(tmp_path),
+                                   max_records=2, parallel=parallel)
+
+    manifest = read_manifest(manifest_path, verify=True)
+    assert manifest['total_records'] == 5
+    assert [(shard['file'], shard['records']) for shard in manifest['shards']] == [
+        ('x.part0000.ndjson', 2), ('x.part0001.ndjson', 2), ('x.part0002.ndjson', 1)]
+    assert list(load_records(manifest_path)) == records
+
+    with open(manifest['shards'][1]['path'], 'a', encoding='utf-8') as fh:
+        fh.write('{"systemid": "extra"}\n')
+    with pytest.raises(ValueError):
+        read_manifest(manifest_path, verify=True)
+
+
+def test_cancelled_sharded_html_export_removes_its_pages(tmp_path):
+    cancel = threading.Event()
+    records = [{'systemid': str(i), 'bucket': f'bucket {i}', 'date': '2024-01-01'} for i in range(3)]
+
+    def progress(written, total):
+        # Cancel once the first data page is written
+        if written:
+            cancel.set()
+
+    with pytest.raises(exports.ExportCancelled):
+        export_sharded_interactive_html(records, exports_dir=str(tmp_path), base_name='report',
+                                        use_processes=False, max_workers=1,
+                                        progress_callback=progress, cancel_event=cancel)
+    assert os.listdir(tmp_path) == []
@@ -0,0 +1,417 @@
+import base64
+import json
+import os
+import re
+import shutil
+import subprocess
+import zlib
+from datetime import date
+
+import pytest
+
+from interactive_report import (FLAG_COMPLETE_METADATA, FLAG_DOWNLOADABLE, FLAG_INDEXED, FLAG_LEAK, FLAG_PUBLIC,
+                                FLAG_SENSITIVE, DataProcessor, InteractiveReportGenerator, TableGenerator,
+                                append_interactive_html_report, generate_interactive_html_report, generate_sharded_html_report,
+                                load_report_state)
+
+
+def _records(ids, month):
+    return [{'systemid': i, 'name': f'file {i}', 'bucket': 'pastes', 'media': 1, 'type': 0,
+             'date': f'2024-{month:02d}-10T12:00:00Z', 'xscore': 50} for i in ids]
+
+
+def _table_systemids(path):
+    """systemids of every row in the report's table parts, part by part."""
+    parts = []
+    for part in re.findall(r'reportTableParts\.push\((\[.*?\])\);</script>', open(path, encoding='utf-8').read()):
+        chunks = [json.loads(zlib.decompress(base64.b64decode(chunk))) if isinstance(chunk, str) else chunk
+                  for chunk in json.loads(part)]
+        parts.append(sorted(i for chunk in chunks for i in chunk['columns']['systemid']))
+    return parts
+
+
+@pytest.mark.parametrize('compress', [False, True])
+def test_append_adds_only_new_records_and_keeps_existing_rows(tmp_path, compress):
+    path = str(tmp_path / 'report.html')
+    generate_interactive_html_report(_records(['a', 'b'], 1), path, 'term', compress=compress, keep_state=True)
+    head = open(path, 'rb').read()[:load_report_state(path)['layout']['tail']]
+
+    result = append_interactive_html_report(_records(['b', 'c'], 1) + _records(['d'], 4), path)
+
+    assert result == {'filepath': path, 'new': 2, 'duplicates': 1, 'total': 4}
+    # Existing rows are left in place; the new ones are one more part
+    assert open(path, 'rb').read().startswith(head)
+    assert _table_systemids(path) == [['a', 'b'], ['c', 'd']]
+    state = load_report_state(path)
+    assert state['aggregates']['total_results'] == 4
+    assert dict(map(tuple, state['aggregates']['temporal_data'])) == {'2024-01': 3, '2024-04': 1}
+    html = open(path, encoding='utf-8').read()
+    assert '<strong>Resultados:</strong> 4' in html
+    assert '"total": 4' in html
+
+    assert append_interactive_html_report(_records(['a', 'd'], 1), path)['new'] == 0
+    assert _table_systemids(path) == [['a', 'b'], ['c', 'd']]
+
+
+def test_append_with_new_search_term_keeps_the_rows(tmp_path):
+    path = str(tmp_path / 'report.html')
+    generate_interactive_html_report(_records(['a'], 1), path, 'old', keep_state=True)
+    append_interactive_html_report(_records(['b'], 2), path, search_term='new')
+
+    html = open(path, encoding='utf-8').read()
+    assert '<title>IntelX Report - new</title>' in html
+    assert _table_systemids(path) == [['a'], ['b']]
+    assert load_report_state(path)['search_term'] == 'new'
+
+
+def test_failed_append_restores_the_report(tmp_path, monkeypatch):
+    path = str(tmp_path / 'report.html')
+    generate_interactive_html_report(_records(['a'], 1), path, 'term', keep_state=True)
+    before = open(path, 'rb').read()
+
+    def failing(*args, **kwargs):
+        raise OSError('disk full')
+
+    with monkeypatch.context() as patch:
+        patch.setattr(TableGenerator, 'write_table_source', failing)
+        with pytest.raises(OSError):
+            append_interactive_html_report(_records(['b'], 2), path)
+    assert open(path, 'rb').read() == before
+
+    assert append_interactive_html_report(_records(['b'], 2), path)['new'] == 1
+    assert _table_systemids(path) == [['a'], ['b']]
+
+
+def test_projected_rows_share_one_classification():
+    records = [
+        {'systemid': 'a', 'name': 'user@example.com', 'bucket': 'leaks', 'media': 1, 'date': '2024-02-10T12:00:00Z'},
+        {'systemid': 'b', 'name': 'dump.sql', 'bucket': 'pastes', 'media': '1', 'date': '2024-05-01'},
+        {'systemid': 'c', 'name': 'notes', 'bucket': 'web', 'media': None, 'date': None},
+    ]
+    data_types = DataProcessor.classify_records(records)
+    assert data_types == ['Email', 'Base de Datos', 'Otro']
+
+    rows = DataProcessor.project_records(records, data_types)
+    assert rows == DataProcessor.project_records(records)
+    assert [row['data_type'] for row in rows] == data_types
+    assert [row['media_label'] for row in rows] == [DataProcessor._media_label(r['media']) for r in records]
+    assert [row['period'] for row in rows] == ['2024 Q1', '2024 Q2', None]
+    assert [row['flags'] for row in rows] == [DataProcessor.record_flags(r) for r in records]
+    assert DataProcessor.analyze_records(records, data_types) == DataProcessor.analyze_records(records)
+
+
+def _without_timestamps(html):
+    return re.sub(r'\d{4}-\d\d-\d\d \d\d:\d\d:\d\d UTC', 'TIMESTAMP', html)
+
+
+@pytest.mark.parametrize('compress', [False, True])
+def test_streamed_report_matches_the_in_memory_document(tmp_path, compress):
+    records = _records(['a', 'b', 'c'], 1) + _records(['d'], 7)
+    path = str(tmp_path / 'report.html')
+    generate_interactive_html_report(records, path, 'term', compress=compress)
+
+    generator = InteractiveReportGenerator(compress=compress)
+    analysis = generator.data_processor.analyze_records(records)
+    chart_data = generator.data_processor.prepare_chart_data(analysis)
+    expected = generator._build_html_document(records, analysis, chart_data, 'term')
+    assert _without_timestamps(open(path, encoding='utf-8').read()) == _without_timestamps(expected)
+    assert sorted(os.listdir(tmp_path)) == ['report.html']
+
+
+def test_failed_report_write_keeps_the_previous_report(tmp_path, monkeypatch):
+    path = str(tmp_path / 'report.html')
+    generate_interactive_html_report(_records(['a'], 1), path, 'term')
+    before = open(path, 'rb').read()
+
+    def fail(*args, **kwargs):
+        raise RuntimeError('disk full')
+
+    monkeypatch.setattr(TableGenerator, 'write_table_js', fail)
+    with pytest.raises(RuntimeError):
+        generate_interactive_html_report(_records(['b'], 2), path, 'term')
+    assert open(path, 'rb').read() == before
+    assert sorted(os.listdir(tmp_path)) == ['report.html']
+
+
+def _run_report_js(script):
+    """Run ``script`` with node and return what it prints as JSON."""
+    node = shutil.which('node')
+    if node is None:
+        pytest.skip('node is not available')
+    result = subprocess.run([node, '-e', script], capture_output=True, text=True, timeout=60)
+    assert result.returncode == 0, result.stderr
+    return json.loads(result.stdout)
+
+
+def _report_script(path, start, end):
+    """Report script source from the ``start`` marker up to the ``end`` marker."""
+    html = open(path, encoding='utf-8').read()
+    return html[html.index(start):html.index(end)]
+
+
+def test_table_renders_only_the_rows_in_view(tmp_path):
+    path = str(tmp_path / 'report.html')
+    generate_interactive_html_report(_records([f'id{i}' for i in range(1000)], 1), path, 'term')
+    html = open(path, encoding='utf-8').read()
+    # The rows are not in the markup: the table is an empty, scrollable viewport
+    assert re.search(r'<div class="table-container" id="tableViewport">.*?<tbody>\s*</tbody>', html, re.S)
+
+    virtual_scroll = (_report_script(path, 'const OVERSCAN', 'function updateResultsCount')
+                      + _report_script(path, 'function escapeHtml', '// Top n groups'))
+    rendered = _run_report_js("""
+        const viewport = {scrollTop: 4500, clientHeight: 450};
+        const tbody = {innerHTML: '', querySelector: () => null};
+        const document = {getElementById: () => viewport, querySelector: () => tbody};
+        const truncateText = text => text;
+        const getScoreClass = () => 'low';
+        const tableData = Array.from({length: 1000}, (_, i) => ({name: 'file ' + i, data_type: 'Otro'}));
+        const filteredIndex = Int32Array.from(tableData.keys());
+        %s
+        renderVisibleRows(true);
+        console.log(JSON.stringify({
+            names: [...tbody.innerHTML.matchAll(/title="(file \\d+)"/g)].map(m => m[1]),
+            spacers: [...tbody.innerHTML.matchAll(/height: (\\d+)px/g)].map(m => Number(m[1])),
+        }));
+    """ % virtual_scroll)
+    # 4500px / 45px = row 100, minus 10 rows of overscan; 10 visible rows plus 20 of overscan
+    assert rendered['names'] == [f'file {i}' for i in range(90, 120)]
+    assert rendered['spacers'] == [90 * 45, (1000 - 120) * 45]
+
+
+def test_table_payload_decodes_to_the_projected_rows(tmp_path):
+    dates = ['2024-01-10T12:00:00Z', '2023-12-31T23:59:59.5Z', '2024-03-01', '', '2024-02-30T00:00:00Z',
+             '2024-01-10T12:00:00.500000Z', 'yesterday']
+    rows = [{'date': value, 'name': f'file {i}', 'xscore': i * 10, 'systemid': f'id{i}',
+             'bucket': 'pastes' if i % 2 else 'leaks', 'media_label': 'Texto', 'data_type': 'Otro'}
+            for i, value in enumerate(dates)]
+    payload = TableGenerator.encode_table_payload(rows)
+
+    assert payload['n'] == len(rows)
+    assert payload['dateKind'] == 'datetime'
+    # Dates of another shape or that would not round-trip are kept verbatim
+    assert payload['dateExceptions'] == {'2': '2024-03-01', '4': '2024-02-30T00:00:00Z',
+                                         '5': '2024-01-10T12:00:00.500000Z', '6': 'yesterday'}
+    assert payload['dicts']['bucket'] == ['leaks', 'pastes']
+    assert payload['columns']['bucket'] == [0, 1, 0, 1, 0, 1, 0]
+
+    path = str(tmp_path / 'report.html')
+    generate_interactive_html_report([], path, 'term')
+    decoder = _report_script(path, 'function decodeDate', '// Filtering and sorting engine')
+    decoded = _run_report_js('%s\nconsole.log(JSON.stringify(decodeTablePayload(%s)));'
+                             % (decoder, json.dumps(payload)))
+    assert decoded == rows
+
+
+def test_compressed_chunks_hold_the_rows_newest_first():
+    rows = [{'date': value, 'name': f'file {i}', 'bucket': 'pastes', 'period': None, 'flags': 0}
+            for i, value in enumerate(['2024-01-01T00:00:00Z', 'soon', '2024-06-01T00:00:00Z', '',
+                                       '2024-03-01T00:00:00Z', '2024-02-01T00:00:00Z', '2024-05-01T00:00:00Z'])]
+    payload = TableGenerator.encode_table_payload(rows)
+    chunks = [json.loads(zlib.decompress(base64.b64decode(chunk)))
+              for chunk in TableGenerator._compress_chunks(payload, 3)]
+
+    assert [chunk['n'] for chunk in chunks] == [3, 3, 1]
+    names = [name for chunk in chunks for name in chunk['columns']['name']]
+    assert names == ['file 2', 'file 6', 'file 4', 'file 5', 'file 0', 'file 1', 'file 3']
+    # Date exceptions follow their rows into the chunk that holds them
+    assert [chunk['dateExceptions'] for chunk in chunks] == [{}, {'2': 'soon'}, {}]
+
+
+def test_compressed_report_inflates_every_row(tmp_path):
+    path = str(tmp_path / 'report.html')
+    records = _records(['a', 'b'], 1) + _records(['c'], 9) + _records(['d'], 4)
+    generate_interactive_html_report(records, path, 'term', compress=True)
+    assert 'file a' not in open(path, encoding='utf-8').read()
+
+    source = _report_script(path, 'const tableSource', '// Filtering and sorting engine')
+    inflate = _report_script(path, 'async function inflateChunk', 'async function loadTableChunks')
+    systemids = _run_report_js("""
+        %s
+        %s
+        (async () => {
+            const rows = [];
+            for (const chunk of tableSource.chunks) rows.push(...decodeTablePayload(await inflateChunk(chunk)));
+            console.log(JSON.stringify(rows.map(row => row.systemid)));
+        })();
+    """ % (source, inflate))
+    assert systemids == ['c', 'd', 'a', 'b']
+
+
+def test_table_engine_filters_and_sorts_over_prebuilt_indices(tmp_path):
+    records = [
+        {'systemid': 'a', 'name': 'alpha.sql', 'bucket': 'leaks', 'xscore': 90, 'date': '2024-01-10T12:00:00Z'},
+        {'systemid': 'b', 'name': 'beta notes', 'bucket': 'pastes', 'xscore': 10, 'date': '2024-03-05T08:00:00Z'},
+        {'systemid': 'c', 'name': 'gamma.sql', 'bucket': 'pastes', 'xscore': 50, 'date': '2023-12-01T00:00:00Z'},
+        {'systemid': 'd', 'name': 'delta', 'bucket': 'leaks', 'xscore': 70, 'date': ''},
+    ]
+    payload = TableGenerator.encode_table_payload(DataProcessor.project_records(records))
+    queries = [
+        {'column': 'xscore', 'direction': 'desc'},
+        {'column': 'date', 'direction': 'desc', 'source': 'pastes'},
+        {'column': 'name', 'direction': 'asc', 'search': '.sql'},
+        {'column': 'date', 'direction': 'asc', 'dateFrom': '2024-01-01', 'dateTo': '2024-01-10'},
+    ]
+
+    path = str(tmp_path / 'report.html')
+    generate_interactive_html_report([], path, 'term')
+    engine = _report_script(path, 'function createTableEngine', '// The payload is either inline')
+    answers = _run_report_js("""
+        %s
+        (async () => {
+            // node has no Web Worker: the client falls back to a main-thread engine
+            console.warn = () => {};
+            const client = createTableClient();
+            client.append(%s);
+            const answers = [];
+            for (const q of %s) {
+                const { result, aggregates } = await client.query(q);
+                answers.push({ rows: Array.from(result), total: aggregates.total,
+                               bucket: Array.from(aggregates.bucket) });
+            }
+            console.log(JSON.stringify(answers));
+        })();
+    """ % (engine, json.dumps(payload), json.dumps(queries)))
+
+    assert [answer['rows'] for answer in answers] == [[0, 3, 2, 1], [1, 2], [0, 2], [0]]
+    assert [answer['total'] for answer in answers] == [4, 2, 2, 1]
+    # The source chart ignores its own filter, so it still counts every source
+    assert payload['dicts']['bucket'] == ['leaks', 'pastes']
+    assert answers[1]['bucket'] == [2, 2]
+
+
+def test_cross_filter_counts_match_the_generated_analysis(tmp_path):
+    records = [
+        {'systemid': 'a', 'name': 'dump.sql', 'bucket': 'leaks', 'tags': 'public', 'indexed': True, 'media': 15,
+         'xscore': 80, 'size': 10, 'type': 0, 'date': '2024-02-01T00:00:00Z'},
+        {'systemid': 'b', 'name': 'notes', 'bucket': 'web', 'media': 1, 'xscore': 10,
+         'date': '2024-05-01T00:00:00Z'},
+        {'systemid': 'c', 'name': 'user@example.com', 'bucket': 'pastes', 'tags': 'sensitive', 'media': 1,
+         'xscore': 20, 'date': '2025-01-03T00:00:00Z'},
+    ]
+    assert [DataProcessor.record_flags(r) for r in records] == [
+        FLAG_PUBLIC | FLAG_INDEXED | FLAG_SENSITIVE | FLAG_LEAK | FLAG_COMPLETE_METADATA | FLAG_DOWNLOADABLE,
+        0,
+        FLAG_SENSITIVE | FLAG_LEAK]
+
+    analysis = DataProcessor.analyze_records(records)
+    temporal = DataProcessor.prepare_chart_data(analysis)['temporal']
+    payload = TableGenerator.encode_table_payload(DataProcessor.project_records(records), temporal)
+    assert payload['index']['groups']['periods'] == temporal['labels']
+
+    path = str(tmp_path / 'report.html')
+    generate_interactive_html_report([], path, 'term')
+    engine = _report_script(path, 'function createTableEngine', 'function tableWorkerMain')
+    answers = _run_report_js("""
+        %s
+        const engine = createTableEngine();
+        const payload = %s;
+        engine.append(payload);
+        console.log(JSON.stringify([{}, {type: 'Base de Datos'}].map(filters => {
+            const { aggregates } = engine.query(Object.assign({column: 'date', direction: 'desc'}, filters));
+            const periods = {};
+            aggregates.period.forEach((count, code) => { periods[payload.index.groups.period[code]] = count; });
+            return { flags: aggregates.flags, data_type: Array.from(aggregates.data_type), periods };
+        })));
+    """ % (engine, json.dumps(payload)))
+
+    unfiltered, filtered = answers
+    assert unfiltered['flags'] == {'public': 1, 'indexed': 1, 'sensitive': 2, 'leak': 2, 'complete_metadata': 1,
+                                   'downloadable': 1}
+    assert {name: unfiltered['flags'][name] for name in analysis['exposure_levels']} == analysis['exposure_levels']
+    assert unfiltered['flags']['downloadable'] == analysis['kpis']['downloadable_documents_count']
+    assert unfiltered['periods'] == {label: count for label, count in zip(temporal['labels'], temporal['values'])
+                                     if count}
+    # KPI cards follow the filter; the data type chart ignores its own filter
+    assert filtered['flags'] == {'public': 1, 'indexed': 1, 'sensitive': 1, 'leak': 1, 'complete_metadata': 1,
+                                 'downloadable': 1}
+    assert filtered['data_type'] == unfiltered['data_type'] == [1, 1, 1]
+    assert filtered['periods'] == {'2024 Q1': 1, '2024 Q2': 0, '2025 Q1': 0}
+
+
+@pytest.mark.parametrize('granularity, labels, values', [
+    ('day', ['2024-01-30', '2024-01-31', '2024-02-01', '2024-02-02'], [1, 0, 2, 0]),
+    ('week', ['2024-W05'], [3]),
+    ('month', ['2024-01', '2024-02'], [1, 2]),
+    ('quarter', ['2024 Q1'], [3]),
+])
+def test_temporal_chart_counts_records_per_period(granularity, labels, values):
+    records = [{'date': '2024-01-30T10:00:00Z'}, {'date': '2024-02-01'}, {'date': '2024-02-01T23:00:00Z'},
+               {'date': '2023-12-31T00:00:00Z'}]
+    temporal_range = (date(2024, 1, 30), date(2024, 2, 2))
+    analysis = DataProcessor.analyze_records(records)
+    temporal = DataProcessor.prepare_chart_data(analysis, granularity, temporal_range)['temporal']
+
+    assert temporal['labels'] == labels
+    assert temporal['values'] == values
+    assert [DataProcessor.record_period(r['date'], granularity) in labels for r in records] == [True] * 3 + [False]
+
+
+def _links(path):
+    return re.findall(r'<a class="btn-link" href="([^"]+)">', open(path, encoding='utf-8').read())
+
+
+@pytest.mark.parametrize('use_processes', [False, True])
+def test_sharded_report_links_its_pages(tmp_path, use_processes):
+    records = _records(['a', 'b', 'c'], 1) + [dict(r, bucket='leaks') for r in _records(['d', 'e'], 2)]
+    progress = []
+    index = generate_sharded_html_report(records, str(tmp_path), 'term', max_page_records=2,
+                                         use_processes=use_processes,
+                                         progress_callback=lambda written, total: progress.append((written, total)))
+
+    assert index == str(tmp_path / 'index.html')
+    assert sorted(os.listdir(tmp_path)) == ['index.html', 'page-0001.html', 'page-0002.html', 'page-0003.html',
+                                            'report.css', 'report.js']
+    assert progress[-1] == (5, 5)
+    # Buckets in alphabetical order, split into pages of at most two records
+    assert _links(index) == ['page-0001.html', 'page-0002.html', 'page-0003.html']
+    assert 'Resultados:</strong> 5' in open(index, encoding='utf-8').read()
+    assert _links(tmp_path / 'page-0001.html') == ['index.html', 'page-0002.html']
+    assert _links(tmp_path / 'page-0002.html') == ['index.html', 'page-0001.html', 'page-0003.html']
+    assert _links(tmp_path / 'page-0003.html') == ['index.html', 'page-0002.html']
+
+    page = open(tmp_path / 'page-0002.html', encoding='utf-8').read()
+    assert 'Fuente: pastes (1/2) • Página 2 de 3' in page
+    assert 'href="report.css"' in page and 'src="report.js"' in page
+    assert 'Resultados:</strong> 2' in page
+
+
+@pytest.mark.parametrize('keep_state', [False, True])
+def test_record_values_cannot_close_the_table_script(tmp_path, keep_state):
+    name = 'x</script><script>alert(1)</script>'
+    plain_path = str(tmp_path / 'plain.html')
+    path = str(tmp_path / 'report.html')
+    generate_interactive_html_report(_records(['a'], 1), plain_path, 'term', keep_state=keep_state)
+    generate_interactive_html_report([dict(_records(['a'], 1)[0], name=name)], path, 'term', keep_state=keep_state)
+
+    html = open(path, encoding='utf-8').read()
+    assert html.count('</script>') == open(plain_path, encoding='utf-8').read().count('</script>')
+    assert 'x<\\/script><script>alert(1)<\\/script>' in html
+    # The whole table script, up to its own closing tag, is still one script
+    table_script = html[html.index('const tableSource'):]
+    assert 'initializeTable' in table_script[:table_script.index('</script>')]
+    if not keep_state:
+        source = _report_script(path, 'const tableSource', '// Filtering and sorting engine')
+        names = _run_report_js('%s\nconsole.log(JSON.stringify(decodeTablePayload(tableSource.payload)'
+                               '.map(row => row.name)));' % source)
+        assert names == [name]
+
+
+def test_table_rows_escape_record_values(tmp_path):
+    path = str(tmp_path / 'report.html')
+    generate_interactive_html_report([], path, 'term')
+    renderer = (_report_script(path, 'function rowHtml', 'function spacerHtml')
+                + _report_script(path, 'function escapeHtml', '// Top n groups'))
+    row = _run_report_js("""
+        const truncateText = (text, maxLength) => text.length <= maxLength ? text : text.substring(0, maxLength) + '...';
+        const getScoreClass = () => 'low';
+        %s
+        console.log(JSON.stringify(rowHtml({
+            date: '2024-01-01', name: '<img src=x onerror=alert(1)>', bucket: 'a" onmouseover="alert(1)',
+            data_type: 'Otro', media_label: '<b>', xscore: 5, systemid: 'id&"x'
+        }, 0)));
+    """ % renderer)
+
+    assert '<img' not in row and '<b>' not in row
+    assert 'title="&lt;img src=x onerror=alert(1)&gt;">&lt;img src=x onerror=alert(1)&gt;</td>' in row
+    assert 'title="a&quot; onmouseover=&quot;alert(1)"' in row
+    assert 'href="https://intelx.io/?s=id%26%22x"' in row
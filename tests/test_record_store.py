@@ -0,0 +1,39 @@
+from record_store import RecordRegistry, record_key
+
+
+def test_descending_sort_keeps_ties_in_ingest_order():
+    registry = RecordRegistry([
+        {'systemid': 'a', 'size': 2},
+        {'systemid': 'b', 'size': 1},
+        {'systemid': 'c', 'size': 2},
+        {'systemid': 'd', 'size': 1},
+    ])
+    ascending = registry.sorted_iids([('size', False)])
+    descending = registry.sorted_iids([('size', True)])
+    assert [registry.by_iid(i)['systemid'] for i in ascending] == ['b', 'd', 'a', 'c']
+    assert [registry.by_iid(i)['systemid'] for i in descending] == ['a', 'c', 'b', 'd']
+    assert registry.sorted_iids([('size', False)]) == ascending
+
+
+def test_lookup_by_systemid_storageid_and_iid():
+    registry = RecordRegistry([{'systemid': 'a', 'storageid': 'x'}, 'raw text'])
+    iid, record = next(registry.items())
+    assert registry.get('a') is record
+    assert registry.get('x') is record
+    assert registry.get(iid) is record
+    assert registry.get('record_1')['data'] == 'raw text'
+    assert registry.get('missing') is None
+    assert 'a' in registry and 'missing' not in registry
+
+
+def test_select_keeps_order_and_skips_duplicates_and_unknown_ids():
+    registry = RecordRegistry([{'systemid': 'a', 'storageid': 'x'}, {'systemid': 'b', 'storageid': 'y'}])
+    assert [r['systemid'] for r in registry.select(['b', 'x', 'a', 'missing'])] == ['b', 'a']
+    assert [r['systemid'] for r in registry.select(['a', 'y'], id_field='storageid')] == ['b']
+
+
+def test_record_key_prefers_ids_and_hashes_content():
+    assert record_key({'systemid': 'a', 'storageid': 'x'}) == 'a'
+    assert record_key({'storageid': 'x'}) == 'x'
+    assert record_key({'name': 'n', 'size': 1}) == record_key({'size': 1, 'name': 'n'})
+    assert record_key('text').startswith('sha1:')
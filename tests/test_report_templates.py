@@ -0,0 +1,50 @@
+import io
+
+import pytest
+
+import report_templates
+from report_templates import ASSET_CSS, compile_template, get_asset, minify_css, minify_js, register_asset
+
+
+def test_template_renders_and_streams_the_same_text():
+    template = compile_template("<h1>{title}</h1> {{literal}} {count:,} {name!r}")
+    assert template.fields == {'title', 'count', 'name'}
+    assert compile_template("<h1>{title}</h1> {{literal}} {count:,} {name!r}") is template
+
+    text = template.render(title='Report', count=12345, name='x')
+    assert text == "<h1>Report</h1> {literal} 12,345 'x'"
+    out = io.StringIO()
+    template.write(out, title='Report', count=12345, name='x')
+    assert out.getvalue() == text
+
+
+def test_template_rejects_non_name_placeholders():
+    with pytest.raises(ValueError):
+        compile_template("{values[0]}")
+
+
+def test_assets_are_built_once_per_process(monkeypatch):
+    monkeypatch.setattr(report_templates, '_ASSETS', {})
+    calls = []
+
+    def build():
+        calls.append(1)
+        return "a {\n  color: red;\n}\n/* note */\n"
+
+    register_asset('test.css', build, ASSET_CSS)
+    try:
+        assert get_asset('test.css') is get_asset('test.css')
+        assert get_asset('test.css', minify=True) == 'a{color:red}'
+        assert len(calls) == 1
+        with pytest.raises(KeyError):
+            get_asset('missing.css')
+        with pytest.raises(ValueError):
+            register_asset('test.txt', build, 'txt')
+    finally:
+        get_asset.cache_clear()
+
+
+def test_minifiers_keep_the_code_meaning():
+    assert minify_css("div > p ,  span {\n  margin: 0 ;\n}") == 'div>p,span{margin:0}'
+    js = "function f() {\n    // comment\n\n    return `a\n    b`;\n}\n"
+    assert minify_js(js) == "function f() {\nreturn `a\n    b`;\n}"
@@ -0,0 +1,98 @@
+import threading
+import time
+
+import api
+from api import RateLimiter
+from search_session import SESSION_CANCELLED, SESSION_DONE, SESSION_ERROR, SearchScheduler, SearchSession
+
+
+def test_sessions_run_concurrently_with_their_own_state():
+    started = threading.Barrier(2, timeout=5)
+    finished = []
+    done = threading.Event()
+
+    def worker(session):
+        started.wait()
+        session.registry.extend([{'systemid': session.term}])
+        if session.term == 'bad':
+            raise RuntimeError('boom')
+
+    def on_done(session):
+        finished.append(session)
+        if len(finished) == 2:
+            done.set()
+
+    scheduler = SearchScheduler(max_workers=2)
+    sessions = [SearchSession('good'), SearchSession('bad')]
+    for session in sessions:
+        scheduler.submit(session, worker, on_done)
+    assert done.wait(5)
+    scheduler.shutdown(wait=True)
+
+    assert [s.status for s in sessions] == [SESSION_DONE, SESSION_ERROR]
+    assert [[r['systemid'] for r in s.registry] for s in sessions] == [['good'], ['bad']]
+    assert sessions[1].error == 'boom'
+
+
+def test_session_cancelled_while_queued_never_runs():
+    release = threading.Event()
+    ran = []
+    finished = threading.Event()
+    scheduler = SearchScheduler(max_workers=1)
+    blocker, queued = SearchSession('first'), SearchSession('second')
+    scheduler.submit(blocker, lambda session: release.wait(5))
+    scheduler.submit(queued, lambda session: ran.append(session), lambda session: finished.set())
+    queued.cancel()
+    release.set()
+    assert finished.wait(5)
+    scheduler.shutdown(wait=True)
+
+    assert queued.status == SESSION_CANCELLED
+    assert ran == []
+
+
+def test_rate_limiter_spaces_requests_across_threads():
+    limiter = RateLimiter(min_interval=0.05)
+    finished = []
+    lock = threading.Lock()
+
+    def request():
+        limiter.wait()
+        with lock:
+            finished.append(time.monotonic())
+
+    start = time.monotonic()
+    threads = [threading.Thread(target=request) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    # Each request got its own slot, so the last one waited three intervals;
+    # wake-up jitter can only make the waits longer
+    assert len(finished) == 4
+    assert max(finished) - start >= 3 * 0.05
+    assert limiter._next_slot - start >= 4 * 0.05
+
+
+def test_rate_limiter_wait_returns_false_when_cancelled():
+    limiter = RateLimiter(min_interval=5)
+    limiter.wait()
+    cancel = threading.Event()
+    cancel.set()
+    assert limiter.wait(cancel) is False
+
+
+def test_calls_without_a_limiter_share_the_default_one(monkeypatch):
+    waits = []
+
+    def wait(cancel_event=None):
+        waits.append(cancel_event)
+        return False
+
+    monkeypatch.setattr(api.DEFAULT_RATE_LIMITER, 'wait', wait)
+    assert SearchScheduler().rate_limiter is SearchScheduler().rate_limiter is api.DEFAULT_RATE_LIMITER
+    # The wait is cancelled, so no request is sent
+    for _ in range(2):
+        success, _message, search_id = api.check_intelx('term', 'key')
+        assert not success and search_id is None
+    assert len(waits) == 2
@@ -0,0 +1,71 @@
+import re
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+import svg_charts
+from svg_charts import SVGChartGenerator, SVGVisualizationGenerator, render_chart
+
+
+def _svg_size(svg):
+    return tuple(map(int, re.search(r'<svg width="(\d+)" height="(\d+)"', svg).groups()))
+
+
+def test_render_chart_returns_the_cached_chart():
+    svg_charts._render_chart.cache_clear()
+    first = render_chart('bar', ['a', 'b'], [3, 4], 'Fuentes')
+    assert render_chart('bar', ('a', 'b'), (3, 4), 'Fuentes') is first
+    assert svg_charts._render_chart.cache_info().hits == 1
+    assert render_chart('bar', ['a', 'b'], [3, 5], 'Fuentes') is not first
+    with pytest.raises(ValueError):
+        render_chart('pie', ['a'], [1])
+
+
+def test_chart_size_is_per_call():
+    generator = SVGChartGenerator()
+    assert _svg_size(generator.create_line_chart(['2024 Q1'], [1], width=1000, height=450)) == (1000, 450)
+    assert _svg_size(generator.create_donut_chart(['a'], [1])) == (500, 400)
+    assert (generator.width, generator.height) == (500, 400)
+
+    html = SVGVisualizationGenerator().generate_charts_html(
+        {'dataTypes': {'labels': ['Otro'], 'values': [2]}, 'sources': {'labels': ['web'], 'values': [2]},
+         'temporal': {'labels': ['2024 Q1', '2024 Q2'], 'values': [1, 1], 'title': 'Temporal'}})
+    assert [_svg_size(svg) for svg in re.findall(r'<svg [^>]*>', html)] == [(500, 400), (500, 400), (1000, 450)]
+
+
+def test_concurrent_renders_keep_their_own_size():
+    svg_charts._render_chart.cache_clear()
+    sizes = [(300 + i, 200 + i) for i in range(40)]
+
+    def render(size):
+        return _svg_size(render_chart('donut', ['a', 'b'], [1, 2], 'Tipos', *size))
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        assert list(pool.map(render, sizes)) == sizes
+
+
+def test_lttb_keeps_endpoints_and_peaks_within_bounds():
+    values = [0] * 1000
+    values[123], values[777] = 50, -40
+    kept = svg_charts.lttb_indices(values, 20)
+
+    assert len(kept) == 20
+    assert kept[0] == 0 and kept[-1] == 999
+    assert kept == sorted(set(kept))
+    assert {123, 777} <= set(kept)
+
+
+def test_lttb_leaves_short_series_alone():
+    assert svg_charts.lttb_indices([1, 2, 3], 3) == [0, 1, 2]
+    assert svg_charts.lttb_indices([], 10) == []
+    with pytest.raises(ValueError):
+        svg_charts.lttb_indices([1, 2, 3, 4], 2)
+
+
+def test_long_line_charts_are_downsampled():
+    labels = [f'day {i}' for i in range(1000)]
+    values = [i % 7 for i in range(1000)]
+    svg = render_chart('line', labels, values, 'Temporal', max_points=50)
+    assert svg.count('<circle') == 50
+    assert '<title>day 999: 5</title>' in svg
+    assert render_chart('line', labels, values, 'Temporal', max_points=None).count('<circle') == 1000
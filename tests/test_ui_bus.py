@@ -0,0 +1,62 @@
+from ui_bus import UIUpdateBus
+
+
+class FakeRoot:
+    """Stands in for Tk: ``after`` callbacks run when the test calls ``tick``."""
+
+    def __init__(self):
+        self.scheduled = []
+
+    def after(self, interval_ms, callback):
+        self.scheduled.append(callback)
+        return len(self.scheduled)
+
+    def after_cancel(self, after_id):
+        pass
+
+    def tick(self):
+        callbacks, self.scheduled = self.scheduled, []
+        for callback in callbacks:
+            callback()
+
+
+def test_posts_are_coalesced_to_the_last_value_per_frame():
+    root = FakeRoot()
+    bus = UIUpdateBus(root)
+    applied = []
+    bus.register('progress', applied.append)
+    bus.start()
+    for value in range(100):
+        bus.post('progress', value)
+    bus.post('unregistered', 'ignored')
+    root.tick()
+    assert applied == [99]
+    root.tick()
+    assert applied == [99]
+
+
+def test_queued_calls_run_in_order_capped_per_frame():
+    root = FakeRoot()
+    bus = UIUpdateBus(root, max_calls_per_frame=3)
+    calls = []
+    for i in range(7):
+        bus.call(calls.append, i)
+    bus.start()
+    root.tick()
+    assert calls == [0, 1, 2]
+    root.tick()
+    root.tick()
+    assert calls == list(range(7))
+
+
+def test_failing_handler_does_not_stop_the_frame():
+    root = FakeRoot()
+    bus = UIUpdateBus(root)
+    applied = []
+    bus.register('broken', lambda value: 1 / 0)
+    bus.call(applied.append, 'after')
+    bus.start()
+    bus.post('broken', 1)
+    root.tick()
+    assert applied == ['after']
+    assert root.scheduled
@@ -0,0 +1,45 @@
+import pytest
+
+from warehouse import ResultWarehouse
+
+
+@pytest.fixture
+def warehouse(tmp_path):
+    warehouse = ResultWarehouse(str(tmp_path / 'warehouse.db'))
+    yield warehouse
+    warehouse.close()
+
+
+def _record(systemid, bucket='pastes', date='2024-01-01', xscore=10):
+    return {'systemid': systemid, 'bucket': bucket, 'date': date, 'xscore': xscore, 'media': 1}
+
+
+def test_ingest_deduplicates_within_and_across_searches(warehouse):
+    records = [_record('a'), _record('b'), _record('a'), _record('c')]
+    _, total, new = warehouse.ingest('first', records, searched_at='2024-01-01 00:00:00', batch_size=2)
+    assert (total, new) == (3, 3)
+    _, total, new = warehouse.ingest('second', [_record('c'), _record('d')], searched_at='2024-02-01 00:00:00')
+    assert (total, new) == (2, 1)
+
+    assert warehouse.count() == 4
+    assert warehouse.known_ids(['a', 'd', 'z']) == {'a', 'd'}
+    seen = warehouse.seen_before('c')
+    assert (seen['first_seen'], seen['last_seen'], seen['seen_count']) == \
+        ('2024-01-01 00:00:00', '2024-02-01 00:00:00', 2)
+    assert seen['terms'] == ['first', 'second']
+    assert [s['new_count'] for s in warehouse.searches()] == [1, 3]
+
+
+def test_query_filters_and_orders(warehouse):
+    warehouse.ingest('term', [_record('a', 'pastes', '2024-01-01', 90), _record('b', 'leaks', '2024-03-01', 50),
+                              _record('c', 'pastes', '2024-02-01', 70)])
+    warehouse.ingest('other', [_record('d', 'pastes', '2024-04-01', 10)])
+
+    assert [r['systemid'] for r in warehouse.query(bucket='pastes')] == ['d', 'c', 'a']
+    assert [r['systemid'] for r in warehouse.query(term='term', order_by='xscore', descending=False)] == \
+        ['b', 'c', 'a']
+    assert [r['systemid'] for r in warehouse.query(date_from='2024-02-01', min_score=60)] == ['c']
+    assert [r['systemid'] for r in warehouse.query(limit=2, offset=1)] == ['b', 'c']
+    assert warehouse.count(term='term', bucket='pastes') == 2
+    with pytest.raises(ValueError):
+        list(warehouse.query(order_by='data'))